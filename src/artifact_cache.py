@@ -0,0 +1,144 @@
+"""Local, checksum-verified cache for downloaded build artifacts."""
+
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256_of(path: Path) -> str:
+    """Compute the SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Caches downloads by URL with a stored checksum and fetch timestamp.
+
+    Each URL gets its own directory holding the artifact and a metadata
+    file. A cached copy is only used if its content still matches the
+    stored checksum (and the pinned checksum, if one is given).
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize artifact cache.
+
+        Args:
+            cache_dir: Directory to store cached artifacts in.
+        """
+        self.cache_dir = cache_dir
+
+    def _entry_dir(self, url: str) -> Path:
+        """Get the cache directory for a URL."""
+        return self.cache_dir / hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    def _load_valid(self, url: str, expected_sha256: Optional[str]) -> Optional[dict]:
+        """
+        Get metadata of a cached artifact whose content verifies.
+
+        Args:
+            url: Artifact URL.
+            expected_sha256: Pinned checksum the content must match, if any.
+
+        Returns:
+            Metadata dict or None if there is no usable cached copy.
+        """
+        entry = self._entry_dir(url)
+        meta_path = entry / "meta.json"
+        artifact = entry / "artifact"
+        if not meta_path.exists() or not artifact.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            return None
+
+        actual = _sha256_of(artifact)
+        if actual != meta.get("sha256"):
+            logger.warning(f"Cached artifact for {url} is corrupt, ignoring it")
+            return None
+        if expected_sha256 and actual != expected_sha256.lower():
+            return None
+        return meta
+
+    def _download(self, url: str, expected_sha256: Optional[str]) -> dict:
+        """Download an artifact into the cache and return its metadata."""
+        entry = self._entry_dir(url)
+        entry.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=entry, delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+        try:
+            urllib.request.urlretrieve(url, tmp_path)
+            sha256 = _sha256_of(tmp_path)
+            if expected_sha256 and sha256 != expected_sha256.lower():
+                raise RuntimeError(
+                    f"Checksum mismatch for {url}: expected {expected_sha256}, got {sha256}"
+                )
+            tmp_path.replace(entry / "artifact")
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        meta = {"url": url, "sha256": sha256, "fetched_at": time.time()}
+        (entry / "meta.json").write_text(json.dumps(meta, indent=2))
+        return meta
+
+    def fetch(
+        self,
+        url: str,
+        target_path: Path,
+        max_age: float,
+        expected_sha256: Optional[str] = None,
+        offline: bool = False,
+    ) -> str:
+        """
+        Place a copy of an artifact at target_path, downloading only if needed.
+
+        A verified cached copy younger than max_age is used as-is. Older
+        copies are refreshed, but still used if the download fails. In
+        offline mode the network is never touched.
+
+        Args:
+            url: Artifact URL.
+            target_path: Where to place the artifact.
+            max_age: Maximum age in seconds before a refresh is attempted.
+            expected_sha256: Pinned checksum the content must match.
+            offline: Never download; fail if no verified copy is cached.
+
+        Returns:
+            SHA-256 of the artifact placed at target_path.
+
+        Raises:
+            RuntimeError: If no verified copy is available.
+        """
+        meta = self._load_valid(url, expected_sha256)
+        fresh = meta is not None and time.time() - meta.get("fetched_at", 0) < max_age
+
+        if meta is not None and (fresh or offline):
+            logger.info(f"Using cached artifact for {url} (sha256 {meta['sha256'][:12]})")
+        elif offline:
+            raise RuntimeError(f"Offline mode and no verified cached copy of {url}")
+        else:
+            try:
+                meta = self._download(url, expected_sha256)
+                logger.info(f"Downloaded {url} (sha256 {meta['sha256'][:12]})")
+            except Exception as e:
+                if meta is None:
+                    raise RuntimeError(f"Failed to download {url}: {e}")
+                logger.warning(f"Failed to refresh {url}, using stale cached copy: {e}")
+
+        shutil.copyfile(self._entry_dir(url) / "artifact", target_path)
+        return meta["sha256"]
@@ -0,0 +1,258 @@
+"""Asyncio orchestration of the daemon's polling, dispatch and housekeeping loops."""
+
+import asyncio
+import functools
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional, Set
+
+if TYPE_CHECKING:
+    from .daemon import IssueSolverDaemon
+    from .task_pipeline import PreparedTask
+    from .task_queue import Task
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOrchestrator:
+    """
+    Runs the daemon's loops as tasks on one asyncio event loop.
+
+    Polling, dispatch, state persistence, the reaper and Docker GC are
+    coroutines. Blocking Docker, GitHub and git calls go to a bounded
+    thread pool, and the fetch ahead of each worktree runs as an asyncio
+    subprocess. Container exits reported by the events watcher are handled
+    through the loop and wake dispatch as soon as a slot frees.
+
+    Shutdown is structured: the loops are cancelled, dispatches already
+    under way finish starting their containers, and the executor drains
+    before the daemon stops its services.
+    """
+
+    def __init__(self, daemon: "IssueSolverDaemon"):
+        """
+        Initialize orchestrator.
+
+        Args:
+            daemon: Daemon whose components and task handling are used.
+        """
+        self.daemon = daemon
+        self.config = daemon.config
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutdown: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._fetch_lock: Optional[asyncio.Lock] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    def run(self):
+        """Run the event loop until shutdown is requested."""
+        asyncio.run(self._main())
+
+    def _threadsafe(self, callback: Callable[[], None]) -> bool:
+        """Schedule a callback on the loop from any thread, if it is running."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            return False
+        return True
+
+    def request_shutdown(self):
+        """Ask the event loop to shut down (thread-safe)."""
+        self._threadsafe(lambda: self._shutdown.set())
+
+    def wake(self):
+        """Wake the dispatcher, e.g. because a slot freed (thread-safe)."""
+        self._threadsafe(lambda: self._wakeup.set())
+
+    def wrap_exit_handler(self, handler: Callable) -> Callable:
+        """
+        Route a container exit handler through the event loop.
+
+        Args:
+            handler: Called with the ContainerExit result.
+
+        Returns:
+            Handler for the events watcher.
+        """
+        def on_exit(result):
+            if not self._threadsafe(
+                lambda: asyncio.ensure_future(self._handle_exit(handler, result))
+            ):
+                logger.warning("Event loop stopped; container exit left for the next start")
+
+        return on_exit
+
+    async def _handle_exit(self, handler: Callable, result):
+        """Run an exit handler on the executor, then look for work."""
+        try:
+            await self._call(handler, result)
+        except Exception as e:
+            logger.error(f"Error handling container exit: {e}")
+        self._wakeup.set()
+
+    async def _call(self, func: Callable, *args):
+        """Run a blocking call on the bounded executor."""
+        return await self._loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _sleep(self, timeout: float) -> bool:
+        """
+        Wait for a timeout or shutdown.
+
+        Returns:
+            True if shutdown was requested.
+        """
+        try:
+            await asyncio.wait_for(self._shutdown.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _wait_for_work(self):
+        """Wait until woken (new issues, a freed slot) or a second has passed."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def _on_loop_done(self, task: asyncio.Task):
+        """Shut down if a loop ended with an unexpected error."""
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(f"Orchestration task {task.get_name()} failed: {task.exception()}")
+        self._shutdown.set()
+
+    async def _main(self):
+        """Run the loops and shut them down in order."""
+        self._loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._fetch_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.async_executor_workers,
+            thread_name_prefix="orchestrator",
+        )
+        self._loop.set_default_executor(self._executor)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._shutdown.set)
+            except (NotImplementedError, RuntimeError):
+                # Not the main thread: the daemon's own handlers call stop()
+                pass
+
+        loops = {
+            "poll": self._poll_loop(),
+            "dispatch": self._dispatch_loop(),
+            "state": self._state_loop(),
+        }
+        if self.config.reaper_interval > 0:
+            loops["reaper"] = self._reaper_loop()
+        if self.config.docker_gc_interval > 0 and not self.config.dry_run:
+            loops["docker-gc"] = self._gc_loop()
+
+        tasks = [asyncio.create_task(coro, name=name) for name, coro in loops.items()]
+        for task in tasks:
+            task.add_done_callback(self._on_loop_done)
+
+        try:
+            await self._shutdown.wait()
+        finally:
+            logger.info("Stopping daemon...")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # A dispatch past its fetch is starting a container: let it
+            # finish so the task is recorded as running and re-adopted later
+            if self._dispatches:
+                logger.info(f"Waiting for {len(self._dispatches)} dispatches to finish")
+                await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+            self._executor.shutdown(wait=True)
+
+    async def _poll_loop(self):
+        """Poll for new or updated issues (start-up queued the open ones)."""
+        self._wakeup.set()
+
+        while not await self._sleep(self.config.poll_interval):
+            try:
+                logger.info("Polling GitHub for issues...")
+                issues = await self._call(self.daemon.github.get_new_or_updated_issues)
+                for issue in issues:
+                    # Only add if not already running
+                    if not self.daemon.task_queue.is_running(issue.number):
+                        self.daemon.task_queue.add_task(issue)
+                logger.info(f"Poll complete, found {len(issues)} new/updated issues")
+                self._wakeup.set()
+            except Exception as e:
+                logger.error(f"Error polling issues: {e}")
+
+    async def _dispatch_loop(self):
+        """Start queued tasks whenever a host has a free slot."""
+        docker = self.daemon.docker
+        while True:
+            # Hold dispatch until the first image is ready
+            if not docker.image_ready.is_set():
+                await asyncio.sleep(1)
+                continue
+
+            host = docker.hosts.acquire()
+            if host is None:
+                await self._wait_for_work()
+                continue
+
+            task, prepared = self.daemon.preparer.next_task()
+            if task is None:
+                docker.hosts.release(host.name)
+                await self._wait_for_work()
+                continue
+
+            dispatch = asyncio.create_task(
+                self._dispatch(task, host, prepared),
+                name=f"dispatch-{task.issue_number}",
+            )
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, task: "Task", host, prepared: Optional["PreparedTask"]):
+        """Fetch without blocking the loop, then create the worktree and start the container."""
+        # A task picked by the prepare stage has (or is getting) its worktree
+        if prepared is None:
+            try:
+                async with self._fetch_lock:
+                    await self.daemon.docker.repo_manager.fetch_async()
+            except Exception as e:
+                # The pull during worktree creation fetches again
+                logger.warning(f"Fetch before dispatch failed: {e}")
+        await self._call(self.daemon._start_task, task, host, prepared)
+
+    async def _state_loop(self):
+        """Save daemon state every minute."""
+        while True:
+            try:
+                await self._call(self.daemon._save_state)
+            except Exception as e:
+                logger.error(f"Error saving state: {e}")
+            if await self._sleep(60):
+                return
+
+    async def _reaper_loop(self):
+        """Remove orphaned worktrees and enforce the disk quota on the reaper interval."""
+        while not await self._sleep(self.config.reaper_interval):
+            try:
+                await self._call(self.daemon.reaper.reap)
+            except Exception as e:
+                logger.error(f"Error in workspace reaper: {e}")
+
+    async def _gc_loop(self):
+        """Run Docker GC on its interval, or early when disk space runs low."""
+        last_run = time.time()
+        # Check disk pressure every minute between scheduled passes
+        while not await self._sleep(60):
+            last_run = await self._call(self.daemon._maybe_collect_docker_garbage, last_run)
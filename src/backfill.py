@@ -0,0 +1,138 @@
+"""Checkpoint and throughput report of one-time (backfill) runs."""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillOutcome:
+    """Result of one issue in a backfill."""
+    issue_number: int
+    status: str  # "completed", "failed" (non-zero exit) or "error" (not run)
+    duration: float
+    exit_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BackfillCheckpoint:
+    """
+    Issues a one-time run has finished, kept on disk so an interrupted run
+    resumes where it stopped.
+
+    An issue counts as finished once its session has ended, successfully or
+    not; issues that could not be started are retried. The file is rewritten
+    atomically after every issue and removed when a run gets through all
+    issues.
+    """
+
+    def __init__(self, path: Path, repo: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Checkpoint file.
+            repo: Repository the backfill runs against; a checkpoint of
+                another repository is ignored.
+        """
+        self.path = path
+        self.repo = repo
+        self._finished: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[int, dict]:
+        """
+        Load the issues finished by a previous run.
+
+        Returns:
+            Mapping of issue number to its recorded outcome.
+        """
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backfill checkpoint {self.path}: {e}")
+            return {}
+
+        if data.get("repo") != self.repo:
+            logger.warning(f"Ignoring backfill checkpoint of another repository ({data.get('repo')})")
+            return {}
+
+        self._finished = {int(number): outcome for number, outcome in data.get("finished", {}).items()}
+        return dict(self._finished)
+
+    def record(self, outcome: BackfillOutcome):
+        """Mark an issue as finished and write the checkpoint."""
+        with self._lock:
+            self._finished[outcome.issue_number] = asdict(outcome)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"repo": self.repo, "finished": self._finished}, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        """Remove the checkpoint after a complete run."""
+        self.path.unlink(missing_ok=True)
+
+
+class BackfillReport:
+    """Collects per-issue outcomes and summarizes the run's throughput."""
+
+    def __init__(self, concurrency: int, skipped: int = 0):
+        """
+        Initialize report.
+
+        Args:
+            concurrency: Maximum sessions run at once.
+            skipped: Issues already finished by an earlier, interrupted run.
+        """
+        self.concurrency = concurrency
+        self.skipped = skipped
+        self.started_at = time.time()
+        self.outcomes: List[BackfillOutcome] = []
+        self._lock = threading.Lock()
+
+    def add(self, outcome: BackfillOutcome):
+        """Record one issue's outcome."""
+        with self._lock:
+            self.outcomes.append(outcome)
+
+    def summary(self) -> List[str]:
+        """
+        Get the summary as printable lines.
+
+        Returns:
+            Counts by outcome, wall time, throughput, mean session time and
+            the parallelism actually achieved.
+        """
+        wall = time.time() - self.started_at
+        with self._lock:
+            outcomes = list(self.outcomes)
+        counts = {status: 0 for status in ("completed", "failed", "error")}
+        for outcome in outcomes:
+            counts[outcome.status] += 1
+        sessions = [o.duration for o in outcomes if o.status != "error"]
+        busy = sum(o.duration for o in outcomes)
+
+        lines = [
+            f"Issues processed: {len(outcomes)} "
+            f"({counts['completed']} completed, {counts['failed']} failed, {counts['error']} errors)",
+        ]
+        if self.skipped:
+            lines.append(f"Skipped (finished in an earlier run): {self.skipped}")
+        lines.append(f"Wall time: {wall:.0f}s with up to {self.concurrency} concurrent sessions")
+        if outcomes and wall > 0:
+            lines.append(f"Throughput: {len(outcomes) / wall * 3600:.1f} issues/hour")
+            lines.append(f"Effective parallelism: {busy / wall:.1f}")
+        if sessions:
+            lines.append(f"Mean session time: {sum(sessions) / len(sessions):.0f}s")
+        return lines
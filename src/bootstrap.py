@@ -0,0 +1,140 @@
+"""Daemon start-up as a graph of steps that run as soon as their dependencies finish."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BootstrapStep:
+    """One start-up step and its timing."""
+    name: str
+    func: Callable[[], None]
+    after: List[str] = field(default_factory=list)
+    started: Optional[float] = None  # Seconds since the bootstrap began
+    finished: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class Bootstrap:
+    """
+    Runs start-up steps concurrently, each on its own thread once every step
+    it depends on has finished.
+
+    A failed step's dependents are not run; steps already running are
+    allowed to finish, then the first failure is raised.
+    """
+
+    def __init__(self):
+        """Initialize an empty bootstrap."""
+        self._steps: Dict[str, BootstrapStep] = {}
+        self._cond = threading.Condition()
+        self._t0: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def step(self, name: str, func: Callable[[], None], after: Sequence[str] = ()):
+        """
+        Add a step.
+
+        Args:
+            name: Step name, used in dependencies and the timing report.
+            func: Callable doing the step's work.
+            after: Names of steps that must finish first (added earlier).
+        """
+        for dependency in after:
+            if dependency not in self._steps:
+                raise ValueError(f"Step {name} depends on unknown step {dependency}")
+        self._steps[name] = BootstrapStep(name=name, func=func, after=list(after))
+
+    def elapsed(self) -> float:
+        """Seconds since the bootstrap began."""
+        return time.monotonic() - self._t0 if self._t0 is not None else 0.0
+
+    def run(self):
+        """
+        Run every step, returning once all have finished.
+
+        Raises:
+            Exception: The first step failure.
+        """
+        self._t0 = time.monotonic()
+        pending = dict(self._steps)
+        failure: Optional[BaseException] = None
+
+        with self._cond:
+            while True:
+                # Dependents of a failed step are never started
+                if failure is None:
+                    for step in list(pending.values()):
+                        if all(self._steps[d].finished is not None for d in step.after):
+                            del pending[step.name]
+                            step.started = self.elapsed()
+                            threading.Thread(
+                                target=self._run_step,
+                                args=(step,),
+                                name=f"bootstrap-{step.name}",
+                                daemon=True,
+                            ).start()
+
+                running = [
+                    s for s in self._steps.values()
+                    if s.started is not None and s.finished is None and s.error is None
+                ]
+                if not running:
+                    break
+                self._cond.wait()
+                if failure is None:
+                    failure = next((s.error for s in self._steps.values() if s.error), None)
+
+        self.total = self.elapsed()
+        if failure is not None:
+            raise failure
+
+    def _run_step(self, step: BootstrapStep):
+        """Run one step on its own thread and record when it finished."""
+        try:
+            step.func()
+        except BaseException as e:
+            logger.error(f"Start-up step {step.name} failed: {e}")
+            with self._cond:
+                step.error = e
+                self._cond.notify_all()
+            return
+        with self._cond:
+            step.finished = self.elapsed()
+            self._cond.notify_all()
+
+    def report(self) -> List[str]:
+        """
+        Get the per-step timing report.
+
+        Returns:
+            One line per step (start and end offsets, duration), in start
+            order, followed by the total against the serial sum.
+        """
+        steps = sorted(
+            (s for s in self._steps.values() if s.started is not None),
+            key=lambda s: s.started,
+        )
+        lines = []
+        for step in steps:
+            if step.error is not None:
+                lines.append(f"  {step.name:<10} {step.started:6.2f}s  failed")
+            else:
+                lines.append(
+                    f"  {step.name:<10} {step.started:6.2f}s -> {step.finished:6.2f}s"
+                    f"  ({step.duration:.2f}s)"
+                )
+        serial = sum(s.duration or 0.0 for s in steps)
+        lines.append(f"  total      {self.total or self.elapsed():.2f}s (steps sum to {serial:.2f}s)")
+        return lines
@@ -0,0 +1,186 @@
+"""Content digests of Docker build inputs for skipping unchanged rebuilds."""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# Image label holding the digest of the inputs an image was built from
+BUILD_DIGEST_LABEL = "claude-issue-solver.build-digest"
+
+# Always left out of the digest: git metadata changes on every fetch
+ALWAYS_EXCLUDED = {".git"}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _pattern_to_regex(pattern: str) -> re.Pattern:
+    """
+    Translate a .dockerignore pattern into a regular expression.
+
+    Supports '*', '?', '**' and character classes like Docker's matcher.
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            if pattern[i:i + 2] == "**":
+                # '**/' matches zero or more directories
+                if pattern[i:i + 3] == "**/":
+                    regex += "(?:.*/)?"
+                    i += 3
+                else:
+                    regex += ".*"
+                    i += 2
+                continue
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                char_class = pattern[i + 1:end]
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                regex += f"[{char_class}]"
+                i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+    return re.compile(f"^{regex}$")
+
+
+def load_dockerignore(context: Path) -> List[Tuple[bool, re.Pattern]]:
+    """
+    Parse the .dockerignore file of a build context.
+
+    Args:
+        context: Build context directory.
+
+    Returns:
+        List of (is_exception, compiled_pattern) rules in file order.
+    """
+    ignore_file = context / ".dockerignore"
+    if not ignore_file.exists():
+        return []
+
+    rules = []
+    for line in ignore_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:].strip()
+        line = os.path.normpath(line.lstrip("/"))
+        if line == ".":
+            continue
+        rules.append((negate, _pattern_to_regex(line)))
+    return rules
+
+
+def is_ignored(relative: str, rules: List[Tuple[bool, re.Pattern]]) -> bool:
+    """
+    Check a context-relative path against .dockerignore rules.
+
+    A rule matches a path or any of its parent directories; the last
+    matching rule wins.
+
+    Args:
+        relative: Path relative to the build context, using '/' separators.
+        rules: Rules from load_dockerignore().
+
+    Returns:
+        True if the path is excluded from the build context.
+    """
+    parts = relative.split("/")
+    prefixes = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    ignored = False
+    for negate, pattern in rules:
+        if any(pattern.match(prefix) for prefix in prefixes):
+            ignored = not negate
+    return ignored
+
+
+def _hash_file(digest, path: Path):
+    """Add a file's content to a running digest."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+
+
+def _hash_context(digest, context: Path):
+    """Add every non-ignored file of a build context to a running digest."""
+    rules = load_dockerignore(context)
+    # With exception rules an ignored directory may still contain included files
+    can_prune = not any(negate for negate, _ in rules)
+
+    for root, dirs, files in os.walk(context):
+        root_path = Path(root)
+        relative_root = root_path.relative_to(context).as_posix()
+        if relative_root == ".":
+            relative_root = ""
+
+        kept_dirs = []
+        for name in sorted(dirs):
+            relative = f"{relative_root}/{name}" if relative_root else name
+            if name in ALWAYS_EXCLUDED and not relative_root:
+                continue
+            if can_prune and is_ignored(relative, rules):
+                continue
+            kept_dirs.append(name)
+        dirs[:] = kept_dirs
+
+        for name in sorted(files):
+            relative = f"{relative_root}/{name}" if relative_root else name
+            if is_ignored(relative, rules):
+                continue
+            path = root_path / name
+            digest.update(b"F\0" + relative.encode() + b"\0")
+            if path.is_symlink():
+                digest.update(b"L\0" + os.readlink(path).encode())
+                continue
+            try:
+                mode = path.stat().st_mode
+            except OSError:
+                continue
+            digest.update(b"X" if mode & 0o111 else b"-")
+            _hash_file(digest, path)
+
+
+def compute_build_digest(
+    dev_dockerfile: Path,
+    claude_dockerfile: Path,
+    extra: Optional[Iterable[str]] = None,
+) -> str:
+    """
+    Compute a digest of everything the Claude image is built from.
+
+    Covers the development Dockerfile, its build context (respecting
+    .dockerignore, excluding .git) and Dockerfile.claude.
+
+    Args:
+        dev_dockerfile: Development Dockerfile of the target repository.
+        claude_dockerfile: Dockerfile that adds the Claude CLI.
+        extra: Additional strings that affect the build (e.g., URLs).
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(b"dev-dockerfile\0" + dev_dockerfile.name.encode() + b"\0")
+    _hash_file(digest, dev_dockerfile)
+    digest.update(b"\0dev-context\0")
+    _hash_context(digest, dev_dockerfile.parent)
+    digest.update(b"\0claude-dockerfile\0")
+    _hash_file(digest, claude_dockerfile)
+    for value in extra or []:
+        digest.update(b"\0extra\0" + value.encode())
+    return digest.hexdigest()
@@ -0,0 +1,254 @@
+"""Shared per-ecosystem build cache volumes for task containers."""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+from docker.errors import DockerException, NotFound
+
+from .config import get_config
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+CACHE_VOLUME_PREFIX = "claude-cache-"
+CACHE_VOLUME_LABEL = "claude-issue-solver.cache"
+CACHE_MOUNT_ROOT = "/caches"
+
+# Environment variable pointing each tool at its cache directory. Caches are
+# mounted under /caches rather than in the home directory so Docker does not
+# create root-owned parent directories there.
+CACHE_TYPES: Dict[str, str] = {
+    "pip": "PIP_CACHE_DIR",
+    "uv": "UV_CACHE_DIR",
+    "npm": "npm_config_cache",
+    "yarn": "YARN_CACHE_FOLDER",
+    "cargo": "CARGO_HOME",
+    "go": "GOMODCACHE",
+    "gradle": "GRADLE_USER_HOME",
+    "ccache": "CCACHE_DIR",
+}
+
+# Prints the volume usage in KB, first deleting least recently modified files
+# until usage is below the target when it exceeds the limit
+_TRIM_SCRIPT = r'''
+used=$(du -sk /cache | cut -f1)
+if [ "$used" -gt "$1" ]; then
+  find /cache -type f -printf '%T@ %k %p\n' 2>/dev/null | sort -n |
+  while read -r _ size path; do
+    [ "$used" -le "$2" ] && break
+    rm -f "$path" && used=$((used - size))
+  done
+  find /cache -mindepth 1 -type d -empty -delete 2>/dev/null
+  used=$(du -sk /cache | cut -f1)
+fi
+echo "$used"
+'''
+
+
+class CacheVolumes:
+    """
+    Named Docker volumes holding package and build caches across tasks.
+
+    Concurrent use by several containers is left to the tools themselves
+    (pip, npm, cargo, Gradle and ccache all lock or write atomically). The
+    size cleanup only touches a volume no running task container has
+    mounted, and holds a lock that new containers wait on while it runs.
+    Volumes handed out by mounts() stay claimed, and are skipped by the
+    cleanup, until release() is called once their container exists.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize cache volumes.
+
+        Args:
+            docker_manager: Docker manager providing the client and image.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self._lock = threading.Lock()
+        self._ready: Set[str] = set()
+        self._claims: Dict[str, int] = {}  # Volume name -> containers being created
+        self._claims_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any cache volume is configured."""
+        return bool(self.config.cache_volumes)
+
+    @staticmethod
+    def volume_name(cache_type: str) -> str:
+        """Get the Docker volume name of a cache type."""
+        return f"{CACHE_VOLUME_PREFIX}{cache_type}"
+
+    def _ensure_volume(self, cache_type: str):
+        """Create a cache volume owned by the claude user, once."""
+        name = self.volume_name(cache_type)
+        if name in self._ready:
+            return
+
+        try:
+            self.docker.client.volumes.get(name)
+        except NotFound:
+            self.docker.client.volumes.create(name, labels={CACHE_VOLUME_LABEL: cache_type})
+            logger.info(f"Created cache volume {name}")
+
+        # New volumes are root-owned; task containers run as claude
+        self.docker.client.containers.run(
+            self.docker.get_active_image(),
+            entrypoint=["/bin/sh", "-c"],
+            command=["chown claude:claude /cache"],
+            volumes={name: {"bind": "/cache", "mode": "rw"}},
+            user="root",
+            remove=True,
+        )
+        self._ready.add(name)
+
+    def mounts(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get the volume mounts for a task container, creating volumes as needed.
+
+        Waits while a cleanup is in progress. The returned volumes are
+        claimed until release() is called with them, which the caller must do
+        once the container is created (or creating it failed).
+
+        Returns:
+            Volume specification for the Docker SDK.
+        """
+        if not self.enabled or self.config.dry_run:
+            return {}
+
+        volumes = {}
+        with self._lock:
+            for cache_type in self.config.cache_volumes:
+                try:
+                    self._ensure_volume(cache_type)
+                except DockerException as e:
+                    logger.warning(f"Cache volume for {cache_type} unavailable: {e}")
+                    continue
+                volumes[self.volume_name(cache_type)] = {
+                    "bind": f"{CACHE_MOUNT_ROOT}/{cache_type}",
+                    "mode": "rw",
+                }
+            with self._claims_lock:
+                for name in volumes:
+                    self._claims[name] = self._claims.get(name, 0) + 1
+        return volumes
+
+    def release(self, volumes: Dict[str, Dict[str, str]]):
+        """
+        Drop the claims taken by mounts() once the container exists.
+
+        Args:
+            volumes: The container's volume specification; entries that are
+                not cache volumes are ignored.
+        """
+        with self._claims_lock:
+            for name in volumes:
+                if name in self._claims:
+                    self._claims[name] -= 1
+                    if self._claims[name] <= 0:
+                        del self._claims[name]
+
+    def environment(self, volumes: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """
+        Get the environment pointing each tool at its cache volume.
+
+        Only volumes the container actually mounts are used; a tool whose
+        volume could not be created keeps its default cache location.
+
+        Args:
+            volumes: The container's volume specification (from mounts()).
+
+        Returns:
+            Environment variables.
+        """
+        if not self.enabled or self.config.dry_run:
+            return {}
+        return {
+            CACHE_TYPES[cache_type]: f"{CACHE_MOUNT_ROOT}/{cache_type}"
+            for cache_type in self.config.cache_volumes
+            if self.volume_name(cache_type) in volumes
+        }
+
+    def wait_for_cleanup(self):
+        """Block while a cleanup is in progress (used before a pooled session starts)."""
+        with self._lock:
+            pass
+
+    def _in_use(self, name: str) -> bool:
+        """
+        Check whether a running task container mounts a volume or one is
+        being created with it.
+
+        Idle pooled containers do not count: their sessions wait for the
+        cleanup to finish before starting.
+        """
+        from .container_pool import POOL_CONTAINER_PREFIX
+
+        with self._claims_lock:
+            if self._claims.get(name):
+                return True
+        containers = self.docker.client.containers.list(filters={"volume": name})
+        return any(not c.name.startswith(POOL_CONTAINER_PREFIX) for c in containers)
+
+    def _trim(self, name: str) -> Optional[int]:
+        """
+        Trim a volume to the size cap.
+
+        Returns:
+            Remaining size in MB, or None if the trim failed.
+        """
+        limit_kb = self.config.cache_volume_max_mb * 1024
+        # Trim to 80% so the next cleanup is not due right away
+        target_kb = limit_kb * 8 // 10
+        output = self.docker.client.containers.run(
+            self.docker.get_active_image(),
+            entrypoint=["/bin/sh", "-c", _TRIM_SCRIPT, "trim"],
+            command=[str(limit_kb), str(target_kb)],
+            volumes={name: {"bind": "/cache", "mode": "rw"}},
+            user="root",
+            remove=True,
+        )
+        try:
+            return int(output.decode().strip().splitlines()[-1]) // 1024
+        except (ValueError, IndexError):
+            return None
+
+    def cleanup(self) -> Dict[str, Optional[int]]:
+        """
+        Enforce CACHE_VOLUME_MAX_MB on every cache volume not currently mounted.
+
+        Returns:
+            Mapping of volume name to its size in MB after cleanup (volumes
+            that were in use are skipped).
+        """
+        if not self.enabled:
+            return {}
+
+        if self.config.dry_run:
+            logger.info("[DRY-RUN] Would trim cache volumes")
+            return {}
+
+        if not self.docker.image_ready.is_set():
+            return {}
+
+        sizes = {}
+        for cache_type in self.config.cache_volumes:
+            name = self.volume_name(cache_type)
+            with self._lock:
+                try:
+                    self.docker.client.volumes.get(name)
+                    if self._in_use(name):
+                        continue
+                    sizes[name] = self._trim(name)
+                except NotFound:
+                    continue
+                except DockerException as e:
+                    logger.warning(f"Failed to clean cache volume {name}: {e}")
+                    continue
+            logger.info(f"Cache volume {name}: {sizes[name]} MB after cleanup")
+        return sizes
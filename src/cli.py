@@ -8,8 +8,10 @@ import time
 from pathlib import Path
 import click
 
-from .config import get_config, set_config, Config
-from .daemon import IssueSolverDaemon
+# Only what every command needs: the daemon and the Docker/GitHub SDKs are
+# imported by the commands that use them, so status/queue/pause start fast
+from .config import get_runtime_config, set_config, Config
+from .control import ControlError, ControlTimeout, ControlUnavailable, call
 
 
 def setup_logging(level: str = "INFO"):
@@ -26,7 +28,7 @@ def setup_logging(level: str = "INFO"):
 
 def get_daemon_pid() -> int:
     """Get the PID of the running daemon."""
-    config = get_config()
+    config = get_runtime_config()
     if not config.pid_file.exists():
         return None
 
@@ -51,6 +53,82 @@ def is_daemon_running() -> bool:
         return False
 
 
+def send_command(command: str, **args):
+    """
+    Send a command to the running daemon over its control socket.
+
+    Args:
+        command: Command name.
+        **args: Command arguments.
+
+    Returns:
+        The command's result, or None if no daemon is listening.
+    """
+    try:
+        return call(command, **args)
+    except ControlUnavailable:
+        return None
+    except ControlTimeout as e:
+        click.echo(f"Timed out: {e}", err=True)
+        sys.exit(1)
+    except ControlError as e:
+        click.echo(f"Command {command} failed: {e}", err=True)
+        sys.exit(1)
+
+
+def require_command(command: str, **args):
+    """Send a command that only a running daemon can carry out."""
+    result = send_command(command, **args)
+    if result is None:
+        if is_daemon_running():
+            click.echo("Daemon is not answering on its control socket", err=True)
+        else:
+            click.echo("Daemon is not running")
+        sys.exit(1)
+    return result
+
+
+def load_state(command: str) -> dict:
+    """
+    Get the live state from the daemon, or the last saved state if it is down.
+
+    Args:
+        command: Control command returning the state ("status" or "queue").
+
+    Returns:
+        State dictionary in the state file's format.
+    """
+    state = send_command(command)
+    if state is not None:
+        return state
+
+    config = get_runtime_config()
+    if not config.state_file.exists():
+        click.echo("Daemon is not running" if not is_daemon_running() else "No state file found")
+        sys.exit(1)
+
+    if is_daemon_running():
+        click.echo("Daemon is not answering on its control socket; showing the last saved state\n")
+    else:
+        click.echo("Daemon is not running; showing the last saved state\n")
+    with open(config.state_file) as f:
+        return json.load(f)
+
+
+def set_saved_pause(paused: bool):
+    """Set the pause flag in the state file, which the daemon loads when it starts."""
+    config = get_runtime_config()
+    state = {}
+    if config.state_file.exists():
+        with open(config.state_file) as f:
+            state = json.load(f)
+
+    state["paused"] = paused
+
+    with open(config.state_file, "w") as f:
+        json.dump(state, f, indent=2)
+
+
 @click.group()
 @click.option("--log-level", default="INFO", help="Logging level")
 def cli(log_level):
@@ -62,7 +140,9 @@ def cli(log_level):
 @click.option("--foreground", "-f", is_flag=True, help="Run in foreground")
 @click.option("--dry-run", is_flag=True, help="Simulate actions without executing them")
 @click.option("--one-time", is_flag=True, help="Run once through all issues and exit")
-def start(foreground, dry_run, one_time):
+@click.option("--concurrency", type=click.IntRange(min=1), default=None, help="Sessions at once in one-time mode")
+@click.option("--fresh", is_flag=True, help="In one-time mode, ignore the checkpoint of an interrupted run")
+def start(foreground, dry_run, one_time, concurrency, fresh):
     """Start the daemon."""
     if is_daemon_running() and not dry_run and not one_time:
         click.echo("Daemon is already running")
@@ -80,6 +160,8 @@ def start(foreground, dry_run, one_time):
         click.echo("Starting Claude Issue Solver daemon...")
 
     try:
+        from .daemon import IssueSolverDaemon
+
         # Set up config with dry-run mode if needed
         if dry_run:
             config = Config(dry_run=True)
@@ -89,7 +171,11 @@ def start(foreground, dry_run, one_time):
 
         if one_time:
             # Run once and exit
-            daemon.run_once()
+            report = daemon.run_once(concurrency=concurrency, fresh=fresh)
+            if report:
+                click.echo("\n=== Backfill Summary ===")
+                for line in report.summary():
+                    click.echo(line)
         elif foreground or dry_run:
             # Run in foreground (always foreground for dry-run)
             daemon.start()
@@ -160,25 +246,18 @@ def restart():
 @cli.command()
 def status():
     """Show daemon status."""
-    if not is_daemon_running():
-        click.echo("Daemon is not running")
-        sys.exit(1)
-
-    config = get_config()
-
-    # Load state file
-    if not config.state_file.exists():
-        click.echo("No state file found")
-        sys.exit(1)
+    config = get_runtime_config()
+    state = load_state("status")
 
     try:
-        with open(config.state_file) as f:
-            state = json.load(f)
-
         click.echo("=== Claude Issue Solver Status ===\n")
-        click.echo(f"PID: {get_daemon_pid()}")
+        if is_daemon_running():
+            click.echo(f"PID: {get_daemon_pid()}")
         click.echo(f"Paused: {state.get('paused', False)}")
-        click.echo(f"Running tasks: {len(state.get('running', []))}/{config.max_concurrent}")
+        if state.get("draining"):
+            click.echo("Draining: shutting down once running tasks finish")
+        max_concurrent = state.get("max_concurrent", config.max_concurrent)
+        click.echo(f"Running tasks: {len(state.get('running', []))}/{max_concurrent}")
         click.echo(f"Queued tasks: {len(state.get('queued', []))}")
         click.echo()
 
@@ -189,6 +268,8 @@ def status():
             for task in running:
                 click.echo(f"  - Issue #{task['issue_number']}: {task['issue_title']}")
                 click.echo(f"    Started: {task.get('started_at', 'N/A')}")
+                if task.get('docker_host') not in (None, "local"):
+                    click.echo(f"    Docker host: {task['docker_host']}")
             click.echo()
 
         # Queued tasks
@@ -209,6 +290,26 @@ def status():
                 click.echo(f"    Status: {task['status']}")
                 if task.get('error'):
                     click.echo(f"    Error: {task['error']}")
+                resources = task.get('resources')
+                if resources:
+                    avg_cpu = resources.get('cpu_percent_avg')
+                    avg_cpu = f"{avg_cpu:.0f}%" if avg_cpu is not None else "n/a"
+                    click.echo(
+                        f"    Resources: CPU peak {resources['cpu_percent_peak']:.0f}% "
+                        f"(avg {avg_cpu}), "
+                        f"memory peak {resources['memory_bytes_peak'] / 1024 / 1024:.0f} MB"
+                    )
+            click.echo()
+
+        # Git command timings
+        git_metrics = state.get("metrics", {}).get("git", {})
+        if git_metrics:
+            click.echo("Git Command Timings:")
+            for name, hist in git_metrics.items():
+                click.echo(
+                    f"  {name}: {hist['count']} calls, "
+                    f"avg {hist['avg']:.2f}s, max {hist['max']:.2f}s"
+                )
 
     except Exception as e:
         click.echo(f"Failed to read status: {e}", err=True)
@@ -218,16 +319,9 @@ def status():
 @cli.command()
 def queue():
     """Show work queue."""
-    if not is_daemon_running():
-        click.echo("Daemon is not running")
-        sys.exit(1)
-
-    config = get_config()
+    state = load_state("queue")
 
     try:
-        with open(config.state_file) as f:
-            state = json.load(f)
-
         click.echo("=== Work Queue ===\n")
 
         # Running
@@ -251,22 +345,17 @@ def queue():
 @cli.command()
 def pause():
     """Pause task execution."""
-    if not is_daemon_running():
-        click.echo("Daemon is not running")
-        sys.exit(1)
+    if send_command("pause") is not None:
+        click.echo("Daemon paused (currently running tasks will complete)")
+        return
 
-    config = get_config()
+    if is_daemon_running():
+        click.echo("Daemon is not answering on its control socket", err=True)
+        sys.exit(1)
 
     try:
-        with open(config.state_file) as f:
-            state = json.load(f)
-
-        state["paused"] = True
-
-        with open(config.state_file, "w") as f:
-            json.dump(state, f, indent=2)
-
-        click.echo("Daemon paused (currently running tasks will complete)")
+        set_saved_pause(True)
+        click.echo("Daemon is not running; it will start paused")
 
     except Exception as e:
         click.echo(f"Failed to pause daemon: {e}", err=True)
@@ -276,22 +365,17 @@ def pause():
 @cli.command()
 def resume():
     """Resume task execution."""
-    if not is_daemon_running():
-        click.echo("Daemon is not running")
-        sys.exit(1)
+    if send_command("resume") is not None:
+        click.echo("Daemon resumed")
+        return
 
-    config = get_config()
+    if is_daemon_running():
+        click.echo("Daemon is not answering on its control socket", err=True)
+        sys.exit(1)
 
     try:
-        with open(config.state_file) as f:
-            state = json.load(f)
-
-        state["paused"] = False
-
-        with open(config.state_file, "w") as f:
-            json.dump(state, f, indent=2)
-
-        click.echo("Daemon resumed")
+        set_saved_pause(False)
+        click.echo("Daemon is not running; it will start unpaused")
 
     except Exception as e:
         click.echo(f"Failed to resume daemon: {e}", err=True)
@@ -300,10 +384,82 @@ def resume():
 
 @cli.command()
 @click.argument("issue_number", type=int)
-def logs(issue_number):
+def enqueue(issue_number):
+    """Queue an issue now, whatever its labels."""
+    result = require_command("enqueue", issue_number=issue_number)
+    if result["added"]:
+        click.echo(f"Queued issue #{issue_number}")
+    else:
+        click.echo(f"Issue #{issue_number} is already queued or running")
+
+
+@cli.command()
+@click.argument("issue_number", type=int)
+def cancel(issue_number):
+    """Drop a queued issue or stop its running container."""
+    result = require_command("cancel", issue_number=issue_number)
+    if result["cancelled"] == "queued":
+        click.echo(f"Removed issue #{issue_number} from the queue")
+    else:
+        click.echo(f"Stopping the container of issue #{issue_number}")
+
+
+@cli.command()
+def drain():
+    """Stop starting tasks and shut down once the running ones finish."""
+    result = require_command("drain")
+    if result["running"]:
+        click.echo(f"Draining: the daemon stops after {result['running']} running tasks finish")
+    else:
+        click.echo("No tasks running; the daemon is stopping")
+
+
+@cli.command()
+@click.argument("issue_number", type=int)
+@click.option("--follow", "-f", is_flag=True, help="Keep printing new output until the run ends")
+@click.option("--tail", "-n", "tail_lines", type=int, default=None, help="Only show the last N lines")
+@click.option("--run", "run_id", default=None, help="Run (task) ID prefix, defaults to the latest run")
+def logs(issue_number, follow, tail_lines, run_id):
     """Show logs for a specific issue."""
+    from .task_logs import TaskLogStore, follow as follow_run, read_all, tail
+
+    store = TaskLogStore()
+    run = store.find_run(issue_number, run_id)
+
+    if run is None:
+        if run_id:
+            click.echo(f"No run {run_id} recorded for issue #{issue_number}", err=True)
+            sys.exit(1)
+        _show_container_logs(issue_number)
+        return
+
+    run_dir = store.run_dir(issue_number, run["run_id"])
+    click.echo(
+        f"=== Logs for Issue #{issue_number} "
+        f"(run {run['run_id'][:12]}, started {run['started_at']}) ===\n",
+        err=True,
+    )
+
+    try:
+        if tail_lines is not None:
+            for line in tail(run_dir, tail_lines):
+                click.echo(line, nl=False)
+        elif not follow:
+            for chunk in read_all(run_dir):
+                click.echo(chunk, nl=False)
+
+        if follow:
+            # Without --tail, following starts at the beginning of the output
+            for chunk in follow_run(run_dir, from_end=tail_lines is not None):
+                click.echo(chunk, nl=False)
+    except KeyboardInterrupt:
+        pass
+
+
+def _show_container_logs(issue_number: int):
+    """Show logs straight from the issue's container (no captured run)."""
     if not is_daemon_running():
-        click.echo("Daemon is not running")
+        click.echo(f"No captured logs for issue #{issue_number} and daemon is not running")
         sys.exit(1)
 
     try:
@@ -9,11 +9,48 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-class Config:
+class RuntimeConfig:
+    """
+    Runtime file locations and limits shared by the daemon and the CLI.
+
+    Commands that only talk to a running daemon or read its state file need
+    nothing else; building this checks no credentials, runs no keychain
+    lookups and creates no directories.
+    """
+
+    def __init__(self):
+        """Initialize runtime settings from environment variables."""
+        self.max_concurrent: int = int(os.getenv("MAX_CONCURRENT", "3"))
+
+        # Runtime files
+        self.pid_file: Path = Path(
+            os.getenv("PID_FILE", "/tmp/claude-issue-solver.pid")
+        )
+        self.state_file: Path = Path(
+            os.getenv("STATE_FILE", "/tmp/claude-issue-solver-state.json")
+        )
+        # Issues finished by an interrupted one-time run, skipped when it is rerun
+        self.backfill_checkpoint: Path = Path(
+            os.getenv("BACKFILL_CHECKPOINT", "/tmp/claude-issue-solver-backfill.json")
+        )
+        # Unix socket the CLI sends commands (status, pause, cancel, ...) to
+        self.control_socket: Path = Path(
+            os.getenv("CONTROL_SOCKET", "/tmp/claude-issue-solver.sock")
+        )
+
+        # Per-task container logs (see Config for rotation and retention)
+        self.task_log_dir: Path = Path(
+            os.getenv("TASK_LOG_DIR", "/tmp/claude-task-logs")
+        )
+
+
+class Config(RuntimeConfig):
     """Configuration container for the issue solver."""
 
     def __init__(self, dry_run: bool = False):
         """Initialize configuration from environment variables."""
+        super().__init__()
+
         # Runtime mode
         self.dry_run: bool = dry_run
 
@@ -89,17 +126,162 @@ class Config:
 
         # Daemon Configuration
         self.poll_interval: int = int(os.getenv("POLL_INTERVAL", "600"))
-        self.max_concurrent: int = int(os.getenv("MAX_CONCURRENT", "3"))
+
+        # How the daemon's loops run: "threads" (one thread per loop) or
+        # "asyncio" (tasks on one event loop, blocking calls on a bounded executor)
+        self.orchestration: str = os.getenv("ORCHESTRATION", "threads").lower()
+        self.async_executor_workers: int = int(os.getenv("ASYNC_EXECUTOR_WORKERS", "8"))
+
+        # Pipelined dispatch: worktrees and prompts of the next PREPARE_AHEAD
+        # queued tasks are prepared before a slot frees (0 disables); prepared
+        # worktrees older than PREPARE_MAX_AGE seconds are recreated at start
+        self.prepare_ahead: int = int(os.getenv("PREPARE_AHEAD", "2"))
+        self.prepare_max_age: int = int(os.getenv("PREPARE_MAX_AGE", "900"))
+
+        # One-time (backfill) runs: sessions at once (0 = MAX_CONCURRENT)
+        self.one_time_concurrency: int = int(os.getenv("ONE_TIME_CONCURRENCY", "0"))
         self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
 
-        # Runtime files
-        self.pid_file: Path = Path(
-            os.getenv("PID_FILE", "/tmp/claude-issue-solver.pid")
+        # Git commands slower than this many seconds are logged (0 disables)
+        self.git_slow_threshold: float = float(os.getenv("GIT_SLOW_THRESHOLD", "10"))
+
+        # Workspace reaper: interval in seconds (0 disables), how long orphaned
+        # worktrees are kept, and the disk quota for worktrees + repo cache (0 = no quota)
+        self.reaper_interval: int = int(os.getenv("REAPER_INTERVAL", "3600"))
+        self.worktree_retention_hours: float = float(
+            os.getenv("WORKTREE_RETENTION_HOURS", "24")
         )
-        self.state_file: Path = Path(
-            os.getenv("STATE_FILE", "/tmp/claude-issue-solver-state.json")
+        self.disk_quota_mb: int = int(os.getenv("DISK_QUOTA_MB", "0"))
+
+        # Resume existing issue-N branches (local or on origin) instead of
+        # recreating them, optionally rebasing them onto the default branch
+        # (branches already pushed to origin are never rebased)
+        self.resume_branches: bool = self._get_bool("RESUME_BRANCHES", False)
+        self.rebase_on_resume: bool = self._get_bool("REBASE_ON_RESUME", False)
+
+        # Task workspace layout: "worktree" (linked git worktree) or
+        # "shared-clone" (self-contained clone borrowing the cache's objects)
+        self.workspace_mode: str = os.getenv("WORKSPACE_MODE", "worktree").lower()
+
+        # Claude installer: optional URL override and pinned SHA-256, the local
+        # artifact cache it is kept in, how long a cached copy counts as fresh,
+        # and offline mode (never download, use the cached copy only)
+        self.claude_install_url: Optional[str] = os.getenv("CLAUDE_INSTALL_URL") or None
+        self.claude_install_sha256: Optional[str] = os.getenv("CLAUDE_INSTALL_SHA256") or None
+        self.artifact_cache_dir: Path = Path(
+            os.getenv("ARTIFACT_CACHE_DIR", "/tmp/claude-artifacts")
+        )
+        self.artifact_cache_ttl_hours: float = float(
+            os.getenv("ARTIFACT_CACHE_TTL_HOURS", "24")
+        )
+        self.offline: bool = self._get_bool("OFFLINE", False)
+
+        # Reuse an existing image when its build inputs are unchanged
+        self.image_build_cache: bool = self._get_bool("IMAGE_BUILD_CACHE", True)
+
+        # Warm container pool: idle containers kept ready (0 disables), bounded
+        # by spare capacity, and where their workspace slot directories live
+        self.warm_pool_size: int = int(os.getenv("WARM_POOL_SIZE", "0"))
+        self.pool_slot_dir: Path = Path(
+            os.getenv("POOL_SLOT_DIR", "/tmp/claude-pool-slots")
         )
 
+        # Dependency snapshots: setup command run once per default-branch commit
+        # (empty disables), where snapshots live, how many to keep and how their
+        # ignored artifacts are cloned into worktrees (auto/reflink/hardlink/copy)
+        self.snapshot_setup_command: Optional[str] = os.getenv("SNAPSHOT_SETUP_COMMAND") or None
+        self.snapshot_dir: Path = Path(
+            os.getenv("SNAPSHOT_DIR", "/tmp/claude-snapshots")
+        )
+        self.snapshot_keep: int = int(os.getenv("SNAPSHOT_KEEP", "2"))
+        self.snapshot_link_mode: str = os.getenv("SNAPSHOT_LINK_MODE", "auto").lower()
+
+        # Warm images: command run once per default-branch commit in the task
+        # image, whose result is committed as the image tasks start from
+        # (empty disables), and how many warm images to keep
+        self.warm_image_command: Optional[str] = os.getenv("WARM_IMAGE_COMMAND") or None
+        self.warm_image_keep: int = int(os.getenv("WARM_IMAGE_KEEP", "3"))
+
+        # Per-task container logs (TASK_LOG_DIR): segment size before a
+        # segment is rotated and compressed, segments kept per run, runs kept
+        # per issue
+        self.task_log_segment_mb: int = int(os.getenv("TASK_LOG_SEGMENT_MB", "5"))
+        self.task_log_max_segments: int = int(os.getenv("TASK_LOG_MAX_SEGMENTS", "10"))
+        self.task_log_runs_per_issue: int = int(os.getenv("TASK_LOG_RUNS_PER_ISSUE", "5"))
+
+        # Local package proxy: PyPI/npm pull-through mirror and caching HTTP
+        # proxy for task containers, with a size-bounded LRU download cache.
+        # Binds to the Docker bridge gateway unless PACKAGE_PROXY_BIND is set;
+        # plain-HTTP forwarding is limited to the allowed mirror hosts
+        self.package_proxy: bool = self._get_bool("PACKAGE_PROXY", False)
+        self.package_proxy_bind: str = os.getenv("PACKAGE_PROXY_BIND", "")
+        self.package_proxy_allowed_hosts: list[str] = [
+            host.strip().lower()
+            for host in os.getenv(
+                "PACKAGE_PROXY_ALLOWED_HOSTS",
+                "deb.debian.org,security.debian.org,archive.ubuntu.com,"
+                "security.ubuntu.com,ports.ubuntu.com,dl-cdn.alpinelinux.org",
+            ).split(",")
+            if host.strip()
+        ]
+        self.package_proxy_port: int = int(os.getenv("PACKAGE_PROXY_PORT", "3142"))
+        self.package_proxy_cache_dir: Path = Path(
+            os.getenv("PACKAGE_PROXY_CACHE_DIR", "/tmp/claude-package-cache")
+        )
+        self.package_proxy_cache_mb: int = int(os.getenv("PACKAGE_PROXY_CACHE_MB", "10240"))
+
+        # Shared cache volumes: comma-separated cache types to mount (see
+        # cache_volumes.CACHE_TYPES), size cap per volume and minimum seconds
+        # between cleanups (run after a task finishes)
+        self.cache_volumes: list[str] = [
+            name.strip().lower()
+            for name in os.getenv("CACHE_VOLUMES", "").split(",")
+            if name.strip()
+        ]
+        self.cache_volume_max_mb: int = int(os.getenv("CACHE_VOLUME_MAX_MB", "5120"))
+        self.cache_volume_cleanup_interval: int = int(
+            os.getenv("CACHE_VOLUME_CLEANUP_INTERVAL", "3600")
+        )
+
+        # Docker garbage collection: seconds between passes (0 disables), free
+        # space in the Docker data directory that triggers an early pass, task
+        # images kept besides the active one, how long stopped task containers
+        # are kept and the build cache size cap
+        self.docker_gc_interval: int = int(os.getenv("DOCKER_GC_INTERVAL", "3600"))
+        self.docker_gc_min_free_mb: int = int(os.getenv("DOCKER_GC_MIN_FREE_MB", "5120"))
+        self.image_gc_keep: int = int(os.getenv("IMAGE_GC_KEEP", "2"))
+        self.container_retention_hours: float = float(
+            os.getenv("CONTAINER_RETENTION_HOURS", "24")
+        )
+        self.build_cache_max_mb: int = int(os.getenv("BUILD_CACHE_MAX_MB", "10240"))
+
+        # Resource telemetry: seconds between samples of running containers
+        # (0 disables) and samples kept per task before the series is thinned
+        self.telemetry_interval: int = int(os.getenv("TELEMETRY_INTERVAL", "15"))
+        self.telemetry_max_samples: int = int(os.getenv("TELEMETRY_MAX_SAMPLES", "240"))
+
+        # CPU pinning: give each local task container its own cores (and NUMA
+        # memory node), sized by the task type; reserved CPUs are never handed out
+        self.cpu_pinning: bool = self._get_bool("CPU_PINNING", False)
+        self.plan_task_cpus: int = int(os.getenv("PLAN_TASK_CPUS", "2"))
+        self.implement_task_cpus: int = int(os.getenv("IMPLEMENT_TASK_CPUS", "4"))
+        self.cpu_pinning_reserved: list[int] = [
+            int(cpu)
+            for part in os.getenv("CPU_PINNING_RESERVED", "").split(",")
+            if part.strip()
+            for cpu in self._cpu_range(part.strip())
+        ]
+
+        # Docker endpoints tasks are spread over: comma-separated url=capacity
+        # entries, url being "local", tcp://host:port or ssh://user@host. The
+        # local endpoint builds the images and always comes first (capacity 0
+        # if not listed). When set, the total capacity replaces MAX_CONCURRENT.
+        self.docker_hosts: list[tuple[Optional[str], int]] = self._parse_docker_hosts(
+            os.getenv("DOCKER_HOSTS", "")
+        )
+        if os.getenv("DOCKER_HOSTS", "").strip():
+            self.max_concurrent = sum(capacity for _, capacity in self.docker_hosts)
+
         # Validate paths
         self._validate()
 
@@ -110,6 +292,51 @@ class Config:
             raise ValueError(f"Required environment variable {key} is not set")
         return value
 
+    def _get_bool(self, key: str, default: bool) -> bool:
+        """Get boolean environment variable (1/true/yes/on are true)."""
+        value = os.getenv(key)
+        if value is None or value.strip() == "":
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    @staticmethod
+    def _cpu_range(value: str) -> range:
+        """Expand a CPU number or range such as "0-1"."""
+        start, _, end = value.partition("-")
+        return range(int(start), int(end or start) + 1)
+
+    def _parse_docker_hosts(self, value: str) -> list[tuple[Optional[str], int]]:
+        """
+        Parse DOCKER_HOSTS into (url, capacity) pairs, local endpoint first.
+
+        Args:
+            value: Comma-separated url[=capacity] entries; capacity defaults
+                to MAX_CONCURRENT.
+
+        Returns:
+            Host list; the local endpoint has a url of None.
+        """
+        local_capacity: Optional[int] = None
+        remote: list[tuple[Optional[str], int]] = []
+        for entry in value.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            url, separator, capacity = entry.rpartition("=")
+            if not separator:
+                url, capacity = entry, str(self.max_concurrent)
+            url = url.strip()
+            if url == "local":
+                local_capacity = int(capacity)
+            elif url.startswith(("tcp://", "ssh://")):
+                remote.append((url, int(capacity)))
+            else:
+                raise ValueError(f"Invalid DOCKER_HOSTS entry: {entry}")
+
+        if local_capacity is None:
+            local_capacity = 0 if remote else self.max_concurrent
+        return [(None, local_capacity), *remote]
+
     def _get_credential(self, primary_key: str, env_vars: list[str], description: str) -> str:
         """
         Get credential from environment, checking multiple sources.
@@ -295,9 +522,44 @@ class Config:
         if self.repo_url:
             self.repo_cache.mkdir(parents=True, exist_ok=True)
 
-        if self.max_concurrent < 1 or self.max_concurrent > 10:
+        if len(self.docker_hosts) > 1:
+            if any(capacity < 0 for _, capacity in self.docker_hosts) or self.max_concurrent < 1:
+                raise ValueError("DOCKER_HOSTS capacities must be non-negative, with at least one above 0")
+        elif self.max_concurrent < 1 or self.max_concurrent > 10:
             raise ValueError("MAX_CONCURRENT must be between 1 and 10")
 
+        if self.orchestration not in ("threads", "asyncio"):
+            raise ValueError("ORCHESTRATION must be 'threads' or 'asyncio'")
+
+        if self.async_executor_workers < 2:
+            raise ValueError("ASYNC_EXECUTOR_WORKERS must be at least 2")
+
+        if self.one_time_concurrency < 0:
+            raise ValueError("ONE_TIME_CONCURRENCY must be non-negative")
+
+        if self.prepare_ahead < 0 or self.prepare_max_age < 1:
+            raise ValueError("PREPARE_AHEAD must be non-negative and PREPARE_MAX_AGE positive")
+
+        if self.workspace_mode not in ("worktree", "shared-clone"):
+            raise ValueError("WORKSPACE_MODE must be 'worktree' or 'shared-clone'")
+
+        if self.snapshot_link_mode not in ("auto", "reflink", "hardlink", "copy"):
+            raise ValueError("SNAPSHOT_LINK_MODE must be one of: auto, reflink, hardlink, copy")
+
+        known_caches = ("pip", "uv", "npm", "yarn", "cargo", "go", "gradle", "ccache")
+        unknown = [name for name in self.cache_volumes if name not in known_caches]
+        if unknown:
+            raise ValueError(
+                f"Unknown CACHE_VOLUMES entries: {', '.join(unknown)} "
+                f"(supported: {', '.join(known_caches)})"
+            )
+
+        if self.plan_task_cpus < 1 or self.implement_task_cpus < 1:
+            raise ValueError("PLAN_TASK_CPUS and IMPLEMENT_TASK_CPUS must be at least 1")
+
+        if self.task_log_segment_mb < 1 or self.task_log_max_segments < 1:
+            raise ValueError("TASK_LOG_SEGMENT_MB and TASK_LOG_MAX_SEGMENTS must be at least 1")
+
         if self.poll_interval < 60:
             raise ValueError("POLL_INTERVAL must be at least 60 seconds")
 
@@ -339,8 +601,9 @@ class Config:
         )
 
 
-# Global config instance
+# Global config instances
 _config: Optional[Config] = None
+_runtime_config: Optional[RuntimeConfig] = None
 
 
 def get_config() -> Config:
@@ -351,6 +614,21 @@ def get_config() -> Config:
     return _config
 
 
+def get_runtime_config() -> RuntimeConfig:
+    """
+    Get the configuration for commands that only need runtime file locations.
+
+    Returns:
+        The full configuration if it is already loaded, else a RuntimeConfig.
+    """
+    global _runtime_config
+    if _config is not None:
+        return _config
+    if _runtime_config is None:
+        _runtime_config = RuntimeConfig()
+    return _runtime_config
+
+
 def set_config(config: Config):
     """Set the global configuration instance (used for dry-run mode)."""
     global _config
@@ -0,0 +1,261 @@
+"""Docker events subscription dispatching container completion."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set
+
+from docker.errors import DockerException, NotFound
+
+from .docker_manager import MANAGED_LABEL
+
+logger = logging.getLogger(__name__)
+
+EVENT_FILTERS = {
+    "type": "container",
+    "label": [MANAGED_LABEL],
+    "event": ["die", "oom"],
+}
+
+# Seconds a watched container that vanished during a resync is given for its
+# die event to arrive before it is reported as gone
+MISSING_GRACE = 10
+
+
+@dataclass
+class ContainerExit:
+    """Outcome of a finished container."""
+    container_id: str
+    exit_code: int
+    oom_killed: bool = False
+
+
+class ContainerEventWatcher:
+    """
+    Watches one Docker events stream for the daemon's containers.
+
+    Handlers registered per container ID are called once with a
+    ContainerExit when the container dies. After the stream reconnects, the
+    events missed in the meantime are replayed, then the state of every
+    watched container is re-read from the Docker API so no exit is missed.
+    Handlers run on a small fixed-size executor.
+    """
+
+    def __init__(self, client_getter: Callable[[], object], handler_workers: int = 2):
+        """
+        Initialize the watcher.
+
+        Args:
+            client_getter: Returns the current Docker client.
+            handler_workers: Threads available to run completion handlers.
+        """
+        self._client_getter = client_getter
+        self._handlers: Dict[str, Callable[[ContainerExit], None]] = {}
+        self._oom: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stream = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=handler_workers,
+            thread_name_prefix="container-exit",
+        )
+        self._last_event_time: Optional[int] = None
+
+    def start(self):
+        """Start the events subscription thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self._last_event_time is None:
+            self._last_event_time = int(time.time())
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the subscription and wait for pending handlers."""
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=True)
+
+    def watch(self, container_id: str, handler: Callable[[ContainerExit], None]):
+        """
+        Call handler once the container exits.
+
+        If the container already exited (or is gone) the handler is
+        dispatched immediately.
+
+        Args:
+            container_id: Full container ID.
+            handler: Completion callback.
+        """
+        with self._lock:
+            self._handlers[container_id] = handler
+        # The container may have died before it was registered
+        self._check_container(container_id)
+
+    def watched_count(self) -> int:
+        """Get the number of containers being watched."""
+        with self._lock:
+            return len(self._handlers)
+
+    def _dispatch(self, result: ContainerExit):
+        """Run the handler for a container, at most once."""
+        with self._lock:
+            handler = self._handlers.pop(result.container_id, None)
+            self._oom.discard(result.container_id)
+        if handler is None:
+            return
+        self._executor.submit(self._run_handler, handler, result)
+
+    def _run_handler(self, handler: Callable[[ContainerExit], None], result: ContainerExit):
+        """Invoke a handler, logging rather than propagating its errors."""
+        try:
+            handler(result)
+        except Exception as e:
+            logger.error(f"Container exit handler failed for {result.container_id[:12]}: {e}")
+
+    def _check_container(self, container_id: str, missing_grace: float = 0):
+        """
+        Dispatch completion if a watched container is no longer running.
+
+        Args:
+            container_id: Full container ID.
+            missing_grace: Seconds to wait for a die event before reporting
+                a container that no longer exists as gone.
+        """
+        client = self._client_getter()
+        try:
+            container = client.containers.get(container_id)
+        except NotFound:
+            # Auto-removed containers vanish after exiting
+            if missing_grace > 0:
+                timer = threading.Timer(missing_grace, self._report_missing, args=(container_id,))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._dispatch(ContainerExit(container_id, exit_code=-1))
+            return
+        except DockerException as e:
+            logger.warning(f"Failed to inspect container {container_id[:12]}: {e}")
+            return
+
+        state = container.attrs.get("State", {})
+        if state.get("Status") in ("exited", "dead"):
+            self._dispatch(ContainerExit(
+                container_id,
+                exit_code=state.get("ExitCode", -1),
+                oom_killed=bool(state.get("OOMKilled")),
+            ))
+
+    def _report_missing(self, container_id: str):
+        """Report a vanished container whose die event never arrived."""
+        if self._stop.is_set():
+            return
+        with self._lock:
+            if container_id not in self._handlers:
+                return
+        logger.warning(f"Container {container_id[:12]} is gone without a die event")
+        self._dispatch(ContainerExit(container_id, exit_code=-1))
+
+    def _replay(self, client, until: int):
+        """Handle the events between the last one seen and until."""
+        for event in client.events(
+            decode=True,
+            since=self._last_event_time,
+            until=until,
+            filters=EVENT_FILTERS,
+        ):
+            self._handle_event(event)
+        self._last_event_time = until
+
+    def _resync(self):
+        """Re-read the state of every watched container after a reconnect."""
+        with self._lock:
+            watched = list(self._handlers)
+        if not watched:
+            return
+
+        client = self._client_getter()
+        try:
+            running = {
+                container.id
+                for container in client.containers.list(
+                    filters={"label": MANAGED_LABEL, "status": "running"}
+                )
+            }
+        except DockerException as e:
+            logger.warning(f"Failed to list containers during resync: {e}")
+            return
+
+        for container_id in watched:
+            if container_id not in running:
+                # A die event may still be on its way through the stream
+                self._check_container(container_id, missing_grace=MISSING_GRACE)
+
+    def _handle_event(self, event: dict):
+        """Dispatch a single decoded Docker event."""
+        self._last_event_time = event.get("time", self._last_event_time)
+        container_id = event.get("id") or event.get("Actor", {}).get("ID")
+        action = event.get("Action") or event.get("status")
+        if not container_id:
+            return
+
+        if action == "oom":
+            with self._lock:
+                if container_id in self._handlers:
+                    self._oom.add(container_id)
+            return
+
+        if action == "die":
+            attributes = event.get("Actor", {}).get("Attributes", {})
+            try:
+                exit_code = int(attributes.get("exitCode", -1))
+            except ValueError:
+                exit_code = -1
+            with self._lock:
+                oom = container_id in self._oom
+            self._dispatch(ContainerExit(container_id, exit_code=exit_code, oom_killed=oom))
+
+    def _run(self):
+        """Consume the events stream, reconnecting with backoff on errors."""
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                client = self._client_getter()
+                # Replay the exits that happened while not subscribed first,
+                # so auto-removed containers keep their real exit code
+                until = int(time.time())
+                self._replay(client, until)
+                self._stream = client.events(
+                    decode=True,
+                    since=until,
+                    filters=EVENT_FILTERS,
+                )
+                # Catch exits the replay missed
+                self._resync()
+                backoff = 1
+                for event in self._stream:
+                    if self._stop.is_set():
+                        break
+                    self._handle_event(event)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Docker events stream failed, reconnecting in {backoff}s: {e}")
+            finally:
+                self._stream = None
+
+            if self._stop.is_set():
+                break
+            self._stop.wait(timeout=backoff)
+            backoff = min(backoff * 2, 30)
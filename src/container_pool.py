@@ -0,0 +1,312 @@
+"""Pool of pre-started idle containers for low-latency Claude sessions."""
+
+import logging
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from docker.errors import DockerException
+from docker.models.containers import Container
+
+from .config import get_config
+from .cpuset import CpuAllocation
+from .docker_manager import MANAGED_LABEL, DockerManager
+
+logger = logging.getLogger(__name__)
+
+POOL_CONTAINER_PREFIX = "claude-pool-"
+
+# PID 1 of a pooled container: idle until the task's exec signals it, then
+# exit with the exit code the exec recorded so container.wait() reports it
+IDLE_SCRIPT = (
+    'trap \'exit "$(cat /tmp/.claude-exit 2>/dev/null || echo 1)"\' TERM INT; '
+    'while :; do sleep 3600 & wait $!; done'
+)
+
+# Runs the Claude CLI with its output sent to PID 1's stdout/stderr, so it shows
+# up in the container logs, then records the exit code and stops PID 1
+EXEC_SCRIPT = (
+    '"$@" > /proc/1/fd/1 2> /proc/1/fd/2; '
+    'echo $? > /tmp/.claude-exit; kill -TERM 1'
+)
+
+
+@dataclass
+class PoolSlot:
+    """An idle container with its pre-mounted workspace directory."""
+    slot_id: str
+    container: Container
+    workspace: Path
+    image: str
+    volumes: Dict[str, Dict[str, str]] = field(default_factory=dict)  # Mounts of the idle container
+
+
+class WarmContainerPool:
+    """
+    Keeps idle task containers running so sessions skip container start-up.
+
+    Each pooled container mounts an empty slot directory at /workspace. When
+    a task claims a slot, its worktree is created inside that directory and
+    the Claude CLI is started with an exec. Used containers are never reused:
+    they exit with the session and are replaced in the background.
+    """
+
+    def __init__(self, docker_manager: DockerManager, spare_capacity: Callable[[], int]):
+        """
+        Initialize the pool.
+
+        Args:
+            docker_manager: Docker manager providing the client and image.
+            spare_capacity: Returns how many more tasks may start right now.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.spare_capacity = spare_capacity
+        self._idle: List[PoolSlot] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the pool is configured and usable."""
+        return self.config.warm_pool_size > 0 and not self.config.dry_run
+
+    def start(self):
+        """Remove leftovers from a previous run and start replenishing."""
+        if not self.enabled:
+            return
+
+        self._remove_stale()
+        self._thread = threading.Thread(target=self._replenish_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Warm container pool started (size {self.config.warm_pool_size})")
+
+    def stop(self):
+        """Stop replenishing and discard all idle containers."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for slot in idle:
+            self._discard(slot)
+
+    def idle_count(self) -> int:
+        """Get the number of idle containers."""
+        with self._lock:
+            return len(self._idle)
+
+    def _remove_stale(self):
+        """
+        Remove pool containers and slot directories left by a previous run.
+
+        Slots whose container was claimed by a task that is still running
+        (and has been re-adopted) are kept.
+        """
+        in_use = set()
+        try:
+            for container in self.docker.list_task_containers():
+                if container.name.startswith(POOL_CONTAINER_PREFIX):
+                    container.remove(force=True)
+                    continue
+                for mount in container.attrs.get("Mounts", []):
+                    if mount.get("Destination") == "/workspace":
+                        in_use.add(mount.get("Source"))
+        except DockerException as e:
+            logger.warning(f"Failed to remove stale pool containers: {e}")
+
+        if self.config.pool_slot_dir.exists():
+            for slot_dir in self.config.pool_slot_dir.iterdir():
+                if str(slot_dir.resolve()) not in in_use:
+                    shutil.rmtree(slot_dir, ignore_errors=True)
+
+    def _target_size(self) -> int:
+        """Idle containers to keep: the configured size, bounded by spare capacity."""
+        return max(0, min(self.config.warm_pool_size, self.spare_capacity()))
+
+    def _replenish_loop(self):
+        """Keep the number of idle containers at the target size."""
+        while not self._stop.is_set():
+            try:
+                self._replenish()
+            except Exception as e:
+                logger.error(f"Error replenishing container pool: {e}")
+            self._wake.wait(timeout=5)
+            self._wake.clear()
+
+    def _replenish(self):
+        """Create or discard idle containers to match the target size and image."""
+        if not self.docker.image_ready.is_set():
+            return
+
+        image = self.docker.get_active_image()
+        with self._lock:
+            # Containers from a superseded image are not used for new tasks
+            stale = [slot for slot in self._idle if slot.image != image]
+            self._idle = [slot for slot in self._idle if slot.image == image]
+            surplus = self._idle[self._target_size():]
+            self._idle = self._idle[:self._target_size()]
+            missing = self._target_size() - len(self._idle)
+
+        for slot in stale + surplus:
+            self._discard(slot)
+
+        for _ in range(missing):
+            if self._stop.is_set():
+                return
+            slot = self._create_slot(image)
+            with self._lock:
+                self._idle.append(slot)
+
+    @staticmethod
+    def _credentials_name(slot_id: str) -> str:
+        return f"claude-creds-pool-{slot_id}.json"
+
+    def credentials_file(self, slot: PoolSlot) -> Path:
+        """Get the OAuth credentials copy mounted into a slot's container."""
+        return self.docker.credentials_path(self._credentials_name(slot.slot_id))
+
+    def _create_slot(self, image: str) -> PoolSlot:
+        """Start an idle container with an empty workspace slot mounted."""
+        slot_id = uuid.uuid4().hex[:12]
+        workspace = (self.config.pool_slot_dir / f"slot-{slot_id}").resolve()
+        workspace.mkdir(parents=True)
+
+        object_dirs = []
+        if self.config.workspace_mode == "shared-clone":
+            object_dirs.append(self.docker.get_cache_object_dir())
+
+        volumes = self.docker.task_volumes(
+            workspace,
+            object_dirs,
+            self._credentials_name(slot_id),
+        )
+
+        try:
+            container = self.docker.client.containers.run(
+                image,
+                name=f"{POOL_CONTAINER_PREFIX}{slot_id}",
+                entrypoint=["/bin/sh", "-c", IDLE_SCRIPT],
+                environment=self.docker.task_environment(volumes=volumes),
+                volumes=volumes,
+                working_dir="/workspace",
+                detach=True,
+                remove=True,
+                user="claude",
+                network_mode="bridge",
+                extra_hosts=self.docker.package_proxy.extra_hosts(),
+                labels={MANAGED_LABEL: "true"},
+            )
+        finally:
+            # Sessions in idle containers wait for a running cleanup instead
+            self.docker.cache_volumes.release(volumes)
+        logger.debug(f"Created pooled container {container.name}")
+        return PoolSlot(
+            slot_id=slot_id,
+            container=container,
+            workspace=workspace,
+            image=image,
+            volumes=volumes,
+        )
+
+    def _discard(self, slot: PoolSlot):
+        """Remove an unused pooled container and its slot directory."""
+        try:
+            slot.container.remove(force=True)
+        except DockerException:
+            pass
+        shutil.rmtree(slot.workspace, ignore_errors=True)
+        self.credentials_file(slot).unlink(missing_ok=True)
+
+    def claim(self) -> Optional[PoolSlot]:
+        """
+        Take an idle container for a task.
+
+        Returns:
+            Pool slot, or None if no idle container on the active image exists.
+        """
+        if not self.enabled:
+            return None
+
+        image = self.docker.get_active_image()
+        with self._lock:
+            while self._idle:
+                slot = self._idle.pop(0)
+                if slot.image == image:
+                    self._wake.set()
+                    return slot
+                threading.Thread(target=self._discard, args=(slot,), daemon=True).start()
+        self._wake.set()
+        return None
+
+    def release(self, slot: PoolSlot):
+        """Discard a claimed slot that could not be used for its task."""
+        self._discard(slot)
+        self._wake.set()
+
+    def start_task(
+        self,
+        slot: PoolSlot,
+        issue_number: int,
+        prompt: str,
+        github_token: Optional[str] = None,
+        cpuset: Optional[CpuAllocation] = None,
+    ) -> Container:
+        """
+        Start a Claude session in a claimed container.
+
+        The slot's workspace must already contain the task worktree. The
+        container is renamed to the regular task name, so status, logs and
+        wait() behave as for a container started by run_claude_container.
+
+        Args:
+            slot: Claimed pool slot.
+            issue_number: GitHub issue number.
+            prompt: Prompt to pass to Claude.
+            github_token: GitHub token for gh CLI authentication.
+            cpuset: CPUs to pin the container to before the session starts.
+
+        Returns:
+            The task container.
+        """
+        container = slot.container
+        container_name = f"claude-issue-{issue_number}"
+
+        try:
+            existing = self.docker.client.containers.get(container_name)
+            logger.warning(f"Container {container_name} already exists, removing")
+            existing.remove(force=True)
+        except DockerException:
+            pass
+        container.rename(container_name)
+        if cpuset:
+            container.update(**cpuset.container_options())
+
+        # The idle container already mounts the cache volumes; once renamed it
+        # counts as in use, so only a cleanup already running can interfere
+        self.docker.cache_volumes.wait_for_cleanup()
+
+        entrypoint = self.docker.client.images.get(slot.image).attrs["Config"]["Entrypoint"]
+        command = ["/bin/sh", "-c", EXEC_SCRIPT, "sh"]
+        command += list(entrypoint or []) + self.docker.claude_arguments(prompt)
+
+        container.exec_run(
+            command,
+            environment=self.docker.task_environment(github_token, volumes=slot.volumes),
+            workdir="/workspace",
+            user="claude",
+            detach=True,
+        )
+        container.reload()
+        logger.info(
+            f"Started Claude for issue #{issue_number} in pooled container "
+            f"{container_name} ({container.id[:12]})"
+        )
+        self._wake.set()
+        return container
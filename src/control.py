@@ -0,0 +1,253 @@
+"""Control socket through which the CLI talks to the running daemon."""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .config import get_config, get_runtime_config
+
+if TYPE_CHECKING:
+    from .daemon import IssueSolverDaemon
+
+logger = logging.getLogger(__name__)
+
+
+class ControlUnavailable(Exception):
+    """No daemon is answering on the control socket."""
+
+
+class ControlError(Exception):
+    """The daemon rejected a control command."""
+
+
+class ControlTimeout(Exception):
+    """The daemon did not answer a control command in time."""
+
+
+# Seconds to wait for an answer; commands that stop containers or call
+# GitHub get longer than the rest
+DEFAULT_TIMEOUT = 10.0
+COMMAND_TIMEOUTS = {
+    "cancel": 60.0,
+    "enqueue": 60.0,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one JSON request line and answers with one JSON response line."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            handler = self.server.commands.get(request.get("command"))
+            if handler is None:
+                raise ControlError(f"Unknown command: {request.get('command')}")
+            response = {"ok": True, "result": handler(**request.get("args", {}))}
+        except (ControlError, TypeError, ValueError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Control command failed: {e}")
+            response = {"ok": False, "error": str(e)}
+        try:
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+        except OSError as e:
+            # The client gave up waiting; the command has still been carried out
+            logger.warning(f"Control client left before the answer was sent: {e}")
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    commands: Dict[str, Callable[..., Any]] = {}
+
+
+class ControlServer:
+    """
+    Serves control commands on a Unix socket owned by the daemon's user.
+
+    Each connection carries one request, a JSON line with a command name
+    and arguments, and gets one JSON line back. Commands act on the live
+    daemon: pause/resume take effect at once, and status/queue report the
+    current queue rather than the last saved state.
+    """
+
+    def __init__(self, daemon: "IssueSolverDaemon"):
+        """
+        Initialize the control server.
+
+        Args:
+            daemon: Daemon the commands act on.
+        """
+        self.config = get_config()
+        self.daemon = daemon
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _commands(self) -> Dict[str, Callable[..., Any]]:
+        """Map command names to their handlers."""
+        daemon = self.daemon
+        return {
+            "status": daemon.state_snapshot,
+            "queue": lambda: {
+                key: value
+                for key, value in daemon.state_snapshot().items()
+                if key in ("paused", "draining", "running", "queued")
+            },
+            "pause": self._pause,
+            "resume": self._resume,
+            "enqueue": lambda issue_number: {"added": daemon.enqueue_issue(int(issue_number))},
+            "cancel": lambda issue_number: {"cancelled": daemon.cancel_task(int(issue_number))},
+            "drain": lambda: {"running": daemon.drain()},
+        }
+
+    def _pause(self) -> dict:
+        self.daemon.task_queue.pause()
+        self.daemon._save_state()
+        return {"paused": True}
+
+    def _resume(self) -> dict:
+        self.daemon.task_queue.resume()
+        self.daemon._save_state()
+        return {"paused": False}
+
+    def start(self):
+        """
+        Bind the control socket and serve commands in the background.
+
+        Raises:
+            RuntimeError: If another daemon is answering on the socket.
+        """
+        path = self.config.control_socket
+        if self.config.dry_run:
+            # Leave the socket of a daemon that may be running alone
+            logger.info(f"[DRY-RUN] Would serve control commands at {path}")
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.check_free()
+        # A socket left by a daemon that did not shut down cleanly
+        path.unlink(missing_ok=True)
+
+        # Bind inside a private (0700) directory and move the socket into
+        # place once it is 0600, so it is never reachable with the umask's
+        # permissions. Changing the umask instead would also apply to files
+        # the other start-up steps create meanwhile
+        private = Path(tempfile.mkdtemp(prefix=".cs", dir=path.parent))
+        staged = private / "s"
+        try:
+            self._server = _Server(str(staged), _RequestHandler)
+            os.chmod(staged, 0o600)
+            os.replace(staged, path)
+        except OSError:
+            if self._server:
+                self._server.server_close()
+                self._server = None
+            raise
+        finally:
+            staged.unlink(missing_ok=True)
+            private.rmdir()
+        self._server.commands = self._commands()
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Control socket listening at {path}")
+
+    def check_free(self):
+        """
+        Check that no other daemon is serving on the control socket.
+
+        Raises:
+            RuntimeError: If another daemon is answering on the socket.
+        """
+        path = self.config.control_socket
+        if path.exists() and _is_listening(path):
+            raise RuntimeError(f"Another daemon is serving control commands at {path}")
+
+    def stop(self):
+        """Stop serving and remove the socket."""
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self.config.control_socket.unlink(missing_ok=True)
+
+
+def _is_listening(path: Path) -> bool:
+    """Check whether something accepts connections on a Unix socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def call(
+    command: str,
+    socket_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    **args,
+) -> Any:
+    """
+    Send a command to the running daemon.
+
+    Args:
+        command: Command name.
+        socket_path: Control socket (defaults to CONTROL_SOCKET).
+        timeout: Seconds to wait for the connection and the answer
+            (defaults to the command's entry in COMMAND_TIMEOUTS).
+        **args: Command arguments.
+
+    Returns:
+        The command's result.
+
+    Raises:
+        ControlUnavailable: If no daemon is listening on the socket.
+        ControlTimeout: If the daemon did not answer in time.
+        ControlError: If the socket cannot be used or the daemon rejected
+            the command.
+    """
+    path = socket_path or get_runtime_config().control_socket
+    if timeout is None:
+        timeout = COMMAND_TIMEOUTS.get(command, DEFAULT_TIMEOUT)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+            raise ControlUnavailable(f"No daemon listening at {path}: {e}")
+        except OSError as e:
+            raise ControlError(f"Cannot connect to {path}: {e}")
+
+        data = b""
+        try:
+            sock.sendall(json.dumps({"command": command, "args": args}).encode() + b"\n")
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            raise ControlTimeout(
+                f"No answer to {command} within {timeout:g}s; the daemon may still complete it"
+            )
+        except OSError as e:
+            raise ControlUnavailable(f"Connection to {path} failed: {e}")
+
+    if not data:
+        raise ControlUnavailable(f"Daemon at {path} closed the connection")
+    response = json.loads(data)
+    if not response.get("ok"):
+        raise ControlError(response.get("error", "Unknown error"))
+    return response.get("result")
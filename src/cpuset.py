@@ -0,0 +1,227 @@
+"""CPU-set pinning of task containers to disjoint cores of the local host."""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+NODE_ROOT = Path("/sys/devices/system/node")
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    """Parse a kernel CPU list such as "0-3,8,10-11"."""
+    cpus = []
+    for part in value.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    """Format CPU numbers as a kernel CPU list with ranges."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if a != b else str(a) for a, b in ranges)
+
+
+def read_topology() -> Dict[int, List[int]]:
+    """
+    Read the NUMA nodes and their CPUs usable by this process.
+
+    Returns:
+        Mapping of node number to CPU numbers (a single node 0 if the host
+        exposes no NUMA information).
+    """
+    usable = set(os.sched_getaffinity(0))
+    nodes: Dict[int, List[int]] = {}
+    for node_dir in sorted(NODE_ROOT.glob("node[0-9]*")):
+        try:
+            cpus = parse_cpu_list((node_dir / "cpulist").read_text())
+        except (OSError, ValueError):
+            continue
+        cpus = [cpu for cpu in cpus if cpu in usable]
+        if cpus:
+            nodes[int(node_dir.name[4:])] = cpus
+    return nodes or {0: sorted(usable)}
+
+
+@dataclass
+class CpuAllocation:
+    """CPUs and memory nodes handed to one task."""
+    cpus: List[int]
+    mems: List[int]
+    multi_node: bool = False
+
+    @property
+    def cpuset_cpus(self) -> str:
+        """Value for the cpuset_cpus container option."""
+        return format_cpu_list(self.cpus)
+
+    @property
+    def cpuset_mems(self) -> Optional[str]:
+        """Value for the cpuset_mems container option (None on single-node hosts)."""
+        return format_cpu_list(self.mems) if self.multi_node else None
+
+    def container_options(self) -> Dict[str, str]:
+        """Get the container create/update options for this allocation."""
+        options = {"cpuset_cpus": self.cpuset_cpus}
+        if self.cpuset_mems:
+            options["cpuset_mems"] = self.cpuset_mems
+        return options
+
+
+class CpuSetAllocator:
+    """
+    Hands each task a disjoint set of CPUs from the host topology.
+
+    A task's CPUs come from a single NUMA node when one has room (the
+    fullest node that fits, preferring a contiguous run), and its memory is
+    bound to the nodes its CPUs belong to. When fewer CPUs are free than
+    requested the task gets what is left; with none left it runs unpinned
+    rather than waiting. CPUs return to the pool when the task is released.
+    """
+
+    def __init__(self):
+        """Initialize allocator."""
+        self.config = get_config()
+        self._lock = threading.Lock()
+        self._nodes: Optional[Dict[int, List[int]]] = None
+        self._allocations: Dict[int, CpuAllocation] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether CPU pinning is configured."""
+        return self.config.cpu_pinning
+
+    def _topology(self) -> Dict[int, List[int]]:
+        """Get the allocatable CPUs per node, read once."""
+        if self._nodes is None:
+            reserved = set(self.config.cpu_pinning_reserved)
+            self._nodes = {
+                node: [cpu for cpu in cpus if cpu not in reserved]
+                for node, cpus in read_topology().items()
+            }
+            logger.info(
+                "CPU pinning topology: "
+                + "; ".join(
+                    f"node {node}: {format_cpu_list(cpus)}"
+                    for node, cpus in self._nodes.items()
+                )
+            )
+        return self._nodes
+
+    def _free(self) -> Dict[int, List[int]]:
+        """Get the unallocated CPUs per node."""
+        taken = {cpu for allocation in self._allocations.values() for cpu in allocation.cpus}
+        return {
+            node: [cpu for cpu in cpus if cpu not in taken]
+            for node, cpus in self._topology().items()
+        }
+
+    @staticmethod
+    def _pick(free: List[int], count: int) -> List[int]:
+        """Pick CPUs from one node's free list, preferring a contiguous run."""
+        for start in range(len(free) - count + 1):
+            window = free[start:start + count]
+            if window[-1] - window[0] == count - 1:
+                return window
+        return free[:count]
+
+    def allocate(self, issue_number: int, count: int) -> Optional[CpuAllocation]:
+        """
+        Reserve CPUs for a task.
+
+        Args:
+            issue_number: GitHub issue number the CPUs are held for.
+            count: Number of CPUs requested.
+
+        Returns:
+            The allocation, or None if pinning is disabled or no CPU is free.
+        """
+        if not self.enabled or count < 1:
+            return None
+
+        with self._lock:
+            if issue_number in self._allocations:
+                return self._allocations[issue_number]
+
+            free = self._free()
+            multi_node = len(free) > 1
+            fitting = [node for node, cpus in free.items() if len(cpus) >= count]
+            if fitting:
+                # Best fit keeps larger free blocks available for later tasks
+                node = min(fitting, key=lambda n: len(free[n]))
+                allocation = CpuAllocation(self._pick(free[node], count), [node], multi_node)
+            else:
+                cpus, mems = [], []
+                for node in sorted(free, key=lambda n: len(free[n]), reverse=True):
+                    if len(cpus) >= count or not free[node]:
+                        continue
+                    cpus += free[node][:count - len(cpus)]
+                    mems.append(node)
+                if not cpus:
+                    logger.warning(f"No free CPUs for issue #{issue_number}, running unpinned")
+                    return None
+                if len(cpus) < count:
+                    logger.warning(
+                        f"Only {len(cpus)} of {count} CPUs free for issue #{issue_number}"
+                    )
+                allocation = CpuAllocation(sorted(cpus), sorted(mems), multi_node)
+
+            self._allocations[issue_number] = allocation
+
+        logger.info(
+            f"Pinned issue #{issue_number} to CPUs {allocation.cpuset_cpus}"
+            + (f" (memory nodes {allocation.cpuset_mems})" if allocation.cpuset_mems else "")
+        )
+        return allocation
+
+    def reserve(self, issue_number: int, cpuset_cpus: str):
+        """
+        Record the CPUs of a container that is already running (re-adoption).
+
+        Args:
+            issue_number: GitHub issue number.
+            cpuset_cpus: The container's CpusetCpus setting.
+        """
+        if not self.enabled or not cpuset_cpus:
+            return
+        cpus = parse_cpu_list(cpuset_cpus)
+        with self._lock:
+            topology = self._topology()
+            mems = [node for node, node_cpus in topology.items() if set(cpus) & set(node_cpus)]
+            self._allocations[issue_number] = CpuAllocation(cpus, mems, len(topology) > 1)
+
+    def release(self, issue_number: int):
+        """Return a task's CPUs to the pool."""
+        with self._lock:
+            allocation = self._allocations.pop(issue_number, None)
+        if allocation:
+            logger.debug(f"Released CPUs {allocation.cpuset_cpus} of issue #{issue_number}")
+
+    def status(self) -> dict:
+        """Get the free CPU count and the current allocations."""
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            free = self._free()
+            return {
+                "enabled": True,
+                "free": sum(len(cpus) for cpus in free.values()),
+                "allocated": {
+                    issue: allocation.cpuset_cpus
+                    for issue, allocation in self._allocations.items()
+                },
+            }
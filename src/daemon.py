@@ -1,20 +1,48 @@
 """Main daemon service for Claude Issue Solver."""
 
+import json
 import logging
+import os
+import queue
+import re
 import signal
-import sys
 import time
 import threading
 from pathlib import Path
 from typing import Optional
 
+from .async_orchestrator import AsyncOrchestrator
+from .backfill import BackfillCheckpoint, BackfillOutcome, BackfillReport
+from .bootstrap import Bootstrap
 from .config import get_config
+from .container_events import ContainerEventWatcher, ContainerExit
+from .container_pool import WarmContainerPool
+from .control import ControlError, ControlServer
 from .github_watcher import GitHubWatcher, IssueInfo
-from .docker_manager import DockerManager
-from .task_queue import TaskQueue, Task
+from .docker_gc import DockerGarbageCollector
+from .docker_hosts import LOCAL_HOST
+from .docker_manager import (
+    DockerManager,
+    IMPLEMENT_LABEL,
+    ISSUE_LABEL,
+    MODE_LABEL,
+    STARTED_AT_LABEL,
+    TASK_ID_LABEL,
+    TITLE_LABEL,
+    WORKTREE_LABEL,
+    task_credentials_name,
+)
+from .metrics import get_metrics
+from .reaper import WorkspaceReaper
+from .task_logs import TaskLogStore
+from .task_pipeline import PreparedTask, TaskPreparer
+from .telemetry import SAMPLE_FIELDS, ResourceSampler
+from .task_queue import TaskQueue, Task, TaskStatus
 
 logger = logging.getLogger(__name__)
 
+TASK_CONTAINER_PATTERN = re.compile(r"^claude-issue-(\d+)$")
+
 
 class IssueSolverDaemon:
     """Main daemon service."""
@@ -25,10 +53,37 @@ class IssueSolverDaemon:
         self.github = GitHubWatcher()
         self.docker = DockerManager()
         self.task_queue = TaskQueue(max_concurrent=self.config.max_concurrent)
+        self.reaper = WorkspaceReaper(self.docker, self.task_queue)
+        self.docker_gc = DockerGarbageCollector(self.docker)
+        self.pool = WarmContainerPool(self.docker, self._spare_capacity)
+        self.preparer = TaskPreparer(
+            self.docker,
+            self.task_queue,
+            self._task_prompt,
+            self.pool.idle_count,
+        )
+        self.container_events = ContainerEventWatcher(lambda: self.docker.client)
+        # One events stream per remote Docker host
+        self.remote_events = {
+            host.name: ContainerEventWatcher(lambda host=host: host.client)
+            for host in self.docker.hosts.hosts
+            if not host.is_local
+        }
+        self.task_logs = TaskLogStore()
+        self.telemetry = ResourceSampler(self.docker, self.task_queue)
+        self.control = ControlServer(self)
 
         self._running = False
         self._shutdown_event = threading.Event()
+        self._cache_cleanup_lock = threading.Lock()
+        self._last_cache_cleanup = 0.0
         self._threads: list[threading.Thread] = []
+        self._orchestrator: Optional[AsyncOrchestrator] = None
+        # Issues whose running container was stopped on request
+        self._cancelled: set[int] = set()
+        # One-time mode: a first interrupt sets _shutdown_event, a second this
+        self._one_time = False
+        self._backfill_abort = threading.Event()
 
         # Set up signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -39,6 +94,38 @@ class IssueSolverDaemon:
         logger.info(f"Received signal {signum}, shutting down...")
         self.stop()
 
+    def _spare_capacity(self) -> int:
+        """Get how many more tasks may run on the local Docker host right now."""
+        status = self.task_queue.get_status()
+        local = self.docker.hosts.get(LOCAL_HOST)
+        return min(
+            status["max_concurrent"] - status["running"],
+            local.capacity - local.running,
+        )
+
+    def _cpu_request(self, task: Task) -> int:
+        """Get the number of CPUs a task is pinned to, by session type."""
+        if task.has_implement_tag:
+            return self.config.implement_task_cpus
+        return self.config.plan_task_cpus
+
+    def _events_for(self, task: Task) -> ContainerEventWatcher:
+        """Get the events watcher of the Docker host a task runs on."""
+        return self.remote_events.get(task.docker_host, self.container_events)
+
+    def _start_event_watchers(self):
+        """Start watching container events on every connected Docker host."""
+        self.container_events.start()
+        for host in self.docker.hosts.hosts:
+            if host.name in self.remote_events and host.available:
+                self.remote_events[host.name].start()
+
+    def _stop_event_watchers(self):
+        """Stop every container events watcher."""
+        self.container_events.stop()
+        for watcher in self.remote_events.values():
+            watcher.stop()
+
     def _generate_prompt(self, issue: IssueInfo) -> str:
         """
         Generate Claude prompt based on issue tags.
@@ -72,98 +159,391 @@ class IssueSolverDaemon:
 
         return prompt
 
-    def _monitor_container(self, task: Task):
+    def _task_prompt(self, task: Task) -> str:
+        """Generate the Claude prompt of a queued task."""
+        issue_info = IssueInfo.__new__(IssueInfo)
+        issue_info.number = task.issue_number
+        issue_info.title = task.issue_title
+        issue_info.has_implement_tag = task.has_implement_tag
+        return self._generate_prompt(issue_info)
+
+    def _watch_container(self, task: Task):
+        """
+        Arrange for a task's completion to be handled when its container exits.
+
+        Args:
+            task: Task object.
+        """
+        if not task.container_id:
+            return
+
+        if self.config.dry_run:
+            # In dry-run mode, simulate immediate completion
+            logger.info(f"[DRY-RUN] Container for issue #{task.issue_number} would complete")
+            self._on_container_exit(task, ContainerExit(task.container_id, exit_code=0))
+            return
+
+        handler = lambda result: self._on_container_exit(task, result)
+        if self._orchestrator:
+            handler = self._orchestrator.wrap_exit_handler(handler)
+        self._events_for(task).watch(task.container_id, handler)
+
+    def _task_labels(self, task: Task, worktree_path: Path) -> dict:
         """
-        Monitor a container until completion.
+        Build the task-specific labels for a task container.
 
         Args:
             task: Task object.
+            worktree_path: Path to the task worktree.
+
+        Returns:
+            Container labels.
         """
+        return {
+            TASK_ID_LABEL: task.task_id,
+            TITLE_LABEL: task.issue_title,
+            IMPLEMENT_LABEL: "true" if task.has_implement_tag else "false",
+            WORKTREE_LABEL: str(worktree_path),
+        }
+
+    def _task_from_container(self, container) -> Optional[Task]:
+        """
+        Rebuild the task that a surviving container was started for.
+
+        Labelled containers carry everything needed. Pooled containers were
+        created before their task was known, so they are matched against the
+        running tasks of the saved state, or failing that by container name.
+
+        Args:
+            container: Docker container carrying the managed label.
+
+        Returns:
+            Task object, or None if the container does not belong to a task.
+        """
+        labels = container.labels or {}
+        if labels.get(MODE_LABEL) == "one-time":
+            return None
+
+        if labels.get(ISSUE_LABEL):
+            task = Task(
+                issue_number=int(labels[ISSUE_LABEL]),
+                issue_title=labels.get(TITLE_LABEL, ""),
+                has_implement_tag=labels.get(IMPLEMENT_LABEL) == "true",
+                status=TaskStatus.RUNNING,
+                container_id=container.id,
+                worktree_path=labels.get(WORKTREE_LABEL) or None,
+                started_at=labels.get(STARTED_AT_LABEL),
+            )
+            if labels.get(TASK_ID_LABEL):
+                task.task_id = labels[TASK_ID_LABEL]
+            return task
+
+        task = self.task_queue.take_recovered(container.id)
+        if task:
+            return task
+
+        match = TASK_CONTAINER_PATTERN.match(container.name)
+        if not match:
+            return None
+        workspace = next(
+            (
+                mount.get("Source")
+                for mount in container.attrs.get("Mounts", [])
+                if mount.get("Destination") == "/workspace"
+            ),
+            None,
+        )
+        return Task(
+            issue_number=int(match.group(1)),
+            issue_title="",
+            has_implement_tag=False,
+            status=TaskStatus.RUNNING,
+            container_id=container.id,
+            worktree_path=workspace,
+            started_at=container.attrs.get("State", {}).get("StartedAt"),
+        )
+
+    def _adopt_containers(self):
+        """Resume monitoring task containers that outlived a previous daemon."""
+        if self.config.dry_run:
+            logger.info("[DRY-RUN] Would re-adopt running task containers")
+            return
+
+        containers = []
+        for host in self.docker.hosts.hosts:
+            if not host.available:
+                continue
+            try:
+                containers += [(host, c) for c in self.docker.list_task_containers(host)]
+            except Exception as e:
+                logger.error(f"Failed to list task containers on {host.name}: {e}")
+
+        adopted = 0
+        for host, container in containers:
+            task = self._task_from_container(container)
+            if task is None or self.task_queue.is_running(task.issue_number):
+                continue
+            task.docker_host = host.name
+            self.docker.hosts.assign(host.name)
+            if host.is_local:
+                self.docker.cpusets.reserve(
+                    task.issue_number,
+                    container.attrs.get("HostConfig", {}).get("CpusetCpus", ""),
+                )
+            self.task_queue.restore_running(task)
+            self._capture_logs(task, container, resume=True)
+            self._watch_container(task)
+            adopted += 1
+            logger.info(
+                f"Re-adopted container {container.name} ({container.id[:12]}) "
+                f"for issue #{task.issue_number}"
+            )
+
+        if adopted:
+            logger.info(f"Re-adopted {adopted} task containers")
+
+    def _capture_logs(self, task: Task, container, resume: bool = False):
+        """
+        Stream a task container's output into the persistent task logs.
+
+        Args:
+            task: Task object.
+            container: Docker container running the task.
+            resume: The run was started by a previous daemon.
+        """
+        if self.config.dry_run:
+            logger.info(f"[DRY-RUN] Would capture logs for issue #{task.issue_number}")
+            return
+
         try:
-            if not task.container_id:
-                return
+            self.task_logs.capture(task.issue_number, task.task_id, container, resume=resume)
+        except Exception as e:
+            logger.error(f"Failed to start log capture for issue #{task.issue_number}: {e}")
 
-            if self.config.dry_run:
-                # In dry-run mode, simulate immediate completion
-                logger.info(f"[DRY-RUN] Container for issue #{task.issue_number} would complete")
-                self.task_queue.mark_completed(task.issue_number)
-                return
+    def _record_resources(self, task: Task):
+        """
+        Store a finished task's resource summary and time series.
 
-            # Wait for container to finish
-            container = self.docker.client.containers.get(task.container_id)
-            result = container.wait()
+        The summary goes into the task record; the series is written next
+        to the task's captured logs.
 
-            exit_code = result.get("StatusCode", -1)
+        Args:
+            task: Task object.
+        """
+        summary, samples = self.telemetry.finish(task.container_id)
+        if summary is None:
+            return
 
-            if exit_code == 0:
+        task.resources = summary
+        try:
+            run_dir = self.task_logs.run_dir(task.issue_number, task.task_id)
+            run_dir.mkdir(parents=True, exist_ok=True)
+            (run_dir / "resources.json").write_text(json.dumps({
+                "fields": ["time", *SAMPLE_FIELDS],
+                "samples": samples,
+                "summary": summary,
+            }))
+        except OSError as e:
+            logger.warning(f"Failed to write resource series for issue #{task.issue_number}: {e}")
+
+    def _on_container_exit(self, task: Task, result: ContainerExit):
+        """
+        Record a finished container's outcome and clean up its worktree.
+
+        Args:
+            task: Task object.
+            result: Container exit details from the events watcher.
+        """
+        try:
+            self._record_resources(task)
+
+            if task.issue_number in self._cancelled:
+                self._cancelled.discard(task.issue_number)
+                logger.info(f"Container for issue #{task.issue_number} was cancelled")
+                self.task_queue.mark_completed(task.issue_number, error="Cancelled")
+            elif result.oom_killed:
+                error = f"Container killed: out of memory (exit code {result.exit_code})"
+                logger.error(f"Container for issue #{task.issue_number} failed: {error}")
+                self.task_queue.mark_completed(task.issue_number, error=error)
+            elif result.exit_code == 0:
                 logger.info(f"Container for issue #{task.issue_number} completed successfully")
                 self.task_queue.mark_completed(task.issue_number)
             else:
-                error = f"Container exited with code {exit_code}"
+                error = f"Container exited with code {result.exit_code}"
                 logger.error(f"Container for issue #{task.issue_number} failed: {error}")
                 self.task_queue.mark_completed(task.issue_number, error=error)
 
         except Exception as e:
-            logger.error(f"Error monitoring container: {e}")
+            logger.error(f"Error handling container exit: {e}")
             self.task_queue.mark_completed(task.issue_number, error=str(e))
 
         finally:
+            # Bring commits made on a remote host back before the local
+            # workspace is removed
+            host = self.docker.hosts.get(task.docker_host)
+            if not host.is_local and not self.config.dry_run:
+                try:
+                    self.docker.workspace_agent.collect(
+                        host,
+                        task.issue_number,
+                        Path(task.worktree_path) if task.worktree_path else None,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to collect workspace from {host.name}: {e}")
+            self.docker.hosts.release(task.docker_host)
+            self.docker.cpusets.release(task.issue_number)
+
+            # Remove the OAuth credentials copy the container mounted
+            credentials_file = task.credentials_file or self.docker.credentials_path(
+                task_credentials_name(task.issue_number)
+            )
+            Path(credentials_file).unlink(missing_ok=True)
+
             # Cleanup worktree
             if task.worktree_path:
                 try:
-                    self.docker.remove_worktree(task.issue_number)
+                    self.docker.remove_worktree(task.issue_number, Path(task.worktree_path))
                 except Exception as e:
                     logger.error(f"Failed to remove worktree: {e}")
 
-    def _process_tasks(self):
-        """Process tasks from the queue."""
-        while self._running:
-            try:
-                # Get next task if capacity allows
-                task = self.task_queue.get_next_task()
+            self._schedule_cache_cleanup()
+            self._finish_drain()
 
-                if task is None:
-                    time.sleep(1)
-                    continue
+    def _schedule_cache_cleanup(self):
+        """Trim the shared cache volumes between tasks, at most once per interval."""
+        if not self.docker.cache_volumes.enabled:
+            return
 
-                logger.info(f"Processing task for issue #{task.issue_number}")
+        with self._cache_cleanup_lock:
+            if time.time() - self._last_cache_cleanup < self.config.cache_volume_cleanup_interval:
+                return
+            self._last_cache_cleanup = time.time()
 
-                # Create worktree
-                worktree_path = self.docker.create_worktree(task.issue_number)
+        def run_cleanup():
+            try:
+                self.docker.cache_volumes.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning cache volumes: {e}")
 
-                # Generate prompt
-                issue_info = IssueInfo.__new__(IssueInfo)
-                issue_info.number = task.issue_number
-                issue_info.title = task.issue_title
-                issue_info.has_implement_tag = task.has_implement_tag
+        threading.Thread(target=run_cleanup, daemon=True).start()
 
-                prompt = self._generate_prompt(issue_info)
+    def _start_task(self, task: Task, host, prepared: Optional[PreparedTask] = None):
+        """
+        Create a task's worktree and start its container on a reserved host.
 
-                # Start container
+        Failures are recorded on the task and its reservations released.
+
+        Args:
+            task: Task taken from the queue.
+            host: Docker host with a slot reserved for the task.
+            prepared: Work done for the task by the prepare stage, if any.
+        """
+        slot = None
+        try:
+            task.docker_host = host.name
+            logger.info(f"Processing task for issue #{task.issue_number} on {host.name}")
+            prepared = self.preparer.ready(prepared)
+
+            # Use a warm pooled container if one is idle; the worktree is
+            # then created inside its pre-mounted slot directory. A prepared
+            # worktree cannot move into a slot, so it gets its own container
+            slot = self.pool.claim() if host.is_local and not prepared else None
+
+            # Pin local containers to their own CPUs
+            cpuset = None
+            if host.is_local:
+                cpuset = self.docker.cpusets.allocate(task.issue_number, self._cpu_request(task))
+
+            if prepared:
+                worktree_path = prepared.worktree_path
+                prompt = prepared.prompt
+            else:
+                # Create worktree
+                worktree_path = self.docker.create_worktree(
+                    task.issue_number,
+                    slot.workspace if slot else None,
+                )
+                prompt = self._task_prompt(task)
+
+            # The image resolved at preparation holds unless a new task image
+            # was activated since
+            image = None
+            if prepared and host.is_local and prepared.base_image == self.docker.get_active_image():
+                image = prepared.image
+
+            # Start container
+            if slot:
+                container = self.pool.start_task(
+                    slot, task.issue_number, prompt, cpuset=cpuset
+                )
+                task.credentials_file = str(self.pool.credentials_file(slot))
+                slot = None
+            else:
                 container = self.docker.run_claude_container(
                     task.issue_number,
                     worktree_path,
                     prompt,
+                    labels=self._task_labels(task, worktree_path),
+                    host=host,
+                    cpuset=cpuset,
+                    image=image,
                 )
+            host = None
 
-                # Mark as running
-                self.task_queue.mark_running(task, container.id, worktree_path)
+            # Mark as running
+            self.task_queue.mark_running(task, container.id, worktree_path)
+            self._capture_logs(task, container)
 
-                # Start monitoring thread
-                monitor_thread = threading.Thread(
-                    target=self._monitor_container,
-                    args=(task,),
-                    daemon=True,
-                )
-                monitor_thread.start()
+            # Handle completion from the Docker events stream
+            self._watch_container(task)
+
+        except Exception as e:
+            logger.error(f"Error processing task: {e}")
+            if slot:
+                self.pool.release(slot)
+            if host:
+                self.docker.hosts.release(host.name)
+            self.docker.cpusets.release(task.issue_number)
+            self.task_queue.mark_completed(task.issue_number, error=str(e))
+
+    def _process_tasks(self):
+        """Process tasks from the queue."""
+        while self._running:
+            try:
+                # Hold dispatch until the first image is ready
+                if not self.docker.image_ready.wait(timeout=1):
+                    continue
+
+                # Reserve a slot on the least-loaded Docker host
+                host = self.docker.hosts.acquire()
+                if host is None:
+                    time.sleep(1)
+                    continue
+
+                # Get next task (and its prepared worktree) if capacity allows
+                task, prepared = self.preparer.next_task()
+
+                if task is None:
+                    self.docker.hosts.release(host.name)
+                    time.sleep(1)
+                    continue
+
+                self._start_task(task, host, prepared)
 
             except Exception as e:
                 logger.error(f"Error processing task: {e}")
-                if task:
-                    self.task_queue.mark_completed(task.issue_number, error=str(e))
 
             time.sleep(1)
 
+    def _initial_poll(self):
+        """Queue every open Claude-tagged issue."""
+        try:
+            issues = self.github.get_claude_issues()
+            for issue in issues:
+                self.task_queue.add_task(issue)
+        except Exception as e:
+            logger.error(f"Error in initial poll: {e}")
+
     def _poll_issues(self):
         """Poll GitHub for new or updated issues."""
         while self._running:
@@ -185,17 +565,253 @@ class IssueSolverDaemon:
             # Wait for next poll interval
             self._shutdown_event.wait(timeout=self.config.poll_interval)
 
+    def state_snapshot(self) -> dict:
+        """Get the live queue state in its saved form, with metrics."""
+        return self.task_queue.snapshot(extra={
+            "metrics": get_metrics().snapshot(),
+            "draining": self.task_queue.is_draining(),
+        })
+
+    def enqueue_issue(self, issue_number: int) -> bool:
+        """
+        Queue an issue on request, whatever its labels.
+
+        Args:
+            issue_number: GitHub issue number.
+
+        Returns:
+            True if queued, False if already queued or running.
+
+        Raises:
+            ControlError: If the issue cannot be fetched.
+        """
+        issue = self.github.get_issue_details(issue_number)
+        if issue is None:
+            raise ControlError(f"Issue #{issue_number} not found")
+        added = self.task_queue.add_task(IssueInfo(issue))
+        self.preparer.wake()
+        if self._orchestrator:
+            self._orchestrator.wake()
+        return added
+
+    def cancel_task(self, issue_number: int) -> str:
+        """
+        Drop a queued task or stop a running task's container.
+
+        Args:
+            issue_number: GitHub issue number.
+
+        Returns:
+            "queued" or "running", depending on what was cancelled.
+
+        Raises:
+            ControlError: If the issue is neither queued nor running.
+        """
+        if self.task_queue.remove_queued(issue_number):
+            return "queued"
+
+        task = next(
+            (t for t in self.task_queue.get_running_tasks() if t.issue_number == issue_number),
+            None,
+        )
+        if task is None:
+            raise ControlError(f"Issue #{issue_number} is not queued or running")
+
+        # The exit is handled like any other, recorded as cancelled
+        self._cancelled.add(issue_number)
+        if self.config.dry_run:
+            logger.info(f"[DRY-RUN] Would stop container for issue #{issue_number}")
+        else:
+            self.docker.stop_container(issue_number, self.docker.hosts.get(task.docker_host))
+        return "running"
+
+    def drain(self) -> int:
+        """
+        Stop starting tasks and shut down once the running ones have finished.
+
+        Returns:
+            Number of tasks still running.
+        """
+        self.task_queue.drain()
+        running = self.task_queue.get_status()["running"]
+        logger.info(f"Draining: waiting for {running} running tasks before shutdown")
+        self._finish_drain()
+        return running
+
+    def _finish_drain(self):
+        """Shut down if draining and no task is running any more."""
+        if not self.task_queue.is_draining() or self.task_queue.get_status()["running"]:
+            return
+        logger.info("Drain complete")
+        # Not on the calling thread: stop() joins threads and closes the
+        # control socket this may be answering on
+        threading.Thread(target=self.stop, daemon=True).start()
+
+    def _save_state(self):
+        """Save queue state together with in-process metrics."""
+        self.task_queue.save_state(
+            self.config.state_file,
+            extra={"metrics": get_metrics().snapshot()},
+        )
+
     def _save_state_periodically(self):
         """Periodically save daemon state."""
         while self._running:
             try:
-                self.task_queue.save_state(self.config.state_file)
+                self._save_state()
             except Exception as e:
                 logger.error(f"Error saving state: {e}")
 
             # Save every minute
             self._shutdown_event.wait(timeout=60)
 
+    def _reap_periodically(self):
+        """Periodically remove orphaned worktrees and enforce the disk quota."""
+        while self._running:
+            # Wait first so start-up is not slowed by a reaper pass
+            self._shutdown_event.wait(timeout=self.config.reaper_interval)
+            if not self._running:
+                break
+
+            try:
+                self.reaper.reap()
+            except Exception as e:
+                logger.error(f"Error in workspace reaper: {e}")
+
+    def _maybe_collect_docker_garbage(self, last_run: float) -> float:
+        """
+        Run Docker GC if its interval has passed or disk space runs low.
+
+        Args:
+            last_run: Time of the previous pass.
+
+        Returns:
+            Time of the latest pass (last_run if none ran).
+        """
+        elapsed = time.time() - last_run
+        due = elapsed >= self.config.docker_gc_interval
+        try:
+            # Under lasting pressure, pass at most every ten minutes
+            if not due and (elapsed < 600 or not self.docker_gc.under_pressure()):
+                return last_run
+            if not due:
+                logger.warning("Low disk space for Docker, running garbage collection")
+            self.docker_gc.collect()
+        except Exception as e:
+            logger.error(f"Error in Docker garbage collection: {e}")
+        return time.time()
+
+    def _collect_docker_garbage_periodically(self):
+        """Run Docker GC on its interval, or early when disk space runs low."""
+        last_run = time.time()
+        while self._running:
+            # Check disk pressure every minute between scheduled passes
+            self._shutdown_event.wait(timeout=60)
+            if not self._running:
+                break
+            last_run = self._maybe_collect_docker_garbage(last_run)
+
+    def _warm_dependency_snapshot(self, repo_path: Path):
+        """Build the dependency snapshot once the task image is ready."""
+        while not self._shutdown_event.is_set():
+            if self.docker.image_ready.wait(timeout=1):
+                self.docker.snapshots.ensure_snapshot(repo_path)
+                return
+
+    def _bootstrap(self) -> Bootstrap:
+        """
+        Build the start-up graph.
+
+        The repository sync, GitHub connect and Docker connect are
+        independent and run at once. The initial poll waits only for GitHub
+        and container re-adoption, so the queue fills while the repository
+        is still syncing and the image builds in the background.
+
+        Returns:
+            Bootstrap whose run() performs the start-up.
+        """
+        bootstrap = Bootstrap()
+        repo = {}
+
+        def sync_repository():
+            logger.info("Ensuring repository is ready...")
+            repo["path"] = self.docker.repo_manager.ensure_repository()
+            logger.info(f"Repository ready at: {repo['path']}")
+
+        def connect_docker():
+            self.docker.connect()
+            if not self.config.dry_run:
+                self._start_event_watchers()
+            self.docker.package_proxy.start()
+
+        def build_image():
+            # Dispatch waits for the image; the build itself runs in the background
+            dev_dockerfile = repo["path"] / "Dockerfile"
+            if dev_dockerfile.exists():
+                logger.info("Building Docker image in the background...")
+                self.docker.watch_dockerfile(dev_dockerfile)
+                self.docker.start_image_build(dev_dockerfile)
+            else:
+                logger.warning(f"Development Dockerfile not found: {dev_dockerfile}")
+                self.docker.image_ready.set()
+
+            # Warm the dependency snapshot for the current default branch
+            if self.docker.snapshots.enabled:
+                threading.Thread(
+                    target=self._warm_dependency_snapshot,
+                    args=(repo["path"],),
+                    daemon=True,
+                ).start()
+
+        bootstrap.step("repo", sync_repository)
+        bootstrap.step("github", self.github.connect)
+        bootstrap.step("docker", connect_docker)
+        bootstrap.step("state", lambda: self.task_queue.load_state(self.config.state_file))
+        # Containers still running from before a restart are picked up before
+        # the initial poll, so their issues are not queued a second time
+        bootstrap.step("adopt", self._adopt_containers, after=["docker", "state"])
+        # Serve CLI commands against the live queue
+        bootstrap.step("control", self.control.start, after=["adopt"])
+        bootstrap.step("image", build_image, after=["repo", "docker"])
+        bootstrap.step("poll", self._initial_poll, after=["github", "adopt"])
+        return bootstrap
+
+    def _log_startup(self, bootstrap: Bootstrap):
+        """Log the per-step start-up timings."""
+        logger.info("Start-up timings:")
+        for line in bootstrap.report():
+            logger.info(line)
+
+    def _log_image_ready(self, bootstrap: Bootstrap):
+        """Log when the background image build, the last start-up phase, is done."""
+        self.docker.image_ready.wait()
+        logger.info(f"Start-up: Docker image ready {bootstrap.elapsed():.2f}s after start")
+
+    def _check_not_running(self):
+        """
+        Check that no other daemon is running.
+
+        Raises:
+            RuntimeError: If the control socket answers or the PID file names
+                another live process.
+        """
+        self.control.check_free()
+        try:
+            pid = int(self.config.pid_file.read_text().strip())
+        except (OSError, ValueError):
+            return
+        if pid == os.getpid():
+            return
+        try:
+            # Signal 0 only checks that the process exists
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        except PermissionError:
+            # Alive, but owned by another user
+            pass
+        raise RuntimeError(f"Another daemon is running with PID {pid} ({self.config.pid_file})")
+
     def start(self):
         """Start the daemon."""
         if self.config.dry_run:
@@ -203,32 +819,38 @@ class IssueSolverDaemon:
         else:
             logger.info("Starting Claude Issue Solver daemon")
 
-        # Write PID file
-        self.config.pid_file.write_text(str(sys.modules['os'].getpid()))
+        # Refuse before the PID file is overwritten or another daemon's
+        # containers are adopted
+        if not self.config.dry_run:
+            self._check_not_running()
 
-        # Ensure repository is ready
-        logger.info("Ensuring repository is ready...")
-        repo_path = self.docker.repo_manager.ensure_repository()
-        logger.info(f"Repository ready at: {repo_path}")
-
-        # Connect to services
-        self.github.connect()
-        self.docker.connect()
-
-        # Load previous state
-        self.task_queue.load_state(self.config.state_file)
+        # Write PID file
+        self.config.pid_file.write_text(str(os.getpid()))
 
-        # Build Docker image if needed
-        dev_dockerfile = repo_path / "Dockerfile"
-        if dev_dockerfile.exists():
-            logger.info("Building Docker image...")
-            self.docker.build_image(dev_dockerfile)
-        else:
-            logger.warning(f"Development Dockerfile not found: {dev_dockerfile}")
+        bootstrap = self._bootstrap()
+        try:
+            bootstrap.run()
+        finally:
+            self._log_startup(bootstrap)
+        threading.Thread(target=self._log_image_ready, args=(bootstrap,), daemon=True).start()
 
-        # Start background threads
         self._running = True
+        self.pool.start()
+        self.preparer.start()
+        self.telemetry.start()
+        self.docker.warm_images.start()
+
+        if self.config.orchestration == "asyncio":
+            # Loops run as tasks on one event loop until shutdown
+            self._orchestrator = AsyncOrchestrator(self)
+            logger.info("Daemon started successfully (asyncio orchestration)")
+            self._orchestrator.run()
+            self._running = False
+            self._shutdown_event.set()
+            self._shutdown_services()
+            return
 
+        # Start background threads
         poll_thread = threading.Thread(target=self._poll_issues, daemon=True)
         poll_thread.start()
         self._threads.append(poll_thread)
@@ -241,15 +863,20 @@ class IssueSolverDaemon:
         state_thread.start()
         self._threads.append(state_thread)
 
-        logger.info("Daemon started successfully")
+        if self.config.reaper_interval > 0:
+            reaper_thread = threading.Thread(target=self._reap_periodically, daemon=True)
+            reaper_thread.start()
+            self._threads.append(reaper_thread)
 
-        # Do initial poll
-        try:
-            issues = self.github.get_claude_issues()
-            for issue in issues:
-                self.task_queue.add_task(issue)
-        except Exception as e:
-            logger.error(f"Error in initial poll: {e}")
+        if self.config.docker_gc_interval > 0 and not self.config.dry_run:
+            gc_thread = threading.Thread(
+                target=self._collect_docker_garbage_periodically,
+                daemon=True,
+            )
+            gc_thread.start()
+            self._threads.append(gc_thread)
+
+        logger.info("Daemon started successfully")
 
         # Wait for shutdown
         try:
@@ -258,8 +885,27 @@ class IssueSolverDaemon:
         except KeyboardInterrupt:
             self.stop()
 
-    def run_once(self):
-        """Run through all issues once and exit."""
+    def run_once(
+        self,
+        concurrency: Optional[int] = None,
+        fresh: bool = False,
+    ) -> Optional[BackfillReport]:
+        """
+        Run through all issues once and exit.
+
+        Issues run concurrently up to the concurrency limit. Each issue whose
+        session ended is recorded in the backfill checkpoint, so rerunning an
+        interrupted backfill skips them; the checkpoint is removed once every
+        issue has finished.
+
+        Args:
+            concurrency: Sessions at once (defaults to ONE_TIME_CONCURRENCY,
+                else MAX_CONCURRENT).
+            fresh: Ignore the checkpoint of an earlier, interrupted run.
+
+        Returns:
+            Throughput report, or None if there were no issues.
+        """
         if self.config.dry_run:
             logger.info("Running ONE-TIME mode (DRY-RUN)")
         else:
@@ -273,6 +919,9 @@ class IssueSolverDaemon:
         # Connect to services
         self.github.connect()
         self.docker.connect()
+        if not self.config.dry_run:
+            self.container_events.start()
+        self.docker.package_proxy.start()
 
         # Build Docker image if needed
         dev_dockerfile = repo_path / "Dockerfile"
@@ -289,73 +938,205 @@ class IssueSolverDaemon:
 
         if not issues:
             logger.info("No issues to process")
+            self.container_events.stop()
+            self.docker.package_proxy.stop()
             self.github.close()
             self.docker.close()
-            return
+            return None
+
+        # Skip issues an interrupted run already finished (dry runs write nothing)
+        checkpoint = BackfillCheckpoint(self.config.backfill_checkpoint, self.config.github_repo)
+        finished = {} if fresh or self.config.dry_run else checkpoint.load()
+        pending = [issue for issue in issues if issue.number not in finished]
+        if len(pending) < len(issues):
+            logger.info(
+                f"Resuming backfill: {len(issues) - len(pending)} issues finished earlier, "
+                f"{len(pending)} to go"
+            )
 
-        # Process each issue
-        for issue in issues:
-            logger.info(f"Processing issue #{issue.number}: {issue.title}")
-            logger.info(f"  - Has 'Implement' tag: {issue.has_implement_tag}")
-            logger.info(f"  - URL: {issue.url}")
+        concurrency = concurrency or self.config.one_time_concurrency or self.config.max_concurrent
+        report = BackfillReport(concurrency, skipped=len(issues) - len(pending))
+        work: queue.Queue = queue.Queue()
+        for issue in pending:
+            work.put(issue)
+
+        # Daemon threads, so a second interrupt can exit while sessions run
+        self._one_time = True
+        workers = [
+            threading.Thread(
+                target=self._backfill_worker,
+                args=(work, checkpoint, report),
+                daemon=True,
+            )
+            for _ in range(min(concurrency, len(pending)))
+        ]
+        for worker in workers:
+            worker.start()
+        while any(worker.is_alive() for worker in workers):
+            if self._backfill_abort.wait(timeout=1):
+                break
+
+        if not self.config.dry_run:
+            done = sum(1 for outcome in report.outcomes if outcome.status != "error")
+            if done == len(pending):
+                checkpoint.clear()
+            else:
+                logger.info(
+                    f"{len(pending) - done} issues not finished; "
+                    f"rerun to resume from {checkpoint.path}"
+                )
 
+        # Cleanup
+        logger.info("One-time run complete")
+        for line in report.summary():
+            logger.info(line)
+        self._one_time = False
+        self.container_events.stop()
+        self.docker.package_proxy.stop()
+        self.github.close()
+        self.docker.close()
+        return report
+
+    def _backfill_worker(
+        self,
+        work: queue.Queue,
+        checkpoint: BackfillCheckpoint,
+        report: BackfillReport,
+    ):
+        """Run queued issues one after another until none are left or the run is interrupted."""
+        while not self._shutdown_event.is_set():
             try:
-                # Create worktree
-                worktree_path = self.docker.create_worktree(issue.number)
-                logger.info(f"  - Worktree: {worktree_path}")
+                issue = work.get_nowait()
+            except queue.Empty:
+                return
 
-                # Generate prompt
-                prompt = self._generate_prompt(issue)
-                logger.info(f"  - Prompt: {prompt[:100]}...")
+            outcome = self._backfill_issue(issue)
+            report.add(outcome)
+            if outcome.status != "error" and not self.config.dry_run:
+                try:
+                    checkpoint.record(outcome)
+                except OSError as e:
+                    logger.error(f"Failed to write backfill checkpoint: {e}")
 
-                # Start container (keep it for debugging in one-time mode)
-                container = self.docker.run_claude_container(
-                    issue.number,
-                    worktree_path,
-                    prompt,
-                    keep_container=True,  # Keep container for debugging
-                    github_token=self.github.get_token(),  # Pass GitHub token for gh CLI
-                )
-                logger.info(f"  - Container ID: {container.id}")
-                logger.info(f"  - Container kept for debugging (use 'docker logs {container.id[:12]}' to view output)")
-
-                if not self.config.dry_run:
-                    # Wait for container to complete
-                    logger.info(f"  - Waiting for container to complete...")
-                    result = container.wait()
-                    exit_code = result.get("StatusCode", -1)
-
-                    if exit_code == 0:
-                        logger.info(f"  - Container completed successfully")
-                    else:
-                        logger.error(f"  - Container exited with code {exit_code}")
-
-                    # Get container logs (container is kept, so we can get logs)
-                    try:
-                        logs = container.logs().decode('utf-8', errors='replace')
-                        if logs:
-                            logger.info(f"  - Container output:\n{logs[-2000:]}")
-                    except Exception as e:
-                        logger.warning(f"  - Could not get container logs: {e}")
-
-                    # Don't cleanup worktree in one-time mode to allow inspection
-                    logger.info(f"  - Worktree kept at: {worktree_path}")
-                else:
-                    logger.info(f"  - [DRY-RUN] Would wait for container and cleanup")
+    def _backfill_issue(self, issue: IssueInfo) -> BackfillOutcome:
+        """
+        Run one issue's session in one-time mode and wait for it to end.
+
+        Args:
+            issue: Issue to process.
+
+        Returns:
+            The issue's outcome.
+        """
+        prefix = f"Issue #{issue.number}:"
+        logger.info(f"Processing issue #{issue.number}: {issue.title}")
+        logger.info(f"{prefix} has 'Implement' tag: {issue.has_implement_tag}, URL: {issue.url}")
+        started = time.time()
 
+        try:
+            # Create worktree
+            worktree_path = self.docker.create_worktree(issue.number)
+            logger.info(f"{prefix} worktree {worktree_path}")
+
+            # Generate prompt
+            prompt = self._generate_prompt(issue)
+            logger.info(f"{prefix} prompt {prompt[:100]}...")
+
+            # Start container (keep it for debugging in one-time mode)
+            container = self.docker.run_claude_container(
+                issue.number,
+                worktree_path,
+                prompt,
+                keep_container=True,  # Keep container for debugging
+                github_token=self.github.get_token(),  # Pass GitHub token for gh CLI
+                labels={MODE_LABEL: "one-time"},  # Never re-adopted by the daemon
+            )
+            logger.info(f"{prefix} container {container.id}")
+            logger.info(f"{prefix} container kept for debugging (use 'docker logs {container.id[:12]}' to view output)")
+
+            if self.config.dry_run:
+                logger.info(f"{prefix} [DRY-RUN] Would wait for container and cleanup")
+                return BackfillOutcome(issue.number, "completed", time.time() - started)
+
+            # Wait for container to complete
+            logger.info(f"{prefix} waiting for container to complete...")
+            result = self._wait_for_exit(container.id)
+
+            if result.oom_killed:
+                logger.error(f"{prefix} container killed: out of memory")
+            elif result.exit_code == 0:
+                logger.info(f"{prefix} container completed successfully")
+            else:
+                logger.error(f"{prefix} container exited with code {result.exit_code}")
+
+            # Get container logs (container is kept, so we can get logs)
+            try:
+                logs = container.logs().decode('utf-8', errors='replace')
+                if logs:
+                    logger.info(f"{prefix} container output:\n{logs[-2000:]}")
             except Exception as e:
-                logger.error(f"  - Error processing issue #{issue.number}: {e}")
+                logger.warning(f"{prefix} could not get container logs: {e}")
+
+            # Don't cleanup worktree in one-time mode to allow inspection
+            logger.info(f"{prefix} worktree kept at {worktree_path}")
+            return BackfillOutcome(
+                issue.number,
+                "completed" if result.exit_code == 0 and not result.oom_killed else "failed",
+                time.time() - started,
+                exit_code=result.exit_code,
+            )
 
-        # Cleanup
-        logger.info("One-time run complete")
-        self.github.close()
-        self.docker.close()
+        except Exception as e:
+            logger.error(f"Error processing issue #{issue.number}: {e}")
+            return BackfillOutcome(issue.number, "error", time.time() - started, error=str(e))
+
+    def _interrupt_backfill(self):
+        """Start no more issues on the first interrupt; stop waiting on the second."""
+        if self._shutdown_event.is_set():
+            logger.warning("Interrupted again: exiting, running sessions keep their containers")
+            self._backfill_abort.set()
+            return
+        logger.info(
+            "Interrupted: starting no more issues and waiting for running sessions "
+            "(interrupt again to exit now)"
+        )
+        self._shutdown_event.set()
+
+    def _wait_for_exit(self, container_id: str) -> ContainerExit:
+        """
+        Block until a container exits, as reported by the events watcher.
+
+        Args:
+            container_id: Full container ID.
+
+        Returns:
+            Container exit details.
+        """
+        done = threading.Event()
+        outcome: list[ContainerExit] = []
+
+        def on_exit(result: ContainerExit):
+            outcome.append(result)
+            done.set()
+
+        self.container_events.watch(container_id, on_exit)
+        done.wait()
+        return outcome[0]
 
     def stop(self):
         """Stop the daemon."""
+        if self._one_time:
+            self._interrupt_backfill()
+            return
+
         if not self._running:
             return
 
+        if self._orchestrator:
+            # The event loop winds its tasks down, then shuts services down
+            self._orchestrator.request_shutdown()
+            return
+
         logger.info("Stopping daemon...")
         self._running = False
         self._shutdown_event.set()
@@ -364,8 +1145,21 @@ class IssueSolverDaemon:
         for thread in self._threads:
             thread.join(timeout=5)
 
+        self._shutdown_services()
+
+    def _shutdown_services(self):
+        """Stop components, save the final state and release resources."""
+        self.control.stop()
+
+        # Discard idle pooled containers and stop watching container events
+        self.pool.stop()
+        self.preparer.stop()
+        self._stop_event_watchers()
+        self.telemetry.stop()
+        self.docker.package_proxy.stop()
+
         # Save final state
-        self.task_queue.save_state(self.config.state_file)
+        self._save_state()
 
         # Cleanup
         self.github.close()
@@ -379,15 +1173,40 @@ class IssueSolverDaemon:
 
     def get_status(self) -> dict:
         """Get daemon status."""
+        usage = self.telemetry.current()
         return {
             "running": self._running,
             "queue": self.task_queue.get_status(),
+            "metrics": get_metrics().snapshot(),
+            "reaper": self.reaper.last_result,
+            "docker_gc": self.docker_gc.last_result,
+            "watched_containers": self.container_events.watched_count() + sum(
+                watcher.watched_count() for watcher in self.remote_events.values()
+            ),
+            "docker_hosts": self.docker.hosts.status(),
+            "cpu_pinning": self.docker.cpusets.status(),
+            "pool": {
+                "enabled": self.pool.enabled,
+                "idle": self.pool.idle_count(),
+            },
+            "preparation": self.preparer.status(),
+            "package_proxy": {
+                "running": self.docker.package_proxy.running,
+                **self.docker.package_proxy.cache.stats(),
+            },
+            "image": {
+                "active": self.docker.get_active_image(),
+                "ready": self.docker.image_ready.is_set(),
+                "digest": self.docker.image_digest,
+            },
             "tasks": {
                 "running": [
                     {
                         "issue": t.issue_number,
                         "title": t.issue_title,
                         "started_at": t.started_at,
+                        "docker_host": t.docker_host,
+                        "resources": usage.get(t.issue_number),
                     }
                     for t in self.task_queue.get_running_tasks()
                 ],
@@ -404,6 +1223,7 @@ class IssueSolverDaemon:
                         "title": t.issue_title,
                         "status": t.status.value,
                         "completed_at": t.completed_at,
+                        "resources": t.resources,
                     }
                     for t in self.task_queue.get_completed_tasks()
                 ],
@@ -0,0 +1,193 @@
+"""Garbage collection of superseded images, finished containers and build cache."""
+
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, List, Optional, Set
+
+from docker.errors import DockerException
+
+from .config import get_config
+from .docker_manager import MANAGED_LABEL
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_docker_time(value: Optional[str]) -> Optional[float]:
+    """Parse a Docker API timestamp (RFC 3339, nanoseconds) to epoch seconds."""
+    if not value or value.startswith("0001-"):
+        return None
+    # Python only parses microseconds: cut the fraction to six digits
+    _, _, rest = value[19:].partition(".")
+    fraction = "".join(ch for ch in rest if ch.isdigit())[:6]
+    try:
+        parsed = datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+    if fraction:
+        parsed = parsed.replace(microsecond=int(fraction.ljust(6, "0")))
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+class DockerGarbageCollector:
+    """
+    Removes Docker objects the daemon has left behind on a long-running host.
+
+    - Task images other than the active one, the IMAGE_GC_KEEP newest and
+      those used by any existing container.
+    - Dangling images from earlier builds (they carry the managed label).
+    - Stopped task containers finished more than CONTAINER_RETENTION_HOURS
+      ago, including those kept by one-time mode.
+    - Build cache beyond BUILD_CACHE_MAX_MB.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize garbage collector.
+
+        Args:
+            docker_manager: Docker manager providing the client and images.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.last_result: Optional[dict] = None
+
+    @property
+    def client(self):
+        """Current Docker client."""
+        return self.docker.client
+
+    def free_space_mb(self) -> Optional[int]:
+        """
+        Get the free space of the Docker data directory.
+
+        Returns:
+            Free space in MB, or None if the directory is not local.
+        """
+        try:
+            root = self.client.info().get("DockerRootDir")
+            return shutil.disk_usage(root).free // (1024 * 1024) if root else None
+        except (DockerException, OSError):
+            return None
+
+    def under_pressure(self) -> bool:
+        """Check whether free space is below DOCKER_GC_MIN_FREE_MB."""
+        free = self.free_space_mb()
+        return free is not None and free < self.config.docker_gc_min_free_mb
+
+    def _remove_containers(self) -> List[str]:
+        """Remove stopped task containers past the retention window."""
+        cutoff = time.time() - self.config.container_retention_hours * 3600
+        removed = []
+        for container in self.client.containers.list(
+            all=True,
+            filters={"label": MANAGED_LABEL, "status": ["exited", "dead", "created"]},
+        ):
+            state = container.attrs.get("State", {})
+            finished = _parse_docker_time(state.get("FinishedAt")) or _parse_docker_time(
+                container.attrs.get("Created")
+            )
+            if finished is None or finished > cutoff:
+                continue
+            try:
+                container.remove(force=True)
+                removed.append(container.name)
+                logger.info(f"Removed stopped container {container.name} ({container.id[:12]})")
+            except DockerException as e:
+                logger.warning(f"Failed to remove container {container.name}: {e}")
+        return removed
+
+    def _images_in_use(self) -> Set[str]:
+        """Get the IDs of images used by any container, running or not."""
+        return {
+            container.attrs.get("Image")
+            for container in self.client.containers.list(all=True)
+        }
+
+    def _remove_images(self) -> List[str]:
+        """Remove superseded task images and dangling images from earlier builds."""
+        keep = self._images_in_use()
+        try:
+            keep.add(self.client.images.get(self.docker.get_active_image()).id)
+        except DockerException:
+            pass
+
+        images = sorted(
+            self.client.images.list(name=self.docker.image_name),
+            key=lambda image: image.attrs.get("Created", ""),
+            reverse=True,
+        )
+        keep.update(image.id for image in images[:max(self.config.image_gc_keep, 0)])
+
+        removed = []
+        for image in images:
+            if image.id in keep:
+                continue
+            self.docker.cleanup_image(image.id)
+            removed.append(image.id[:12])
+
+        try:
+            pruned = self.client.images.prune(
+                filters={"dangling": True, "label": MANAGED_LABEL}
+            )
+            removed += [
+                entry.get("Deleted", "")[7:19]
+                for entry in pruned.get("ImagesDeleted") or []
+                if entry.get("Deleted")
+            ]
+        except DockerException as e:
+            logger.warning(f"Failed to prune dangling images: {e}")
+        return removed
+
+    def _prune_build_cache(self) -> int:
+        """
+        Shrink the build cache to BUILD_CACHE_MAX_MB.
+
+        Returns:
+            Bytes reclaimed.
+        """
+        try:
+            result = self.client.api.prune_builds(
+                keep_storage=self.config.build_cache_max_mb * 1024 * 1024
+            )
+        except DockerException as e:
+            logger.warning(f"Failed to prune build cache: {e}")
+            return 0
+        return result.get("SpaceReclaimed") or 0
+
+    def collect(self) -> dict:
+        """
+        Run one garbage collection pass.
+
+        Returns:
+            Summary of the actions taken.
+        """
+        if self.config.dry_run:
+            logger.info("[DRY-RUN] Would remove superseded images, old containers and build cache")
+            return {}
+
+        if not self.client:
+            raise RuntimeError("Not connected to Docker. Call connect() first.")
+
+        # Containers first: removing them can release their images
+        containers = self._remove_containers()
+        images = self._remove_images()
+        reclaimed = self._prune_build_cache()
+
+        self.last_result = {
+            "finished_at": time.time(),
+            "removed_containers": containers,
+            "removed_images": images,
+            "build_cache_reclaimed_mb": reclaimed // (1024 * 1024),
+            "free_mb": self.free_space_mb(),
+        }
+        logger.info(
+            f"Docker GC pass complete: {len(containers)} containers, "
+            f"{len(images)} images removed, "
+            f"{reclaimed // (1024 * 1024)} MB build cache reclaimed"
+        )
+        return self.last_result
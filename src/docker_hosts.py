@@ -0,0 +1,162 @@
+"""Pool of Docker endpoints that task containers are placed on."""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import docker
+from docker.errors import DockerException
+
+logger = logging.getLogger(__name__)
+
+# Host name of the endpoint configured by the environment (DOCKER_HOST or the local socket)
+LOCAL_HOST = "local"
+
+
+@dataclass
+class DockerHost:
+    """A Docker endpoint with its task capacity and current load."""
+    name: str
+    url: Optional[str]
+    capacity: int
+    client: Optional[docker.DockerClient] = None
+    running: int = 0
+    available: bool = True
+    # Serializes workspace mirror syncs and image transfers to this host
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def is_local(self) -> bool:
+        """Whether this is the endpoint the daemon's own files are visible to."""
+        return self.url is None
+
+    def connect(self):
+        """Create and check the client for this endpoint."""
+        if self.is_local:
+            self.client = docker.from_env()
+        else:
+            self.client = docker.DockerClient(
+                base_url=self.url,
+                use_ssh_client=self.url.startswith("ssh://"),
+            )
+        self.client.ping()
+
+    def close(self):
+        """Close the client."""
+        if self.client:
+            self.client.close()
+
+
+class HostPool:
+    """
+    Docker endpoints with per-host capacity and least-loaded placement.
+
+    The first host is the primary: images are built there and host-local
+    features (warm pool, cache volumes, package proxy) only apply to it.
+    """
+
+    def __init__(self, specs: List[Tuple[Optional[str], int]]):
+        """
+        Initialize host pool.
+
+        Args:
+            specs: (url, capacity) per host; a url of None is the local endpoint.
+        """
+        self.hosts: List[DockerHost] = [
+            DockerHost(name=url or LOCAL_HOST, url=url, capacity=capacity)
+            for url, capacity in specs
+        ]
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> DockerHost:
+        """The host images are built on."""
+        return self.hosts[0]
+
+    @property
+    def total_capacity(self) -> int:
+        """Sum of all host capacities."""
+        return sum(host.capacity for host in self.hosts)
+
+    def get(self, name: Optional[str]) -> DockerHost:
+        """
+        Get a host by name.
+
+        Args:
+            name: Host name, or None for the primary host.
+
+        Returns:
+            The host (the primary host if the name is unknown).
+        """
+        for host in self.hosts:
+            if host.name == name:
+                return host
+        return self.primary
+
+    def connect(self):
+        """
+        Connect to every host.
+
+        Raises:
+            DockerException: If the primary host is unreachable. Other hosts
+                that fail are marked unavailable and receive no tasks.
+        """
+        for host in self.hosts:
+            try:
+                host.connect()
+                host.available = True
+                logger.info(f"Connected to Docker host {host.name} (capacity {host.capacity})")
+            except DockerException as e:
+                if host is self.primary:
+                    raise
+                host.available = False
+                logger.error(f"Docker host {host.name} unavailable: {e}")
+
+    def acquire(self) -> Optional[DockerHost]:
+        """
+        Reserve a slot on the least-loaded available host.
+
+        Returns:
+            The host, or None if every host is at capacity.
+        """
+        with self._lock:
+            candidates = [
+                host for host in self.hosts
+                if host.available and host.running < host.capacity
+            ]
+            if not candidates:
+                return None
+            # Lowest utilisation first; earlier hosts win ties
+            host = min(candidates, key=lambda h: h.running / h.capacity)
+            host.running += 1
+            return host
+
+    def assign(self, name: Optional[str]):
+        """Count a task already running on a host (e.g., a re-adopted container)."""
+        with self._lock:
+            self.get(name).running += 1
+
+    def release(self, name: Optional[str]):
+        """Free the slot a task held on a host."""
+        with self._lock:
+            host = self.get(name)
+            host.running = max(0, host.running - 1)
+
+    def status(self) -> List[Dict]:
+        """Get load and availability of every host."""
+        with self._lock:
+            return [
+                {
+                    "name": host.name,
+                    "capacity": host.capacity,
+                    "running": host.running,
+                    "available": host.available,
+                }
+                for host in self.hosts
+            ]
+
+    def close(self):
+        """Close every client."""
+        for host in self.hosts:
+            host.close()
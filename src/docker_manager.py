@@ -1,24 +1,52 @@
 """Docker container management for Claude instances."""
 
+import io
 import logging
 import subprocess
 import shutil
+import tarfile
 import tempfile
-import urllib.request
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import docker
 from docker.models.containers import Container
 from docker.models.images import Image
 from docker.errors import DockerException, ImageNotFound, APIError
 
+from .artifact_cache import ArtifactCache
+from .build_cache import BUILD_DIGEST_LABEL, compute_build_digest
+from .cache_volumes import CacheVolumes
 from .config import get_config
+from .cpuset import CpuAllocation, CpuSetAllocator
+from .docker_hosts import DockerHost, HostPool
+from .package_proxy import PackageProxy
 from .repo_manager import RepositoryManager, run_git_command
+from .snapshot import DependencySnapshots
+from .warm_images import WarmImages
+from .workspace_agent import RemoteWorkspaceAgent
 
 logger = logging.getLogger(__name__)
 
 CLAUDE_INSTALL_URL = "https://claude.ai/install.sh"
 
+# Labels put on task containers so a restarted daemon can re-adopt them
+MANAGED_LABEL = "claude-issue-solver.managed"
+ISSUE_LABEL = "claude-issue-solver.issue"
+TASK_ID_LABEL = "claude-issue-solver.task-id"
+IMAGE_DIGEST_LABEL = "claude-issue-solver.image-digest"
+STARTED_AT_LABEL = "claude-issue-solver.started-at"
+WORKTREE_LABEL = "claude-issue-solver.worktree"
+TITLE_LABEL = "claude-issue-solver.title"
+IMPLEMENT_LABEL = "claude-issue-solver.implement"
+MODE_LABEL = "claude-issue-solver.mode"
+
+
+def task_credentials_name(issue_number: int) -> str:
+    """Get the file name of the OAuth credentials copy mounted into a task container."""
+    return f"claude-creds-{issue_number}.json"
+
 
 class DockerManager:
     """Manages Docker containers for Claude instances."""
@@ -29,7 +57,30 @@ class DockerManager:
         self.client: Optional[docker.DockerClient] = None
         self.image_name = "claude-issue-solver"
         self.image_tag = "latest"
+        self.image_digest: Optional[str] = None
+
+        # Blue/green image state: each build gets a digest tag and new tasks
+        # use whichever tag is active; running containers keep their image
+        self.active_image: Optional[str] = None
+        self.image_ready = threading.Event()
+        self.dockerfile_blob: Optional[str] = None
+        self._image_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self._rebuild_pending = False
+        self._watched_dockerfile: Optional[Path] = None
+        self._closing = threading.Event()
+        self.artifact_cache = ArtifactCache(self.config.artifact_cache_dir)
         self.repo_manager = RepositoryManager()
+        # Serializes worktree creation/removal against the background reaper
+        self.worktree_lock = threading.RLock()
+        self.snapshots = DependencySnapshots(self)
+        self.package_proxy = PackageProxy(self)
+        self.cache_volumes = CacheVolumes(self)
+        # Docker endpoints tasks run on; self.client is the local (primary) one
+        self.hosts = HostPool(self.config.docker_hosts)
+        self.workspace_agent = RemoteWorkspaceAgent(self)
+        self.cpusets = CpuSetAllocator()
+        self.warm_images = WarmImages(self)
 
     def connect(self):
         """Connect to Docker daemon."""
@@ -38,27 +89,39 @@ class DockerManager:
             return
 
         try:
-            self.client = docker.from_env()
-            self.client.ping()
+            self.hosts.connect()
+            self.client = self.hosts.primary.client
             logger.info("Connected to Docker daemon")
         except DockerException as e:
             logger.error(f"Failed to connect to Docker: {e}")
             raise
 
+    @property
+    def claude_install_url(self) -> str:
+        """URL of the Claude install script (CLAUDE_INSTALL_URL overrides the default)."""
+        return self.config.claude_install_url or CLAUDE_INSTALL_URL
+
     def _download_claude_install_script(self, target_path: Path):
         """
-        Download the Claude install script locally.
+        Place the Claude install script locally, using the artifact cache.
 
         Args:
             target_path: Where to save the install script.
         """
-        logger.info(f"Downloading Claude install script from {CLAUDE_INSTALL_URL}")
-        print(f"  Downloading {CLAUDE_INSTALL_URL}...", flush=True)
+        url = self.claude_install_url
+        logger.info(f"Fetching Claude install script from {url}")
+        print(f"  Fetching {url}...", flush=True)
 
         try:
-            urllib.request.urlretrieve(CLAUDE_INSTALL_URL, target_path)
-            print(f"  Saved to {target_path}", flush=True)
-            logger.info(f"Downloaded Claude install script to {target_path}")
+            sha256 = self.artifact_cache.fetch(
+                url,
+                target_path,
+                max_age=self.config.artifact_cache_ttl_hours * 3600,
+                expected_sha256=self.config.claude_install_sha256,
+                offline=self.config.offline,
+            )
+            print(f"  Saved to {target_path} (sha256 {sha256[:12]})", flush=True)
+            logger.info(f"Claude install script ready at {target_path}")
         except Exception as e:
             logger.error(f"Failed to download Claude install script: {e}")
             raise RuntimeError(f"Failed to download Claude install script: {e}")
@@ -115,6 +178,7 @@ class DockerManager:
         if self.config.dry_run:
             logger.info(f"[DRY-RUN] Would build development base image from {dev_dockerfile_path}")
             logger.info("[DRY-RUN] Would build Claude-enabled image")
+            self.image_ready.set()
             return "dry-run-image-id"
 
         if not self.client:
@@ -123,6 +187,29 @@ class DockerManager:
         if not dev_dockerfile_path.exists():
             raise FileNotFoundError(f"Development Dockerfile not found: {dev_dockerfile_path}")
 
+        claude_dockerfile_dir = Path(__file__).parent.parent
+        claude_dockerfile = claude_dockerfile_dir / "Dockerfile.claude"
+
+        digest = compute_build_digest(
+            dev_dockerfile_path,
+            claude_dockerfile,
+            extra=[self.claude_install_url, self.config.claude_install_sha256 or ""],
+        )
+        digest_tag = digest[:12]
+
+        if self.config.image_build_cache:
+            cached = self._find_cached_image(digest)
+            if cached:
+                cached.tag(self.image_name, self.image_tag)
+                cached.tag(self.image_name, digest_tag)
+                self._activate_image(f"{self.image_name}:{digest_tag}", digest)
+                logger.info(
+                    f"Using cached Claude image {cached.id[:12]} "
+                    f"(build digest {digest[:12]})"
+                )
+                print(f"\n  Build inputs unchanged, using cached image: {cached.id[:12]}", flush=True)
+                return cached.id
+
         try:
             # First, build the development image as a base
             logger.info(f"Building development base image from {dev_dockerfile_path}")
@@ -138,6 +225,8 @@ class DockerManager:
                 tag="dev-base:latest",
                 rm=True,
                 forcerm=True,
+                # Lets the garbage collector find superseded base images
+                labels={MANAGED_LABEL: "true"},
                 decode=True,
             )
 
@@ -149,13 +238,10 @@ class DockerManager:
             print(f"\n  Base image built: {base_image.id[:12]}", flush=True)
 
             # Download Claude install script before building Claude image
-            claude_dockerfile_dir = Path(__file__).parent.parent
             install_script_path = claude_dockerfile_dir / "claude-install.sh"
             self._download_claude_install_script(install_script_path)
 
             # Now build Claude-enabled image
-            claude_dockerfile = claude_dockerfile_dir / "Dockerfile.claude"
-
             logger.info("Building Claude-enabled image")
             print(f"\n=== Building Claude-enabled image ===", flush=True)
 
@@ -167,13 +253,17 @@ class DockerManager:
                 rm=True,
                 forcerm=True,
                 buildargs={"DEV_DOCKERFILE_PATH": str(dev_dockerfile_path)},
+                labels={BUILD_DIGEST_LABEL: digest},
                 decode=True,
             )
 
             self._stream_build_output(resp)
 
-            # Get the built image
+            # Get the built image and give it its own tag so it can be
+            # switched to without affecting containers on the previous one
             image = self.client.images.get(f"{self.image_name}:{self.image_tag}")
+            image.tag(self.image_name, digest_tag)
+            self._activate_image(f"{self.image_name}:{digest_tag}", digest)
             logger.info(f"Built Claude image: {image.id[:12]}")
             print(f"\n  Claude image built: {image.id[:12]}", flush=True)
 
@@ -187,34 +277,205 @@ class DockerManager:
             logger.error(f"Failed to build Docker image: {e}")
             raise
 
-    def create_worktree(self, issue_number: int) -> Path:
+    def _activate_image(self, image_ref: str, digest: Optional[str]):
+        """
+        Switch new tasks to an image.
+
+        Args:
+            image_ref: Image reference (name:tag).
+            digest: Build digest of the image, if known.
+        """
+        with self._image_lock:
+            previous = self.active_image
+            self.active_image = image_ref
+            self.image_digest = digest
+        self.image_ready.set()
+        if previous and previous != image_ref:
+            logger.info(f"Switched task image from {previous} to {image_ref}")
+        # Warm images are per task image: build one for the new image
+        self.warm_images.schedule()
+
+    def get_active_image(self) -> str:
+        """Get the image reference new containers should use."""
+        with self._image_lock:
+            return self.active_image or f"{self.image_name}:{self.image_tag}"
+
+    def _dockerfile_blob(self, dev_dockerfile_path: Path) -> Optional[str]:
+        """Get the git blob SHA of the development Dockerfile at HEAD."""
+        try:
+            return run_git_command(
+                ["git", "rev-parse", f"HEAD:./{dev_dockerfile_path.name}"],
+                cwd=dev_dockerfile_path.parent,
+                show_output=False,
+            ).stdout.strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    def start_image_build(self, dev_dockerfile_path: Path):
+        """
+        Build the image in a background thread.
+
+        If a build is already running, another build is queued to start
+        when it finishes. image_ready is set once the first image is usable.
+
+        Args:
+            dev_dockerfile_path: Path to the development Dockerfile.
+        """
+        with self._image_lock:
+            if self._build_thread and self._build_thread.is_alive():
+                self._rebuild_pending = True
+                return
+            self._build_thread = threading.Thread(
+                target=self._build_loop,
+                args=(dev_dockerfile_path,),
+                daemon=True,
+            )
+            self._build_thread.start()
+
+    def _build_loop(self, dev_dockerfile_path: Path):
+        """Run image builds until no rebuild is pending."""
+        while not self._closing.is_set():
+            with self._image_lock:
+                self._rebuild_pending = False
+
+            # Recorded before building so that a failed build is retried
+            # once a changed Dockerfile is synced, not on every sync
+            self.dockerfile_blob = self._dockerfile_blob(dev_dockerfile_path)
+            try:
+                self.build_image(dev_dockerfile_path)
+            except Exception as e:
+                logger.error(f"Background image build failed: {e}")
+                if not self.image_ready.is_set():
+                    if self._activate_existing_image():
+                        logger.warning("Using previously built image until a rebuild succeeds")
+                    else:
+                        # Nothing to run tasks with yet; retry after a delay
+                        self._closing.wait(timeout=60)
+                        continue
+
+            with self._image_lock:
+                if not self._rebuild_pending:
+                    return
+
+    def _activate_existing_image(self) -> bool:
+        """Fall back to the last image tagged latest, if there is one."""
+        try:
+            image = self.client.images.get(f"{self.image_name}:{self.image_tag}")
+        except DockerException:
+            return False
+        digest = image.labels.get(BUILD_DIGEST_LABEL) if image.labels else None
+        self._activate_image(f"{self.image_name}:{self.image_tag}", digest)
+        return True
+
+    def watch_dockerfile(self, dev_dockerfile_path: Path):
+        """
+        Rebuild the image in the background when the Dockerfile changes.
+
+        The Dockerfile's blob SHA is compared after every repository sync.
+
+        Args:
+            dev_dockerfile_path: Path to the development Dockerfile.
+        """
+        self._watched_dockerfile = dev_dockerfile_path
+        self.repo_manager.add_sync_listener(self._on_repository_sync)
+
+    def _on_repository_sync(self, repo_path: Path):
+        """Trigger a rebuild if the watched Dockerfile changed."""
+        if not self._watched_dockerfile or not self.dockerfile_blob:
+            return
+
+        blob = self._dockerfile_blob(self._watched_dockerfile)
+        if blob and blob != self.dockerfile_blob:
+            logger.info(
+                f"Development Dockerfile changed ({self.dockerfile_blob[:12]} -> {blob[:12]}), "
+                f"rebuilding image in the background"
+            )
+            self.start_image_build(self._watched_dockerfile)
+
+    def _find_cached_image(self, digest: str) -> Optional[Image]:
+        """
+        Find an image previously built from the same inputs.
+
+        Args:
+            digest: Build input digest from compute_build_digest().
+
+        Returns:
+            Matching image or None.
+        """
+        try:
+            images = self.client.images.list(filters={"label": f"{BUILD_DIGEST_LABEL}={digest}"})
+        except APIError as e:
+            logger.warning(f"Failed to look up cached images: {e}")
+            return None
+        return images[0] if images else None
+
+    def get_worktree_path(self, issue_number: int) -> Path:
+        """Get the default (absolute) worktree path for an issue."""
+        return (self.config.worktree_base / f"issue-{issue_number}").resolve()
+
+    def create_worktree(self, issue_number: int, worktree_path: Optional[Path] = None) -> Path:
         """
         Create a Git worktree for an issue.
 
         Args:
             issue_number: GitHub issue number.
+            worktree_path: Where to create the worktree; must be absent or an
+                empty directory (defaults to WORKTREE_BASE/issue-N).
 
         Returns:
             Path to the worktree (absolute).
         """
         # Use absolute path for worktree to avoid issues with relative paths
-        worktree_path = (self.config.worktree_base / f"issue-{issue_number}").resolve()
+        worktree_path = (worktree_path or self.get_worktree_path(issue_number)).resolve()
 
         if self.config.dry_run:
             logger.info(f"[DRY-RUN] Would pull latest from default branch")
             logger.info(f"[DRY-RUN] Would create worktree at: {worktree_path}")
+            if self.config.resume_branches:
+                logger.info(f"[DRY-RUN] Would resume branch issue-{issue_number} if it exists")
             logger.info(f"[DRY-RUN] Would execute: git worktree add {worktree_path} -b issue-{issue_number}")
             return worktree_path
 
+        with self.worktree_lock:
+            self._create_worktree(issue_number, worktree_path)
+            repo_path = self.repo_manager.get_repo_path()
+
+        if self.snapshots.enabled:
+            self._apply_dependency_snapshot(repo_path, worktree_path)
+
+        return worktree_path
+
+    def _apply_dependency_snapshot(self, repo_path: Path, worktree_path: Path):
+        """
+        Clone the default-branch dependency snapshot into a new worktree.
+
+        Only a snapshot that is already built is used; otherwise it is built
+        in the background and this worktree goes without it. Failures are
+        logged and the worktree is used without dependencies.
+
+        Args:
+            repo_path: Path to the repository.
+            worktree_path: Task worktree.
+        """
+        try:
+            commit = self.snapshots.snapshot_for(repo_path)
+            if commit:
+                self.snapshots.apply(commit, worktree_path)
+        except Exception as e:
+            logger.warning(f"Could not apply dependency snapshot: {e}")
+
+    def _create_worktree(self, issue_number: int, worktree_path: Path) -> Path:
+        """Create a worktree; caller must hold worktree_lock."""
         # Ensure repository is up to date
         repo_path = self.repo_manager.get_repo_path()
         logger.info("Pulling latest changes before creating worktree...")
         self.repo_manager.pull_latest()
 
-        # Remove if it already exists
-        if worktree_path.exists():
+        # Remove if it already exists (an empty directory, such as a pool slot
+        # that is already mounted into a container, is used as-is)
+        if worktree_path.exists() and any(worktree_path.iterdir()):
             logger.warning(f"Worktree already exists, removing: {worktree_path}")
-            self.remove_worktree(issue_number)
+            self.remove_worktree(issue_number, worktree_path)
 
         try:
             branch_name = f"issue-{issue_number}"
@@ -229,6 +490,15 @@ class DockerManager:
             except subprocess.CalledProcessError:
                 pass
 
+            if self.config.workspace_mode == "shared-clone":
+                return self._create_shared_clone(repo_path, worktree_path, branch_name)
+
+            if self.config.resume_branches:
+                resumed = self._add_resumed_worktree(repo_path, worktree_path, branch_name)
+                if resumed:
+                    logger.info(f"Created worktree: {worktree_path}")
+                    return worktree_path
+
             # Try to delete the branch if it exists (from a previous run)
             try:
                 run_git_command(
@@ -260,15 +530,260 @@ class DockerManager:
             logger.error(f"Failed to create worktree: {e.output}")
             raise
 
-    def remove_worktree(self, issue_number: int):
+    def _ref_exists(self, repo_path: Path, ref: str) -> bool:
+        """Check whether a fully qualified ref exists in the repository."""
+        try:
+            run_git_command(
+                ["git", "rev-parse", "--verify", "--quiet", ref],
+                cwd=repo_path,
+                show_output=False,
+            )
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _is_ancestor(self, repo_path: Path, ancestor: str, descendant: str) -> bool:
+        """Check whether one commit is an ancestor of another."""
+        try:
+            run_git_command(
+                ["git", "merge-base", "--is-ancestor", ancestor, descendant],
+                cwd=repo_path,
+                show_output=False,
+            )
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _resolve_resume_ref(self, repo_path: Path, branch_name: str) -> Optional[str]:
+        """
+        Find the ref to resume an existing issue branch from.
+
+        The local branch is preferred; it is fast-forwarded to its remote
+        counterpart when that is strictly ahead. A branch that only exists on
+        origin is resumed from the remote-tracking ref.
+
+        Args:
+            repo_path: Path to the repository.
+            branch_name: Issue branch name.
+
+        Returns:
+            Ref to start the issue branch from, or None if no branch exists.
+        """
+        local_ref = f"refs/heads/{branch_name}"
+        remote_ref = f"refs/remotes/origin/{branch_name}"
+        has_local = self._ref_exists(repo_path, local_ref)
+        has_remote = self._ref_exists(repo_path, remote_ref)
+
+        if not has_local and not has_remote:
+            return None
+
+        if has_local and has_remote:
+            if self._is_ancestor(repo_path, local_ref, remote_ref):
+                # Remote has everything local has (and maybe more)
+                run_git_command(
+                    ["git", "branch", "-f", branch_name, remote_ref],
+                    cwd=repo_path,
+                    show_output=False,
+                )
+            elif not self._is_ancestor(repo_path, remote_ref, local_ref):
+                logger.warning(
+                    f"Branch {branch_name} has diverged from origin; "
+                    f"resuming from the local branch"
+                )
+
+        if has_local:
+            logger.info(f"Resuming existing branch: {branch_name}")
+            return local_ref
+
+        logger.info(f"Resuming branch {branch_name} from origin")
+        return remote_ref
+
+    def _add_resumed_worktree(
+        self,
+        repo_path: Path,
+        worktree_path: Path,
+        branch_name: str,
+    ) -> bool:
+        """
+        Check out an existing issue branch into a new worktree.
+
+        Args:
+            repo_path: Path to the repository.
+            worktree_path: Where to create the worktree.
+            branch_name: Issue branch name.
+
+        Returns:
+            True if a worktree was created from an existing branch, False if
+            no branch exists and a fresh one should be created.
+        """
+        start_ref = self._resolve_resume_ref(repo_path, branch_name)
+        if start_ref is None:
+            return False
+
+        if start_ref.startswith("refs/heads/"):
+            run_git_command(
+                ["git", "worktree", "add", str(worktree_path), branch_name],
+                cwd=repo_path,
+            )
+        else:
+            run_git_command(
+                ["git", "worktree", "add", str(worktree_path), "-b", branch_name, start_ref],
+                cwd=repo_path,
+            )
+
+        if self.config.rebase_on_resume:
+            self._rebase_onto_default(repo_path, worktree_path, branch_name)
+
+        return True
+
+    def _create_shared_clone(
+        self,
+        repo_path: Path,
+        clone_path: Path,
+        branch_name: str,
+    ) -> Path:
+        """
+        Create a self-contained per-task repository sharing the cache's objects.
+
+        The clone uses `git clone --shared`, so its objects/info/alternates
+        points at the cached clone's object store instead of copying it. Its
+        origin is pointed at the cache's upstream so pushes work from inside
+        the container.
+
+        Args:
+            repo_path: Path to the cached repository.
+            clone_path: Where to create the per-task repository.
+            branch_name: Issue branch name.
+
+        Returns:
+            Path to the per-task repository.
+        """
+        start_ref = None
+        if self.config.resume_branches:
+            start_ref = self._resolve_resume_ref(repo_path, branch_name)
+
+        # Point the issue branch in the cache at the commit the task starts from
+        run_git_command(
+            ["git", "branch", "-f", branch_name, start_ref or "HEAD"],
+            cwd=repo_path,
+            show_output=False,
+        )
+        if start_ref is None:
+            logger.info(f"Created branch {branch_name} from default branch")
+
+        run_git_command(
+            [
+                "git",
+                "clone",
+                "--shared",
+                "--branch",
+                branch_name,
+                str(repo_path),
+                str(clone_path),
+            ],
+        )
+
+        upstream_url = run_git_command(
+            ["git", "remote", "get-url", "origin"],
+            cwd=repo_path,
+            show_output=False,
+        ).stdout.strip()
+        run_git_command(
+            ["git", "remote", "set-url", "origin", upstream_url],
+            cwd=clone_path,
+            show_output=False,
+        )
+
+        if start_ref is not None and self.config.rebase_on_resume:
+            self._rebase_onto_default(repo_path, clone_path, branch_name)
+
+        logger.info(f"Created shared-object clone: {clone_path}")
+        return clone_path
+
+    def _is_shared_clone(self, workspace_path: Path) -> bool:
+        """Check whether a task workspace is a shared-object clone."""
+        return (workspace_path / ".git").is_dir()
+
+    def get_shared_object_dirs(self, workspace_path: Path) -> list[Path]:
+        """
+        Get the object directories a shared-object clone borrows from.
+
+        Args:
+            workspace_path: Path to the task workspace.
+
+        Returns:
+            Absolute object directory paths listed in the clone's alternates.
+        """
+        alternates = workspace_path / ".git" / "objects" / "info" / "alternates"
+        if not alternates.exists():
+            return []
+
+        object_dirs = []
+        base = alternates.parent.parent
+        for line in alternates.read_text().splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            object_dirs.append((base / line).resolve())
+        return object_dirs
+
+    def _rebase_onto_default(self, repo_path: Path, worktree_path: Path, branch_name: str):
+        """
+        Rebase a resumed issue branch onto the latest default branch.
+
+        A branch that is already on origin is left alone, since rewriting it
+        would make the container's next push a non-fast-forward. A
+        conflicting rebase is aborted and the branch is left as it was.
+
+        Args:
+            repo_path: Path to the repository.
+            worktree_path: Worktree with the issue branch checked out.
+            branch_name: Issue branch name.
+        """
+        try:
+            run_git_command(
+                ["git", "show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch_name}"],
+                cwd=repo_path,
+                show_output=False,
+            )
+            logger.info(f"Not rebasing {branch_name}: it is already pushed to origin")
+            return
+        except subprocess.CalledProcessError:
+            pass
+
+        default_branch = self.repo_manager._get_default_branch(repo_path)
+        upstream = f"origin/{default_branch}"
+
+        try:
+            run_git_command(
+                ["git", "rebase", upstream],
+                cwd=worktree_path,
+            )
+            logger.info(f"Rebased {branch_name} onto {upstream}")
+        except subprocess.CalledProcessError as e:
+            logger.warning(
+                f"Rebase of {branch_name} onto {upstream} failed, "
+                f"keeping branch as-is: {e.output}"
+            )
+            try:
+                run_git_command(
+                    ["git", "rebase", "--abort"],
+                    cwd=worktree_path,
+                    show_output=False,
+                )
+            except subprocess.CalledProcessError:
+                pass
+
+    def remove_worktree(self, issue_number: int, worktree_path: Optional[Path] = None):
         """
         Remove a Git worktree.
 
         Args:
             issue_number: GitHub issue number.
+            worktree_path: Worktree location if not the default for the issue.
         """
         # Use absolute path for worktree to match create_worktree
-        worktree_path = (self.config.worktree_base / f"issue-{issue_number}").resolve()
+        worktree_path = (worktree_path or self.get_worktree_path(issue_number)).resolve()
 
         if self.config.dry_run:
             logger.info(f"[DRY-RUN] Would remove worktree: {worktree_path}")
@@ -277,19 +792,333 @@ class DockerManager:
 
         repo_path = self.repo_manager.get_repo_path()
 
+        with self.worktree_lock:
+            if self._is_shared_clone(worktree_path):
+                self._remove_shared_clone(repo_path, worktree_path, f"issue-{issue_number}")
+                return
+
+            try:
+                # Remove worktree
+                run_git_command(
+                    ["git", "worktree", "remove", str(worktree_path), "--force"],
+                    cwd=repo_path,
+                )
+                logger.info(f"Removed worktree: {worktree_path}")
+
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Failed to remove worktree: {e.output}")
+                # Try to remove directory manually
+                if worktree_path.exists():
+                    shutil.rmtree(worktree_path, ignore_errors=True)
+
+    def _remove_shared_clone(self, repo_path: Path, clone_path: Path, branch_name: str):
+        """
+        Remove a shared-object clone, keeping its issue branch in the cache.
+
+        Args:
+            repo_path: Path to the cached repository.
+            clone_path: Path to the per-task repository.
+            branch_name: Issue branch name.
+        """
         try:
-            # Remove worktree
+            # Bring local commits back so they survive for resumed runs
             run_git_command(
-                ["git", "worktree", "remove", str(worktree_path), "--force"],
+                ["git", "fetch", "--force", str(clone_path), f"{branch_name}:{branch_name}"],
                 cwd=repo_path,
+                show_output=False,
             )
-            logger.info(f"Removed worktree: {worktree_path}")
-
         except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to remove worktree: {e.output}")
-            # Try to remove directory manually
-            if worktree_path.exists():
-                shutil.rmtree(worktree_path, ignore_errors=True)
+            logger.warning(f"Failed to fetch {branch_name} back from {clone_path}: {e.stderr}")
+
+        shutil.rmtree(clone_path, ignore_errors=True)
+        logger.info(f"Removed shared-object clone: {clone_path}")
+
+    def run_setup_command(self, workspace_path: Path, command: str) -> int:
+        """
+        Run a shell command in the task image with a workspace mounted.
+
+        Used to prepare dependency snapshots in the same environment the
+        Claude sessions run in.
+
+        Args:
+            workspace_path: Directory to mount at /workspace.
+            command: Shell command to run.
+
+        Returns:
+            Exit code of the command.
+        """
+        if not self.client:
+            raise RuntimeError("Not connected to Docker. Call connect() first.")
+
+        logger.info(f"Running setup command in {workspace_path}: {command}")
+        cache_mounts = self.cache_volumes.mounts()
+        try:
+            container = self.client.containers.run(
+                self.get_active_image(),
+                entrypoint=["/bin/sh", "-c"],
+                command=[command],
+                volumes={
+                    str(workspace_path.resolve()): {
+                        "bind": "/workspace",
+                        "mode": "rw",
+                    },
+                    **cache_mounts,
+                },
+                environment={
+                    **self.package_proxy.environment(),
+                    **self.cache_volumes.environment(cache_mounts),
+                },
+                working_dir="/workspace",
+                detach=True,
+                user="claude",
+                network_mode="bridge",
+                extra_hosts=self.package_proxy.extra_hosts(),
+            )
+        finally:
+            self.cache_volumes.release(cache_mounts)
+
+        try:
+            result = container.wait()
+            exit_code = result.get("StatusCode", -1)
+            if exit_code != 0:
+                logs = container.logs().decode("utf-8", errors="replace")
+                logger.error(f"Setup command failed with code {exit_code}:\n{logs[-2000:]}")
+            return exit_code
+        finally:
+            try:
+                container.remove(force=True)
+            except DockerException:
+                pass
+
+    @staticmethod
+    def credentials_path(credentials_name: str) -> Path:
+        """Get where the OAuth credentials copy of a container is written."""
+        return Path(tempfile.gettempdir()) / credentials_name
+
+    def task_volumes(
+        self,
+        workspace_path: Path,
+        object_dirs: list[Path],
+        credentials_name: str,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Build the volume mounts for a Claude task container.
+
+        Args:
+            workspace_path: Absolute host path mounted at /workspace.
+            object_dirs: Shared git object directories to mount read-only.
+            credentials_name: File name for the OAuth credentials copy.
+
+        Returns:
+            Volume specification for the Docker SDK. Its cache volumes are
+            claimed until passed to cache_volumes.release().
+        """
+        # Set up volume mounts
+        volumes = {
+            str(workspace_path): {
+                "bind": "/workspace",
+                "mode": "rw",
+            }
+        }
+
+        # A shared-object clone borrows objects from the cache; mount them
+        # read-only at the same path so its alternates resolve in the container
+        for object_dir in object_dirs:
+            volumes[str(object_dir)] = {
+                "bind": str(object_dir),
+                "mode": "ro",
+            }
+
+        # If we have OAuth credentials JSON, write it to a temp file and mount it
+        # This allows Claude CLI inside the container to authenticate via OAuth
+        if self.config.claude_credentials_json:
+            # Create a temporary credentials file that will be mounted
+            credentials_file = self.credentials_path(credentials_name)
+            credentials_file.write_text(self.config.claude_credentials_json)
+            credentials_file.chmod(0o600)  # Secure permissions
+            logger.info(f"Created credentials file for container: {credentials_file}")
+
+            # Mount the credentials file to where Claude CLI expects it
+            # Note: Container runs as 'claude' user, so mount to /home/claude/.claude/
+            volumes[str(credentials_file)] = {
+                "bind": "/home/claude/.claude/.credentials.json",
+                "mode": "ro",
+            }
+
+        # Package and build caches shared across tasks
+        volumes.update(self.cache_volumes.mounts())
+
+        return volumes
+
+    def task_environment(
+        self,
+        github_token: Optional[str] = None,
+        remote: bool = False,
+        volumes: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> Dict[str, str]:
+        """
+        Build the environment for a Claude task container.
+
+        Args:
+            github_token: GitHub token for gh CLI authentication.
+            remote: The container runs on a remote Docker host, which has no
+                access to the package proxy or the cache volumes.
+            volumes: The container's volume mounts (from task_volumes());
+                tools are only pointed at cache volumes mounted there.
+
+        Returns:
+            Environment variables.
+        """
+        # Route package downloads through the local caching proxy and point
+        # build tools at the shared cache volumes
+        environment = {}
+        if not remote:
+            environment.update(self.package_proxy.environment())
+            environment.update(self.cache_volumes.environment(volumes or {}))
+
+        # Pass GitHub token for gh CLI authentication
+        if github_token:
+            environment["GH_TOKEN"] = github_token
+            environment["GITHUB_TOKEN"] = github_token
+
+        if not self.config.claude_credentials_json:
+            # Fall back to API key environment variable
+            environment["ANTHROPIC_API_KEY"] = self.config.claude_api_key
+            environment["CLAUDE_API_KEY"] = self.config.claude_api_key
+
+        return environment
+
+    def claude_arguments(self, prompt: str) -> list[str]:
+        """
+        Build the Claude CLI arguments for a non-interactive session.
+
+        Args:
+            prompt: Prompt to pass to Claude.
+
+        Returns:
+            Arguments following the image's claude entrypoint.
+        """
+        # -p (print) mode for non-interactive output
+        # --dangerously-skip-permissions to allow autonomous operation (requires non-root user)
+        return [
+            "-p",  # Print mode (non-interactive)
+            "--dangerously-skip-permissions",  # Allow autonomous operation
+            prompt,
+        ]
+
+    def task_labels(
+        self,
+        issue_number: int,
+        extra: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Build the labels for a task container.
+
+        Args:
+            issue_number: GitHub issue number.
+            extra: Additional labels to include.
+
+        Returns:
+            Container labels.
+        """
+        labels = {
+            MANAGED_LABEL: "true",
+            ISSUE_LABEL: str(issue_number),
+            IMAGE_DIGEST_LABEL: self.image_digest or "",
+            STARTED_AT_LABEL: datetime.now(timezone.utc).isoformat(),
+        }
+        labels.update(extra or {})
+        return labels
+
+    def list_task_containers(self, host: Optional[DockerHost] = None) -> List[Container]:
+        """
+        List all containers (running or stopped) started by this daemon.
+
+        Args:
+            host: Docker host to list (defaults to the local one).
+
+        Returns:
+            Containers carrying the managed label.
+        """
+        client = host.client if host else self.client
+        if not client:
+            raise RuntimeError("Not connected to Docker. Call connect() first.")
+        return client.containers.list(all=True, filters={"label": MANAGED_LABEL})
+
+    def ensure_image(self, host: DockerHost):
+        """
+        Make the active image available on a remote host.
+
+        Images are only built locally; a host missing the active image gets
+        a copy streamed from the local daemon.
+
+        Args:
+            host: Docker host.
+        """
+        if host.is_local:
+            return
+
+        image_ref = self.get_active_image()
+        with host.lock:
+            try:
+                host.client.images.get(image_ref)
+                return
+            except ImageNotFound:
+                pass
+
+            logger.info(f"Copying image {image_ref} to Docker host {host.name}")
+            image = self.client.images.get(image_ref)
+            host.client.images.load(image.save(named=True))
+            logger.info(f"Copied image {image_ref} to Docker host {host.name}")
+
+    def _start_remote_container(
+        self,
+        host: DockerHost,
+        issue_number: int,
+        worktree_path: Path,
+        command: list[str],
+        github_token: Optional[str],
+        keep_container: bool,
+        labels: Dict[str, str],
+    ) -> Container:
+        """
+        Start a task container on a remote host.
+
+        The workspace is prepared there by the workspace agent, and the
+        OAuth credentials are copied into the container before it starts
+        since host files cannot be bind-mounted remotely.
+        """
+        self.ensure_image(host)
+        volumes = self.workspace_agent.prepare(host, issue_number, worktree_path)
+
+        container = host.client.containers.create(
+            self.get_active_image(),
+            name=f"claude-issue-{issue_number}",
+            command=command,
+            environment=self.task_environment(github_token, remote=True),
+            volumes=volumes,
+            working_dir="/workspace",
+            auto_remove=not keep_container,
+            user="claude",
+            network_mode="bridge",
+            labels=labels,
+        )
+        if self.config.claude_credentials_json:
+            data = self.config.claude_credentials_json.encode()
+            info = tarfile.TarInfo(".credentials.json")
+            info.size = len(data)
+            info.mode = 0o600
+            info.uid, info.gid = self.workspace_agent.user_ids(host)
+            archive = io.BytesIO()
+            with tarfile.open(fileobj=archive, mode="w") as tar:
+                tar.addfile(info, io.BytesIO(data))
+            container.put_archive("/home/claude/.claude", archive.getvalue())
+        container.start()
+        return container
+
+    def get_cache_object_dir(self) -> Path:
+        """Get the object directory of the cached repository."""
+        return (self.repo_manager.get_repo_path() / ".git" / "objects").resolve()
 
     def run_claude_container(
         self,
@@ -298,6 +1127,10 @@ class DockerManager:
         prompt: str,
         keep_container: bool = False,
         github_token: str = None,
+        labels: Optional[Dict[str, str]] = None,
+        host: Optional[DockerHost] = None,
+        cpuset: Optional[CpuAllocation] = None,
+        image: Optional[str] = None,
     ) -> Container:
         """
         Run a Claude container for an issue.
@@ -308,6 +1141,12 @@ class DockerManager:
             prompt: Prompt to pass to Claude.
             keep_container: If True, don't auto-remove container (for debugging).
             github_token: GitHub token for gh CLI authentication.
+            labels: Extra container labels (e.g., task ID), added to the
+                standard issue/image/start-time labels.
+            host: Docker host to run on (defaults to the local one).
+            cpuset: CPUs to pin the container to (local host only).
+            image: Image to run on the local host (defaults to the worktree's
+                warm image, else the active image).
 
         Returns:
             Docker Container object.
@@ -316,7 +1155,10 @@ class DockerManager:
 
         if self.config.dry_run:
             logger.info(f"[DRY-RUN] Would start Claude container: {container_name}")
-            logger.info(f"[DRY-RUN] Image: {self.image_name}:{self.image_tag}")
+            logger.info(f"[DRY-RUN] Image: {self.get_active_image()}")
+            logger.info(f"[DRY-RUN] Docker host: {host.name if host else 'local'}")
+            if cpuset:
+                logger.info(f"[DRY-RUN] CPU set: {cpuset.cpuset_cpus}")
             logger.info(f"[DRY-RUN] Worktree mount: {worktree_path} -> /workspace")
             logger.info(f"[DRY-RUN] Prompt: {prompt[:100]}...")
             logger.info(f"[DRY-RUN] Privileged: True")
@@ -333,10 +1175,11 @@ class DockerManager:
         if not self.client:
             raise RuntimeError("Not connected to Docker. Call connect() first.")
 
+        client = host.client if host else self.client
         try:
             # Check if container already exists
             try:
-                existing = self.client.containers.get(container_name)
+                existing = client.containers.get(container_name)
                 logger.warning(f"Container {container_name} already exists, removing")
                 existing.remove(force=True)
             except docker.errors.NotFound:
@@ -345,69 +1188,58 @@ class DockerManager:
             # Run container
             logger.info(f"Starting Claude container for issue #{issue_number}")
 
+            if host and not host.is_local:
+                container = self._start_remote_container(
+                    host,
+                    issue_number,
+                    worktree_path,
+                    self.claude_arguments(prompt),
+                    github_token,
+                    keep_container,
+                    self.task_labels(issue_number, labels),
+                )
+                logger.info(
+                    f"Started container {container_name} ({container.id[:12]}) on {host.name}"
+                )
+                return container
+
             # Docker requires absolute paths for volume mounts
             absolute_worktree_path = worktree_path.resolve()
 
-            # Set up volume mounts
-            volumes = {
-                str(absolute_worktree_path): {
-                    "bind": "/workspace",
-                    "mode": "rw",
-                }
-            }
-
-            # Set up environment variables
-            environment = {}
-
-            # Pass GitHub token for gh CLI authentication
-            if github_token:
-                environment["GH_TOKEN"] = github_token
-                environment["GITHUB_TOKEN"] = github_token
-
-            # If we have OAuth credentials JSON, write it to a temp file and mount it
-            # This allows Claude CLI inside the container to authenticate via OAuth
-            credentials_file = None
-            if self.config.claude_credentials_json:
-                # Create a temporary credentials file that will be mounted
-                credentials_file = Path(tempfile.gettempdir()) / f"claude-creds-{issue_number}.json"
-                credentials_file.write_text(self.config.claude_credentials_json)
-                credentials_file.chmod(0o600)  # Secure permissions
-                logger.info(f"Created credentials file for container: {credentials_file}")
-
-                # Mount the credentials file to where Claude CLI expects it
-                # Note: Container runs as 'claude' user, so mount to /home/claude/.claude/
-                volumes[str(credentials_file)] = {
-                    "bind": "/home/claude/.claude/.credentials.json",
-                    "mode": "ro",
-                }
-            else:
-                # Fall back to API key environment variable
-                environment["ANTHROPIC_API_KEY"] = self.config.claude_api_key
-                environment["CLAUDE_API_KEY"] = self.config.claude_api_key
-
-            # Build command with proper flags for non-interactive mode
-            # -p (print) mode for non-interactive output
-            # --dangerously-skip-permissions to allow autonomous operation (requires non-root user)
-            command = [
-                "-p",  # Print mode (non-interactive)
-                "--dangerously-skip-permissions",  # Allow autonomous operation
-                prompt,
-            ]
-
-            container = self.client.containers.run(
-                f"{self.image_name}:{self.image_tag}",
-                name=container_name,
-                command=command,
-                environment=environment,
-                volumes=volumes,
-                working_dir="/workspace",
-                detach=True,
-                remove=not keep_container,  # Auto-remove when done (unless debugging)
-                user="claude",  # Run as non-root claude user
-                network_mode="bridge",
+            volumes = self.task_volumes(
+                absolute_worktree_path,
+                self.get_shared_object_dirs(absolute_worktree_path),
+                task_credentials_name(issue_number),
             )
+            try:
+                environment = self.task_environment(github_token, volumes=volumes)
+                command = self.claude_arguments(prompt)
+                image = (
+                    image
+                    or self.warm_images.image_for(absolute_worktree_path)
+                    or self.get_active_image()
+                )
+
+                container = self.client.containers.run(
+                    image,
+                    name=container_name,
+                    command=command,
+                    environment=environment,
+                    volumes=volumes,
+                    working_dir="/workspace",
+                    detach=True,
+                    remove=not keep_container,  # Auto-remove when done (unless debugging)
+                    user="claude",  # Run as non-root claude user
+                    network_mode="bridge",
+                    extra_hosts=self.package_proxy.extra_hosts(),
+                    labels=self.task_labels(issue_number, labels),
+                    **(cpuset.container_options() if cpuset else {}),
+                )
+            finally:
+                # The running container now counts as using its cache volumes
+                self.cache_volumes.release(volumes)
 
-            logger.info(f"Started container {container_name} ({container.id[:12]})")
+            logger.info(f"Started container {container_name} ({container.id[:12]}) from {image}")
             return container
 
         except DockerException as e:
@@ -456,20 +1288,22 @@ class DockerManager:
         except docker.errors.NotFound:
             return None
 
-    def stop_container(self, issue_number: int):
+    def stop_container(self, issue_number: int, host: Optional[DockerHost] = None):
         """
         Stop a running container.
 
         Args:
             issue_number: GitHub issue number.
+            host: Docker host the container runs on (defaults to the local one).
         """
         if not self.client:
             raise RuntimeError("Not connected to Docker. Call connect() first.")
 
         container_name = f"claude-issue-{issue_number}"
+        client = host.client if host else self.client
 
         try:
-            container = self.client.containers.get(container_name)
+            container = client.containers.get(container_name)
             container.stop(timeout=10)
             logger.info(f"Stopped container {container_name}")
         except docker.errors.NotFound:
@@ -495,6 +1329,7 @@ class DockerManager:
 
     def close(self):
         """Close Docker connection."""
+        self._closing.set()
         if self.client:
-            self.client.close()
+            self.hosts.close()
             logger.info("Closed Docker connection")
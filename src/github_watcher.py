@@ -2,7 +2,6 @@
 
 import logging
 import time
-import jwt
 from typing import List, Set, Optional
 from datetime import datetime, timezone, timedelta
 from github import Github, GithubException, Auth
@@ -77,6 +76,9 @@ class GitHubWatcher:
             'iss': self.config.github_app_id
         }
 
+        # Imported here: PyJWT pulls in cryptography, which only App auth needs
+        import jwt
+
         return jwt.encode(payload, private_key, algorithm='RS256')
 
     def _get_installation_token(self) -> str:
@@ -0,0 +1,122 @@
+"""In-process timing metrics for Claude Issue Solver."""
+
+import bisect
+import threading
+from typing import Dict, List, Optional
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is unbounded
+DEFAULT_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram of durations."""
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds in seconds.
+        """
+        self.buckets = list(buckets or DEFAULT_BUCKETS)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        Record a single observation.
+
+        Args:
+            value: Duration in seconds.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        """Get a serializable summary of the histogram."""
+        with self._lock:
+            buckets = {
+                f"le_{bound:g}": count
+                for bound, count in zip(self.buckets, self._counts)
+            }
+            buckets["le_inf"] = self._counts[-1]
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 3),
+                "avg": round(self._sum / self._count, 3) if self._count else 0.0,
+                "min": round(self._min, 3) if self._min is not None else None,
+                "max": round(self._max, 3) if self._max is not None else None,
+                "buckets": buckets,
+            }
+
+
+class MetricsRegistry:
+    """Named collection of histograms, grouped by metric family."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, family: str, name: str) -> Histogram:
+        """
+        Get or create a histogram.
+
+        Args:
+            family: Metric family (e.g., "git").
+            name: Metric name within the family (e.g., "fetch").
+
+        Returns:
+            Histogram instance.
+        """
+        with self._lock:
+            histograms = self._histograms.setdefault(family, {})
+            if name not in histograms:
+                histograms[name] = Histogram()
+            return histograms[name]
+
+    def observe(self, family: str, name: str, value: float):
+        """Record an observation in the named histogram."""
+        self.histogram(family, name).observe(value)
+
+    def snapshot(self) -> dict:
+        """Get a serializable summary of all histograms."""
+        with self._lock:
+            families = {
+                family: dict(histograms)
+                for family, histograms in self._histograms.items()
+            }
+        return {
+            family: {name: hist.snapshot() for name, hist in sorted(histograms.items())}
+            for family, histograms in families.items()
+        }
+
+    def reset(self):
+        """Drop all recorded histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+
+# Global registry instance
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the global metrics registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
@@ -0,0 +1,434 @@
+"""Local pull-through package mirror and caching HTTP proxy for task containers."""
+
+import hashlib
+import ipaddress
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from docker.errors import DockerException
+
+from .config import get_config
+from .metrics import get_metrics
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+# Name under which task containers reach the host (mapped to the host gateway)
+PROXY_HOSTNAME = "host.docker.internal"
+
+PYPI_UPSTREAM = "https://pypi.org"
+PYPI_FILES_UPSTREAM = "https://files.pythonhosted.org"
+NPM_UPSTREAM = "https://registry.npmjs.org"
+
+# Package archives are immutable by name and safe to serve from the cache;
+# indexes and metadata are always fetched from upstream
+CACHEABLE = re.compile(r"\.(whl|tar\.gz|tgz|tar\.bz2|zip|deb|udeb|egg|jar|gem|crate)$")
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class LRUDiskCache:
+    """
+    Size-bounded on-disk cache evicting the least recently used entries.
+
+    Recency is kept in file mtimes, so it survives restarts.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cached files.
+            max_bytes: Total size above which entries are evicted.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Index existing cache files, oldest access first."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.cache_dir.iterdir():
+            if path.is_file() and not path.name.startswith("."):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+        with self._lock:
+            self._entries = OrderedDict((name, size) for _, name, size in sorted(files))
+            self._total = sum(self._entries.values())
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Get the cache key of a URL."""
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Path of the cached file, or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self.cache_dir / key
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+            return None
+        return path
+
+    def temp_file(self):
+        """Open a temporary file in the cache directory for a new entry."""
+        return tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=".tmp-", delete=False)
+
+    def commit(self, key: str, tmp_path: Path):
+        """
+        Move a completed temporary file into the cache and evict as needed.
+
+        Args:
+            key: Cache key.
+            tmp_path: Fully written temporary file.
+        """
+        size = tmp_path.stat().st_size
+        tmp_path.replace(self.cache_dir / key)
+        evicted = []
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total += size
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old, old_size = self._entries.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old)
+        for old in evicted:
+            (self.cache_dir / old).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the entry count and total size."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total}
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """Serves the mirror routes and plain-HTTP forward proxy requests."""
+
+    server_version = "claude-package-proxy"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def proxy(self) -> "PackageProxy":
+        return self.server.package_proxy
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _local_base(self) -> str:
+        """Base URL under which the client reached this server."""
+        return f"http://{self.headers.get('Host', f'{PROXY_HOSTNAME}:{self.server.server_port}')}"
+
+    def do_GET(self):
+        path = self.path
+        if path.startswith("http://"):
+            # Forward proxy request (apt and other plain-HTTP clients), only
+            # to package mirrors so the proxy cannot reach internal services
+            url = path
+            if not self.proxy.forward_allowed(urlsplit(url).hostname or ""):
+                self.send_error(403, "Host not in PACKAGE_PROXY_ALLOWED_HOSTS")
+                return
+            self._serve(url, cacheable=bool(CACHEABLE.search(urlsplit(url).path)))
+        elif path.startswith("/pypi/simple/"):
+            self._serve(
+                PYPI_UPSTREAM + path[len("/pypi"):],
+                rewrite={PYPI_FILES_UPSTREAM + "/": f"{self._local_base()}/pypi/files/"},
+                accept="text/html",
+            )
+        elif path.startswith("/pypi/files/"):
+            self._serve(PYPI_FILES_UPSTREAM + path[len("/pypi/files"):], cacheable=True)
+        elif path.startswith("/npm/"):
+            url = NPM_UPSTREAM + path[len("/npm"):]
+            if "/-/" in path and CACHEABLE.search(urlsplit(url).path):
+                self._serve(url, cacheable=True)
+            else:
+                self._serve(
+                    url,
+                    rewrite={NPM_UPSTREAM + "/": f"{self._local_base()}/npm/"},
+                    accept=self.headers.get("Accept"),
+                )
+        else:
+            self.send_error(404)
+
+    def _send_file(self, path: Path):
+        """Send a cached file."""
+        size = path.stat().st_size
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                self.wfile.write(chunk)
+
+    def _serve(
+        self,
+        url: str,
+        cacheable: bool = False,
+        rewrite: Optional[Dict[str, str]] = None,
+        accept: Optional[str] = None,
+    ):
+        """Answer from the cache or fetch from upstream (caching archives)."""
+        start = time.time()
+        cache = self.proxy.cache
+        key = cache.key(url)
+
+        if cacheable:
+            cached = cache.get(key)
+            if cached is not None:
+                self._send_file(cached)
+                get_metrics().observe("package_proxy", "hit", time.time() - start)
+                return
+
+        request = urllib.request.Request(url, headers={"User-Agent": self.headers.get("User-Agent", "")})
+        if accept:
+            request.add_header("Accept", accept)
+        try:
+            upstream = urllib.request.urlopen(request, timeout=60)
+        except urllib.error.HTTPError as e:
+            self.send_error(e.code, e.reason)
+            return
+        except (urllib.error.URLError, OSError) as e:
+            self.send_error(502, str(e))
+            return
+
+        with upstream:
+            if rewrite:
+                body = upstream.read()
+                for old, new in rewrite.items():
+                    body = body.replace(old.encode(), new.encode())
+                self.send_response(200)
+                self.send_header("Content-Type", upstream.headers.get("Content-Type", "text/html"))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                get_metrics().observe("package_proxy", "passthrough", time.time() - start)
+                return
+
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                upstream.headers.get("Content-Type", "application/octet-stream"),
+            )
+            length = upstream.headers.get("Content-Length")
+            if length:
+                self.send_header("Content-Length", length)
+            else:
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            self.end_headers()
+
+            tmp = cache.temp_file() if cacheable else None
+            try:
+                for chunk in iter(lambda: upstream.read(_CHUNK_SIZE), b""):
+                    if tmp:
+                        tmp.write(chunk)
+                    self.wfile.write(chunk)
+                if tmp:
+                    tmp.close()
+                    cache.commit(key, Path(tmp.name))
+                    tmp = None
+            finally:
+                if tmp:
+                    tmp.close()
+                    Path(tmp.name).unlink(missing_ok=True)
+
+        get_metrics().observe(
+            "package_proxy", "miss" if cacheable else "passthrough", time.time() - start
+        )
+
+
+class _ProxyServer(ThreadingHTTPServer):
+    """HTTP server refusing connections from outside the allowed networks."""
+
+    daemon_threads = True
+    package_proxy: "PackageProxy"
+
+    def verify_request(self, request, client_address) -> bool:
+        if self.package_proxy.client_allowed(client_address[0]):
+            return True
+        logger.warning(f"Package proxy refused connection from {client_address[0]}")
+        return False
+
+
+class PackageProxy:
+    """
+    Pull-through mirror for PyPI and npm plus a caching plain-HTTP proxy.
+
+    Task containers get HTTP_PROXY (used by apt and other plain-HTTP
+    clients) and per-ecosystem index URLs pointing at this server. Package
+    archives fetched by one task are stored in a size-bounded LRU cache
+    and served locally to later tasks; indexes and metadata always come
+    from upstream, so new releases are seen immediately. HTTPS traffic that
+    does not go through the mirror routes is not proxied.
+
+    The server listens on the Docker bridge gateway, accepts clients on the
+    bridge subnet and loopback only, and forwards plain-HTTP requests only
+    to PACKAGE_PROXY_ALLOWED_HOSTS.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize proxy.
+
+        Args:
+            docker_manager: Docker manager whose bridge network the proxy serves.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.cache = LRUDiskCache(
+            self.config.package_proxy_cache_dir,
+            self.config.package_proxy_cache_mb * 1024 * 1024,
+        )
+        self._server: Optional[_ProxyServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client_networks: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the proxy is configured."""
+        return self.config.package_proxy
+
+    @property
+    def running(self) -> bool:
+        """Whether the proxy is serving."""
+        return self._server is not None
+
+    def _bridge_network(self) -> Optional[Dict[str, str]]:
+        """Get the subnet and gateway of the local Docker bridge network."""
+        try:
+            network = self.docker.client.networks.get("bridge")
+        except DockerException as e:
+            logger.error(f"Cannot inspect the Docker bridge network: {e}")
+            return None
+        for entry in (network.attrs.get("IPAM") or {}).get("Config") or []:
+            if entry.get("Subnet") and entry.get("Gateway"):
+                return entry
+        logger.error("Docker bridge network has no IPv4 subnet and gateway")
+        return None
+
+    def client_allowed(self, address: str) -> bool:
+        """Check whether a client address is on the bridge subnet or loopback."""
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        if ip.is_loopback:
+            return True
+        return any(ip in network for network in self._client_networks)
+
+    def forward_allowed(self, host: str) -> bool:
+        """Check whether plain-HTTP requests may be forwarded to a host."""
+        host = host.lower().rstrip(".")
+        return any(
+            host == allowed or host.endswith(f".{allowed}")
+            for allowed in self.config.package_proxy_allowed_hosts
+        )
+
+    def start(self):
+        """Start serving in a background thread."""
+        if not self.enabled or self.running:
+            return
+
+        if self.config.dry_run:
+            logger.info(
+                f"[DRY-RUN] Would start package proxy on "
+                f"{self.config.package_proxy_bind or 'the Docker bridge gateway'}:"
+                f"{self.config.package_proxy_port}"
+            )
+            return
+
+        bridge = self._bridge_network()
+        if bridge is None:
+            # Tasks then download directly rather than through an open proxy
+            logger.error("Package proxy not started")
+            return
+        self._client_networks = [ipaddress.ip_network(bridge["Subnet"], strict=False)]
+        bind = self.config.package_proxy_bind or bridge["Gateway"]
+
+        self.cache.load()
+        server = _ProxyServer((bind, self.config.package_proxy_port), _ProxyHandler)
+        server.package_proxy = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+        self._thread.start()
+
+        stats = self.cache.stats()
+        logger.info(
+            f"Package proxy listening on {bind}:{self.config.package_proxy_port} "
+            f"for {bridge['Subnet']} "
+            f"({stats['entries']} cached files, {stats['bytes'] // (1024 * 1024)} MB)"
+        )
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def environment(self) -> Dict[str, str]:
+        """
+        Build the container environment pointing package tools at the proxy.
+
+        Returns:
+            Environment variables (empty if the proxy is not running).
+        """
+        if not self.running:
+            return {}
+
+        base = f"http://{PROXY_HOSTNAME}:{self.config.package_proxy_port}"
+        return {
+            "HTTP_PROXY": base,
+            "http_proxy": base,
+            "NO_PROXY": "localhost,127.0.0.1",
+            "no_proxy": "localhost,127.0.0.1",
+            "PIP_INDEX_URL": f"{base}/pypi/simple/",
+            "PIP_TRUSTED_HOST": PROXY_HOSTNAME,
+            "UV_INDEX_URL": f"{base}/pypi/simple/",
+            "UV_INSECURE_HOST": PROXY_HOSTNAME,
+            "npm_config_registry": f"{base}/npm/",
+        }
+
+    def extra_hosts(self) -> Dict[str, str]:
+        """
+        Get the host mapping containers need to reach the proxy.
+
+        Returns:
+            Mapping for the extra_hosts container option.
+        """
+        if not self.running:
+            return {}
+        return {PROXY_HOSTNAME: "host-gateway"}
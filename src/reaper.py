@@ -0,0 +1,324 @@
+"""Background reaper for orphaned worktrees, stale branches and disk usage."""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import get_config
+from .docker_manager import DockerManager
+from .repo_manager import run_git_command
+from .task_queue import TaskQueue
+
+logger = logging.getLogger(__name__)
+
+ISSUE_DIR_PATTERN = re.compile(r"^issue-(\d+)$")
+
+
+def directory_size(path: Path) -> int:
+    """
+    Compute the on-disk size of a directory tree without following symlinks.
+
+    Args:
+        path: Directory to measure.
+
+    Returns:
+        Total size in bytes.
+    """
+    total = 0
+    for root, dirs, files in os.walk(path, followlinks=False):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class WorkspaceReaper:
+    """Removes orphaned worktrees and branches and enforces the disk quota."""
+
+    def __init__(self, docker_manager: DockerManager, task_queue: TaskQueue):
+        """
+        Initialize the reaper.
+
+        Args:
+            docker_manager: Docker manager owning the worktrees.
+            task_queue: Task queue used to determine live tasks.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.task_queue = task_queue
+        self.last_result: Optional[dict] = None
+
+    def _live_issues(self) -> Set[int]:
+        """Get issue numbers that are running, starting or queued."""
+        live = {task.issue_number for task in self.task_queue.get_running_tasks()}
+        live.update(self.task_queue.get_starting_issues())
+        live.update(task.issue_number for task in self.task_queue.get_queued_tasks())
+        return live
+
+    def _issue_worktrees(self) -> Dict[int, Path]:
+        """Get issue worktree directories under the worktree base."""
+        worktrees = {}
+        if not self.config.worktree_base.exists():
+            return worktrees
+
+        for entry in self.config.worktree_base.iterdir():
+            match = ISSUE_DIR_PATTERN.match(entry.name)
+            if match and entry.is_dir():
+                worktrees[int(match.group(1))] = entry
+        return worktrees
+
+    def _find_orphans(self, live: Set[int]) -> List[Tuple[float, int, Path]]:
+        """
+        Find worktrees with no live task, oldest first.
+
+        Args:
+            live: Issue numbers with a live task.
+
+        Returns:
+            List of (mtime, issue_number, path) tuples.
+        """
+        orphans = []
+        for issue_number, path in self._issue_worktrees().items():
+            if issue_number in live:
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            orphans.append((mtime, issue_number, path))
+        orphans.sort()
+        return orphans
+
+    def _remove_orphan(self, issue_number: int, path: Path, mtime: float) -> bool:
+        """
+        Remove an orphaned worktree, falling back to deleting the directory.
+
+        Args:
+            issue_number: Issue number of the worktree.
+            path: Worktree directory.
+            mtime: Modification time observed when the orphan was found.
+
+        Returns:
+            True if the worktree was removed.
+        """
+        with self.docker.worktree_lock:
+            # Skip worktrees that were claimed or recreated since the scan
+            if issue_number in self._live_issues():
+                return False
+            try:
+                if path.stat().st_mtime != mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+
+            logger.info(f"Reaping orphaned worktree for issue #{issue_number}: {path}")
+            self.docker.remove_worktree(issue_number)
+            if path.exists():
+                shutil.rmtree(path, ignore_errors=True)
+        return True
+
+    def _reap_expired_worktrees(self, orphans: List[Tuple[float, int, Path]]) -> List[int]:
+        """
+        Remove orphaned worktrees older than the retention period.
+
+        Args:
+            orphans: Orphaned worktrees, oldest first.
+
+        Returns:
+            Issue numbers whose worktrees were removed.
+        """
+        cutoff = time.time() - self.config.worktree_retention_hours * 3600
+        removed = []
+        for mtime, issue_number, path in orphans:
+            if mtime > cutoff:
+                break
+            if self._remove_orphan(issue_number, path, mtime):
+                removed.append(issue_number)
+        return removed
+
+    def _stale_caches(self, repo_path: Optional[Path]) -> List[Tuple[float, Path]]:
+        """Get repository cache entries other than the active clone, oldest first."""
+        entries = []
+        if not self.config.repo_url or not self.config.repo_cache.exists():
+            return entries
+
+        for entry in self.config.repo_cache.iterdir():
+            if not entry.is_dir():
+                continue
+            if repo_path and entry.resolve() == repo_path.resolve():
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                continue
+        entries.sort()
+        return entries
+
+    def _enforce_quota(
+        self,
+        orphans: List[Tuple[float, int, Path]],
+        repo_path: Optional[Path],
+    ) -> Tuple[int, List[str]]:
+        """
+        Evict the oldest orphaned worktrees and stale caches until under quota.
+
+        Args:
+            orphans: Remaining orphaned worktrees, oldest first.
+            repo_path: Active repository clone (never evicted).
+
+        Returns:
+            Tuple of (bytes used after eviction, evicted paths).
+        """
+        quota = self.config.disk_quota_mb * 1024 * 1024
+        roots = [self.config.worktree_base]
+        if self.config.repo_url:
+            roots.append(self.config.repo_cache)
+
+        used = sum(directory_size(root) for root in roots if root.exists())
+        if quota <= 0 or used <= quota:
+            return used, []
+
+        logger.warning(
+            f"Workspace disk usage {used // (1024 * 1024)} MB exceeds quota "
+            f"{self.config.disk_quota_mb} MB, evicting oldest entries"
+        )
+
+        candidates = [(mtime, path, issue) for mtime, issue, path in orphans]
+        candidates.extend((mtime, path, None) for mtime, path in self._stale_caches(repo_path))
+        candidates.sort(key=lambda item: item[0])
+
+        evicted = []
+        for mtime, path, issue_number in candidates:
+            if used <= quota:
+                break
+            size = directory_size(path)
+            if issue_number is not None:
+                if not self._remove_orphan(issue_number, path, mtime):
+                    continue
+            else:
+                logger.info(f"Evicting stale repository cache: {path}")
+                shutil.rmtree(path, ignore_errors=True)
+            used -= size
+            evicted.append(str(path))
+
+        if used > quota:
+            logger.warning(
+                f"Workspace disk usage still {used // (1024 * 1024)} MB after eviction; "
+                f"remaining data belongs to live tasks or the active clone"
+            )
+        return used, evicted
+
+    def _prune_branches(self, repo_path: Path, live: Set[int]) -> List[str]:
+        """
+        Delete local issue branches that have no worktree and no live task.
+
+        When resuming branches is enabled, only branches whose commits are
+        already on origin are deleted.
+
+        Args:
+            repo_path: Path to the repository.
+            live: Issue numbers with a live task.
+
+        Returns:
+            Deleted branch names.
+        """
+        try:
+            run_git_command(["git", "worktree", "prune"], cwd=repo_path, show_output=False)
+            result = run_git_command(
+                ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/issue-*"],
+                cwd=repo_path,
+                show_output=False,
+            )
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Failed to list issue branches: {e.stderr}")
+            return []
+
+        worktrees = self._issue_worktrees()
+        deleted = []
+        for branch in result.stdout.split():
+            match = ISSUE_DIR_PATTERN.match(branch)
+            if not match:
+                continue
+            issue_number = int(match.group(1))
+            if issue_number in live or issue_number in worktrees:
+                continue
+            if self.config.resume_branches and not self._is_pushed(repo_path, branch):
+                # Keep unpushed work so a later run can resume it
+                continue
+            try:
+                with self.docker.worktree_lock:
+                    run_git_command(
+                        ["git", "branch", "-D", branch],
+                        cwd=repo_path,
+                        show_output=False,
+                    )
+                deleted.append(branch)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Failed to delete branch {branch}: {e.stderr}")
+
+        if deleted:
+            logger.info(f"Pruned {len(deleted)} stale issue branches")
+        return deleted
+
+    def _is_pushed(self, repo_path: Path, branch: str) -> bool:
+        """Check whether a local branch is fully contained in its origin counterpart."""
+        try:
+            run_git_command(
+                ["git", "merge-base", "--is-ancestor", branch, f"refs/remotes/origin/{branch}"],
+                cwd=repo_path,
+                show_output=False,
+            )
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _gc(self, repo_path: Path):
+        """Run opportunistic garbage collection on the repository."""
+        try:
+            run_git_command(["git", "gc", "--auto", "--quiet"], cwd=repo_path, show_output=False)
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"git gc --auto failed: {e.stderr}")
+
+    def reap(self) -> dict:
+        """
+        Run one reaper pass.
+
+        Returns:
+            Summary of the actions taken.
+        """
+        if self.config.dry_run:
+            logger.info("[DRY-RUN] Would reap orphaned worktrees and stale branches")
+            return {}
+
+        live = self._live_issues()
+        orphans = self._find_orphans(live)
+        removed = self._reap_expired_worktrees(orphans)
+        remaining = [orphan for orphan in orphans if orphan[1] not in removed]
+
+        repo_path = self.docker.repo_manager.repo_path
+        used, evicted = self._enforce_quota(remaining, repo_path)
+
+        deleted_branches = []
+        if repo_path and repo_path.exists():
+            deleted_branches = self._prune_branches(repo_path, self._live_issues())
+            self._gc(repo_path)
+
+        self.last_result = {
+            "finished_at": time.time(),
+            "removed_worktrees": removed,
+            "evicted": evicted,
+            "deleted_branches": deleted_branches,
+            "disk_used_mb": used // (1024 * 1024),
+        }
+        logger.info(
+            f"Reaper pass complete: {len(removed)} worktrees removed, "
+            f"{len(evicted)} entries evicted, {len(deleted_branches)} branches pruned"
+        )
+        return self.last_result
@@ -1,14 +1,50 @@
 """Repository management for cloning and updating from GitHub."""
 
+import asyncio
 import logging
 import subprocess
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional, List
 
 from .config import get_config
+from .metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
+# Subcommands whose first argument is itself a subcommand worth tracking separately
+_NESTED_GIT_SUBCOMMANDS = {"worktree", "remote", "submodule", "stash"}
+
+
+def _git_subcommand(args: List[str]) -> str:
+    """
+    Derive the metric name for a git invocation.
+
+    Args:
+        args: Command arguments (e.g., ["git", "worktree", "add", "..."])
+
+    Returns:
+        Subcommand name (e.g., "worktree add")
+    """
+    rest = args[1:] if args and args[0] == "git" else list(args)
+    words = [arg for arg in rest if not arg.startswith("-")]
+    if not words:
+        return "unknown"
+    if words[0] in _NESTED_GIT_SUBCOMMANDS and len(words) > 1:
+        return f"{words[0]} {words[1]}"
+    return words[0]
+
+
+def _record_git_timing(subcommand: str, elapsed: float, cwd: Optional[Path]):
+    """Record a git command's duration and warn if it exceeded GIT_SLOW_THRESHOLD."""
+    get_metrics().observe("git", subcommand, elapsed)
+    threshold = get_config().git_slow_threshold
+    if threshold > 0 and elapsed >= threshold:
+        logger.warning(
+            f"Slow git command: 'git {subcommand}' took {elapsed:.2f}s "
+            f"(threshold {threshold:.2f}s, cwd={cwd})"
+        )
+
 
 def run_git_command(
     args: List[str],
@@ -18,6 +54,9 @@ def run_git_command(
     """
     Run a git command with real-time output to stdout.
 
+    The duration of every call is recorded in the "git" metrics family under
+    its subcommand, and calls slower than GIT_SLOW_THRESHOLD are logged.
+
     Args:
         args: Command arguments (e.g., ["git", "clone", "..."])
         cwd: Working directory for the command
@@ -32,6 +71,67 @@ def run_git_command(
     cmd_str = " ".join(args)
     logger.info(f"Running: {cmd_str}")
 
+    subcommand = _git_subcommand(args)
+    started = time.monotonic()
+    try:
+        return _execute_git_command(args, cwd, show_output)
+    finally:
+        _record_git_timing(subcommand, time.monotonic() - started, cwd)
+
+
+async def run_git_command_async(
+    args: List[str],
+    cwd: Optional[Path] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a git command as an asyncio subprocess, capturing its output.
+
+    Recorded in the "git" metrics family like run_git_command.
+
+    Args:
+        args: Command arguments (e.g., ["git", "fetch", "origin"])
+        cwd: Working directory for the command
+
+    Returns:
+        CompletedProcess result
+
+    Raises:
+        subprocess.CalledProcessError: If command fails
+    """
+    logger.info(f"Running: {' '.join(args)}")
+
+    subcommand = _git_subcommand(args)
+    started = time.monotonic()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # Do not leave git running when the caller is cancelled
+            process.kill()
+            await process.wait()
+            raise
+        stdout, stderr = stdout.decode(errors="replace"), stderr.decode(errors="replace")
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, args, output=stdout, stderr=stderr
+            )
+        return subprocess.CompletedProcess(args, process.returncode, stdout=stdout, stderr=stderr)
+    finally:
+        _record_git_timing(subcommand, time.monotonic() - started, cwd)
+
+
+def _execute_git_command(
+    args: List[str],
+    cwd: Optional[Path],
+    show_output: bool,
+) -> subprocess.CompletedProcess:
+    """Run a git command without instrumentation (see run_git_command)."""
     if show_output:
         # Run with real-time output to stdout/stderr
         process = subprocess.Popen(
@@ -83,6 +183,24 @@ class RepositoryManager:
         """Initialize repository manager."""
         self.config = get_config()
         self.repo_path: Optional[Path] = None
+        self._sync_listeners: List[Callable[[Path], None]] = []
+
+    def add_sync_listener(self, callback: Callable[[Path], None]):
+        """
+        Register a callback invoked after each successful repository update.
+
+        Args:
+            callback: Called with the repository path.
+        """
+        self._sync_listeners.append(callback)
+
+    def _notify_sync(self, repo_path: Path):
+        """Invoke sync listeners, logging rather than propagating their errors."""
+        for callback in self._sync_listeners:
+            try:
+                callback(repo_path)
+            except Exception as e:
+                logger.error(f"Repository sync listener failed: {e}")
 
     def ensure_repository(self) -> Path:
         """
@@ -188,6 +306,7 @@ class RepositoryManager:
             )
 
             logger.info(f"Updated repository to latest {default_branch}")
+            self._notify_sync(repo_path)
 
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to update repository: {e.output}")
@@ -205,12 +324,10 @@ class RepositoryManager:
         """
         try:
             # Get symbolic ref for HEAD on remote
-            result = subprocess.run(
+            result = run_git_command(
                 ["git", "symbolic-ref", "refs/remotes/origin/HEAD"],
                 cwd=repo_path,
-                check=True,
-                capture_output=True,
-                text=True,
+                show_output=False,
             )
 
             # Parse branch name from refs/remotes/origin/main
@@ -222,12 +339,10 @@ class RepositoryManager:
             # Fallback: try common branch names
             for branch in ["main", "master"]:
                 try:
-                    subprocess.run(
+                    run_git_command(
                         ["git", "rev-parse", f"origin/{branch}"],
                         cwd=repo_path,
-                        check=True,
-                        capture_output=True,
-                        text=True,
+                        show_output=False,
                     )
                     logger.info(f"Using fallback branch: {branch}")
                     return branch
@@ -339,6 +454,21 @@ class RepositoryManager:
         logger.info("Pulling latest changes from default branch...")
         self._update_repository(self.repo_path)
 
+    async def fetch_async(self):
+        """
+        Fetch from origin without blocking the event loop.
+
+        Used by the asyncio orchestration ahead of worktree creation, so the
+        pull that follows only has to fast-forward. A failed fetch (e.g., an
+        expired token in the remote URL) is left to that pull to retry.
+        """
+        if self.config.dry_run or not self.repo_path:
+            return
+        try:
+            await run_git_command_async(["git", "fetch", "origin", "--quiet"], cwd=self.repo_path)
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Background fetch failed: {(e.stderr or '').strip()}")
+
     def get_repo_path(self) -> Path:
         """
         Get the repository path, ensuring it exists.
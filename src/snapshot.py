@@ -0,0 +1,402 @@
+"""Per-commit dependency snapshots cloned into task worktrees."""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .config import get_config
+from .repo_manager import run_git_command
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+
+class FailureBackoff:
+    """
+    Remembers failed builds and when each may be retried.
+
+    The delay doubles with every consecutive failure of the same key, so a
+    transient Docker or network error is retried soon while a setup that
+    keeps failing is not rerun for every task.
+    """
+
+    def __init__(self, initial: float = 60.0, maximum: float = 3600.0):
+        """
+        Initialize backoff.
+
+        Args:
+            initial: Seconds before the first retry.
+            maximum: Upper bound of the delay.
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self._failures: Dict[str, Tuple[int, float]] = {}  # key -> (failures, retry at)
+        self._lock = threading.Lock()
+
+    def failed(self, key: str) -> float:
+        """
+        Record a failure.
+
+        Returns:
+            Seconds until the key may be retried.
+        """
+        with self._lock:
+            count = self._failures.get(key, (0, 0.0))[0] + 1
+            delay = min(self.initial * 2 ** (count - 1), self.maximum)
+            self._failures[key] = (count, time.time() + delay)
+            return delay
+
+    def succeeded(self, key: str):
+        """Forget the failures of a key."""
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def waiting(self, key: str) -> bool:
+        """Check whether a failed key is still waiting for its retry."""
+        with self._lock:
+            entry = self._failures.get(key)
+            return entry is not None and time.time() < entry[1]
+
+
+class DependencySnapshots:
+    """
+    Builds dependency snapshots and clones their artifacts into worktrees.
+
+    A snapshot is a detached worktree of a default-branch commit in which
+    SNAPSHOT_SETUP_COMMAND has been run inside the task image. The files it
+    produced that git ignores (node_modules, .venv, build output, ...) are
+    cloned into each new task worktree using reflinks where the filesystem
+    supports them, falling back to plain copies.
+
+    Snapshots are built in the background; a worktree created before the
+    snapshot of its commit is ready goes without it. Snapshots being cloned
+    into a worktree are not evicted until the clone has finished.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize snapshot manager.
+
+        Args:
+            docker_manager: Docker manager used to run the setup command.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self._lock = threading.Lock()
+        self._failed = FailureBackoff()
+        self._building: Set[str] = set()  # Commits with a background build running
+        self._building_lock = threading.Lock()
+        self._readers: Dict[str, int] = {}  # commit -> applies in progress
+        self._readers_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a setup command is configured."""
+        return bool(self.config.snapshot_setup_command)
+
+    def _snapshot_path(self, commit: str) -> Path:
+        """Get the snapshot tree path for a commit."""
+        return self.config.snapshot_dir / commit
+
+    def _manifest_path(self, commit: str) -> Path:
+        """Get the manifest path for a commit."""
+        return self.config.snapshot_dir / f"{commit}.json"
+
+    def _read_manifest(self, commit: str) -> Optional[List[str]]:
+        """Get the artifact list of a finished snapshot, or None if missing."""
+        manifest = self._manifest_path(commit)
+        if not manifest.exists():
+            return None
+        try:
+            return json.loads(manifest.read_text())["artifacts"]
+        except (json.JSONDecodeError, KeyError, IOError):
+            return None
+
+    def _list_ignored(self, tree: Path) -> List[str]:
+        """
+        List top-level ignored paths produced in a snapshot tree.
+
+        Args:
+            tree: Snapshot worktree.
+
+        Returns:
+            Relative paths, with whole untracked directories collapsed.
+        """
+        result = run_git_command(
+            ["git", "ls-files", "--others", "--ignored", "--exclude-standard", "--directory"],
+            cwd=tree,
+            show_output=False,
+        )
+        return [line.rstrip("/") for line in result.stdout.splitlines() if line.strip()]
+
+    def ensure_snapshot(self, repo_path: Path, commit: Optional[str] = None) -> Optional[str]:
+        """
+        Build the snapshot for a commit unless it already exists.
+
+        Args:
+            repo_path: Path to the repository.
+            commit: Commit to snapshot (defaults to the repository HEAD).
+
+        Returns:
+            Snapshot commit SHA, or None if no usable snapshot exists.
+        """
+        if not self.enabled:
+            return None
+
+        if self.config.dry_run:
+            logger.info(
+                f"[DRY-RUN] Would build dependency snapshot with: "
+                f"{self.config.snapshot_setup_command}"
+            )
+            return None
+
+        if commit is None:
+            commit = run_git_command(
+                ["git", "rev-parse", "HEAD"],
+                cwd=repo_path,
+                show_output=False,
+            ).stdout.strip()
+
+        with self._lock:
+            if self._read_manifest(commit) is not None:
+                return commit
+            if self._failed.waiting(commit):
+                return None
+
+            try:
+                self._build(repo_path, commit)
+            except Exception as e:
+                delay = self._failed.failed(commit)
+                logger.error(
+                    f"Failed to build dependency snapshot for {commit[:12]}, "
+                    f"retrying in {delay:.0f}s: {e}"
+                )
+                self._discard(repo_path, commit)
+                return None
+
+            self._failed.succeeded(commit)
+            self._evict(repo_path, keep=commit)
+            return commit
+
+    def snapshot_for(self, repo_path: Path) -> Optional[str]:
+        """
+        Get the snapshot of the repository HEAD if it is already built.
+
+        A missing snapshot is built in the background instead of making the
+        caller wait for the setup command.
+
+        Args:
+            repo_path: Path to the repository.
+
+        Returns:
+            Snapshot commit SHA, or None if the snapshot is not ready.
+        """
+        if not self.enabled:
+            return None
+        if self.config.dry_run:
+            return self.ensure_snapshot(repo_path)
+
+        commit = run_git_command(
+            ["git", "rev-parse", "HEAD"],
+            cwd=repo_path,
+            show_output=False,
+        ).stdout.strip()
+        if self._read_manifest(commit) is not None:
+            return commit
+
+        self.build_in_background(repo_path, commit)
+        return None
+
+    def build_in_background(self, repo_path: Path, commit: str):
+        """
+        Start building a commit's snapshot on its own thread.
+
+        Args:
+            repo_path: Path to the repository.
+            commit: Commit to snapshot.
+        """
+        with self._building_lock:
+            if commit in self._building or self._failed.waiting(commit):
+                return
+            self._building.add(commit)
+
+        def build():
+            try:
+                self.ensure_snapshot(repo_path, commit)
+            except Exception as e:
+                logger.error(f"Failed to build dependency snapshot for {commit[:12]}: {e}")
+            finally:
+                with self._building_lock:
+                    self._building.discard(commit)
+
+        logger.info(f"Dependency snapshot for {commit[:12]} not ready, building in the background")
+        threading.Thread(target=build, daemon=True).start()
+
+    def _build(self, repo_path: Path, commit: str):
+        """Create the snapshot tree, run the setup command and write the manifest."""
+        tree = self._snapshot_path(commit)
+        self.config.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self._discard(repo_path, commit)
+
+        logger.info(f"Building dependency snapshot for {commit[:12]}")
+        # The cache repository's worktree list is shared with task worktrees
+        with self.docker.worktree_lock:
+            run_git_command(
+                ["git", "worktree", "add", "--detach", str(tree), commit],
+                cwd=repo_path,
+                show_output=False,
+            )
+
+        exit_code = self.docker.run_setup_command(tree, self.config.snapshot_setup_command)
+        if exit_code != 0:
+            raise RuntimeError(f"Setup command exited with code {exit_code}")
+
+        artifacts = self._list_ignored(tree)
+        self._manifest_path(commit).write_text(
+            json.dumps({"commit": commit, "artifacts": artifacts}, indent=2)
+        )
+        logger.info(f"Dependency snapshot {commit[:12]} ready ({len(artifacts)} artifacts)")
+
+    def _discard(self, repo_path: Path, commit: str):
+        """Remove a snapshot tree and its manifest."""
+        tree = self._snapshot_path(commit)
+        self._manifest_path(commit).unlink(missing_ok=True)
+        if tree.exists():
+            with self.docker.worktree_lock:
+                try:
+                    run_git_command(
+                        ["git", "worktree", "remove", "--force", str(tree)],
+                        cwd=repo_path,
+                        show_output=False,
+                    )
+                except subprocess.CalledProcessError:
+                    pass
+            shutil.rmtree(tree, ignore_errors=True)
+
+    def _evict(self, repo_path: Path, keep: str):
+        """Remove the oldest snapshots beyond SNAPSHOT_KEEP."""
+        manifests = sorted(
+            self.config.snapshot_dir.glob("*.json"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for manifest in manifests[max(self.config.snapshot_keep, 1):]:
+            commit = manifest.stem
+            if commit == keep:
+                continue
+            with self._readers_lock:
+                if self._readers.get(commit):
+                    # Still being cloned into a worktree; evicted next time
+                    continue
+                # Without its manifest the snapshot is no longer applied
+                manifest.unlink(missing_ok=True)
+            logger.info(f"Evicting dependency snapshot {commit[:12]}")
+            self._discard(repo_path, commit)
+
+    def apply(self, commit: str, worktree_path: Path) -> int:
+        """
+        Clone a snapshot's ignored artifacts into a task worktree.
+
+        Args:
+            commit: Snapshot commit SHA.
+            worktree_path: Task worktree.
+
+        Returns:
+            Number of artifacts cloned.
+        """
+        with self._readers_lock:
+            self._readers[commit] = self._readers.get(commit, 0) + 1
+        try:
+            return self._apply(commit, worktree_path)
+        finally:
+            with self._readers_lock:
+                self._readers[commit] -= 1
+                if not self._readers[commit]:
+                    del self._readers[commit]
+
+    def _apply(self, commit: str, worktree_path: Path) -> int:
+        """Clone a snapshot's artifacts; the caller holds a reader reference."""
+        artifacts = self._read_manifest(commit)
+        if not artifacts:
+            return 0
+
+        tree = self._snapshot_path(commit)
+        cloned = 0
+        for relative in artifacts:
+            source = tree / relative
+            target = worktree_path / relative
+            if not os.path.lexists(source) or os.path.lexists(target):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                self._clone_path(source, target)
+                cloned += 1
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"Failed to clone snapshot artifact {relative}: {e}")
+
+        logger.info(f"Cloned {cloned} snapshot artifacts into {worktree_path}")
+        return cloned
+
+    def _clone_path(self, source: Path, target: Path):
+        """
+        Clone a file or directory according to SNAPSHOT_LINK_MODE.
+
+        "auto" reflinks where the filesystem supports it and copies
+        otherwise. Hardlinked files share their inode with the snapshot, so
+        tools that rewrite files in place would modify the snapshot as well;
+        hardlinks are only used when "hardlink" is set explicitly, and fall
+        back to copies across filesystems.
+        """
+        mode = self.config.snapshot_link_mode
+
+        if mode in ("auto", "reflink"):
+            try:
+                subprocess.run(
+                    ["cp", "-a", "--reflink=always", str(source), str(target)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                return
+            except (OSError, subprocess.CalledProcessError):
+                if mode == "reflink":
+                    raise
+                # Clean up a partial copy before falling back
+                self._remove_partial(target)
+
+        if mode == "hardlink":
+            try:
+                self._copy_tree(source, target, os.link)
+                return
+            except OSError as e:
+                # E.g. the worktree is on another filesystem than the snapshot
+                logger.debug(f"Hardlinking {source} failed, copying instead: {e}")
+                self._remove_partial(target)
+
+        self._copy_tree(source, target, shutil.copy2)
+
+    @staticmethod
+    def _copy_tree(source: Path, target: Path, copy_function):
+        """Copy a file, symlink or directory with the given file copy function."""
+        if source.is_dir() and not source.is_symlink():
+            shutil.copytree(source, target, symlinks=True, copy_function=copy_function)
+        elif source.is_symlink():
+            os.symlink(os.readlink(source), target)
+        else:
+            copy_function(source, target)
+
+    @staticmethod
+    def _remove_partial(target: Path):
+        """Remove whatever a failed clone left at the target."""
+        if target.is_dir() and not target.is_symlink():
+            shutil.rmtree(target, ignore_errors=True)
+        elif os.path.lexists(target):
+            target.unlink()
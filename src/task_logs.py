@@ -0,0 +1,488 @@
+"""Persistent, rotating capture of task container output."""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .config import Config, get_config, get_runtime_config
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+DONE_MARKER = "done"
+# Segments are written as segment-N.log and gzipped to segment-N.log.gz once full
+SEGMENT_PATTERN = re.compile(r"^segment-(\d+)\.log(\.gz)?$")
+
+_BLOCK_SIZE = 64 * 1024
+
+
+def _plain_segment(run_dir: Path, number: int) -> Path:
+    """Get the path of an uncompressed (active) segment."""
+    return run_dir / f"segment-{number:05d}.log"
+
+
+def _compressed_segment(run_dir: Path, number: int) -> Path:
+    """Get the path of a compressed segment."""
+    return run_dir / f"segment-{number:05d}.log.gz"
+
+
+def segment_numbers(run_dir: Path) -> List[int]:
+    """
+    List the sequence numbers of a run's segments, oldest first.
+
+    Args:
+        run_dir: Log directory of a run.
+
+    Returns:
+        Sorted segment numbers, compressed or active.
+    """
+    if not run_dir.exists():
+        return []
+    numbers = set()
+    for path in run_dir.iterdir():
+        match = SEGMENT_PATTERN.match(path.name)
+        if match:
+            numbers.add(int(match.group(1)))
+    return sorted(numbers)
+
+
+def list_segments(run_dir: Path) -> List[Path]:
+    """
+    List the compressed segments of a run, oldest first.
+
+    Args:
+        run_dir: Log directory of a run.
+
+    Returns:
+        Segment paths ordered by sequence number.
+    """
+    return [
+        _compressed_segment(run_dir, number)
+        for number in segment_numbers(run_dir)
+        if _compressed_segment(run_dir, number).exists()
+    ]
+
+
+def _active_segment(run_dir: Path) -> Optional[Path]:
+    """Get the segment currently being written, if any."""
+    for number in reversed(segment_numbers(run_dir)):
+        path = _plain_segment(run_dir, number)
+        if path.exists():
+            return path
+    return None
+
+
+class RotatingLogWriter:
+    """
+    Appends to a run's active segment, compressing it once it is full.
+
+    Only the active segment is plain text; full segments are gzipped and
+    the oldest are dropped beyond max_segments, which caps a run's size.
+    """
+
+    def __init__(self, run_dir: Path, segment_bytes: int, max_segments: int):
+        """
+        Initialize writer.
+
+        Args:
+            run_dir: Log directory of the run.
+            segment_bytes: Size at which the active segment is rotated.
+            max_segments: Compressed segments to keep.
+        """
+        self.run_dir = run_dir
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        (self.run_dir / DONE_MARKER).unlink(missing_ok=True)
+
+        # A leftover active segment (daemon restart) is compressed first
+        numbers = segment_numbers(run_dir)
+        self._number = numbers[-1] if numbers else 1
+        if (
+            _compressed_segment(run_dir, self._number).exists()
+            and not _plain_segment(run_dir, self._number).exists()
+        ):
+            self._number += 1
+        self._compress_active()
+        self._file = open(_plain_segment(self.run_dir, self._number), "ab")
+
+    def write(self, data: bytes):
+        """Append data, rotating the active segment when it is full."""
+        self._file.write(data)
+        self._file.flush()
+        if self._file.tell() >= self.segment_bytes:
+            self._file.close()
+            self._compress_active()
+            self._file = open(_plain_segment(self.run_dir, self._number), "ab")
+
+    def close(self):
+        """Compress the last segment and mark the run finished."""
+        self._file.close()
+        self._compress_active()
+        (self.run_dir / DONE_MARKER).touch()
+
+    def _compress_active(self):
+        """Turn the active segment into a compressed one and advance."""
+        active = _plain_segment(self.run_dir, self._number)
+        if not active.exists():
+            return
+        if active.stat().st_size == 0:
+            active.unlink()
+            return
+
+        target = _compressed_segment(self.run_dir, self._number)
+        tmp = target.with_name(target.name + ".tmp")
+        with open(active, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        tmp.replace(target)
+        # Readers following the active segment keep their open handle
+        active.unlink()
+        self._number += 1
+
+        for segment in list_segments(self.run_dir)[:-self.max_segments]:
+            segment.unlink(missing_ok=True)
+
+
+def _tail_plain(path: Optional[Path], count: int) -> List[bytes]:
+    """Get the last lines of a plain file, reading backwards in blocks."""
+    try:
+        f = open(path, "rb") if path else None
+    except FileNotFoundError:
+        f = None
+    if f is None:
+        return []
+
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        while position > 0 and buffer.count(b"\n") <= count:
+            step = min(_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+
+    lines = buffer.splitlines(keepends=True)
+    if position > 0:
+        # The first line was cut by the block boundary
+        lines = lines[1:]
+    return lines[-count:] if count else []
+
+
+def _tail_compressed(path: Path, count: int) -> List[bytes]:
+    """Get the last lines of a compressed segment (bounded by segment size)."""
+    try:
+        with gzip.open(path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+    except (OSError, EOFError):
+        return []
+    return lines[-count:] if count else []
+
+
+def tail(run_dir: Path, count: int) -> List[bytes]:
+    """
+    Get the last lines of a run's output.
+
+    The active segment is read backwards from its end; older compressed
+    segments are only opened while more lines are still needed.
+
+    Args:
+        run_dir: Log directory of the run.
+        count: Number of lines.
+
+    Returns:
+        Lines (with line endings), oldest first.
+    """
+    lines = _tail_plain(_active_segment(run_dir), count)
+    for segment in reversed(list_segments(run_dir)):
+        if len(lines) >= count:
+            break
+        lines = _tail_compressed(segment, count - len(lines)) + lines
+    return lines
+
+
+def _read_compressed(path: Path, offset: int = 0) -> Iterator[bytes]:
+    """Stream a compressed segment's content, skipping the first offset bytes."""
+    try:
+        with gzip.open(path, "rb") as f:
+            if offset:
+                f.seek(offset)
+            for chunk in iter(lambda: f.read(_BLOCK_SIZE), b""):
+                yield chunk
+    except FileNotFoundError:
+        # Dropped by rotation while reading
+        return
+
+
+def read_all(run_dir: Path) -> Iterator[bytes]:
+    """
+    Stream a run's complete retained output in chunks.
+
+    Args:
+        run_dir: Log directory of the run.
+
+    Yields:
+        Output chunks, oldest first.
+    """
+    for segment in list_segments(run_dir):
+        yield from _read_compressed(segment)
+    active = _active_segment(run_dir)
+    if active is None:
+        return
+    try:
+        with open(active, "rb") as f:
+            for chunk in iter(lambda: f.read(_BLOCK_SIZE), b""):
+                yield chunk
+    except FileNotFoundError:
+        pass
+
+
+def follow(run_dir: Path, from_end: bool = True, poll_interval: float = 0.5) -> Iterator[bytes]:
+    """
+    Stream a run's output as it is written, until the run finishes.
+
+    Segments are walked by sequence number. A segment that was compressed
+    before (or while) it was read is continued from the compressed copy,
+    so rotation never loses output.
+
+    Args:
+        run_dir: Log directory of the run.
+        from_end: Start at the current end of the active segment instead of
+            the beginning of the retained output.
+        poll_interval: Seconds to wait when no new output is available.
+
+    Yields:
+        Output chunks.
+    """
+    number = None
+    offset = 0
+    f = None
+    try:
+        while True:
+            if number is None:
+                active = _active_segment(run_dir) if from_end else None
+                numbers = segment_numbers(run_dir)
+                if active is not None:
+                    number = int(SEGMENT_PATTERN.match(active.name).group(1))
+                    offset = active.stat().st_size
+                elif from_end and numbers and (run_dir / DONE_MARKER).exists():
+                    return
+                elif numbers:
+                    number = numbers[-1] + 1 if from_end else numbers[0]
+                elif (run_dir / DONE_MARKER).exists():
+                    return
+                else:
+                    time.sleep(poll_interval)
+                    continue
+
+            if f is None:
+                try:
+                    f = open(_plain_segment(run_dir, number), "rb")
+                    f.seek(offset)
+                except FileNotFoundError:
+                    compressed = _compressed_segment(run_dir, number)
+                    later = [n for n in segment_numbers(run_dir) if n > number]
+                    if compressed.exists():
+                        yield from _read_compressed(compressed, offset)
+                        number, offset = number + 1, 0
+                    elif later:
+                        # Dropped by the segment cap before it could be read
+                        number, offset = later[0], 0
+                    elif (run_dir / DONE_MARKER).exists():
+                        return
+                    else:
+                        time.sleep(poll_interval)
+                    continue
+
+            data = f.read(_BLOCK_SIZE)
+            if data:
+                offset += len(data)
+                yield data
+                continue
+
+            if not _plain_segment(run_dir, number).exists():
+                # Rotated away: the open handle still holds the rest
+                for chunk in iter(lambda: f.read(_BLOCK_SIZE), b""):
+                    yield chunk
+                f.close()
+                f = None
+                number, offset = number + 1, 0
+                continue
+
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+class TaskLogStore:
+    """
+    Captures each task's container output into per-run log directories.
+
+    Runs are indexed by issue in index.json under the log directory, newest
+    last. Capture streams from the Docker API on a thread per container, so
+    output survives auto-removal of the container.
+    """
+
+    def __init__(self, log_dir: Optional[Path] = None):
+        """
+        Initialize log store.
+
+        Args:
+            log_dir: Log directory (defaults to TASK_LOG_DIR).
+        """
+        self.log_dir = log_dir or get_runtime_config().task_log_dir
+        self._lock = threading.Lock()
+        self._captures: Dict[str, threading.Thread] = {}
+
+    @property
+    def config(self) -> Config:
+        """Full configuration, only needed when capturing (not reading) logs."""
+        return get_config()
+
+    def run_dir(self, issue_number: int, run_id: str) -> Path:
+        """Get the log directory of a run."""
+        return self.log_dir / f"issue-{issue_number}" / run_id
+
+    def load_index(self) -> dict:
+        """
+        Load the run index.
+
+        Returns:
+            Mapping of issue number (as string) to its runs, oldest first.
+        """
+        try:
+            return json.loads((self.log_dir / INDEX_FILE).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self, index: dict):
+        """Write the run index atomically."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.log_dir / f"{INDEX_FILE}.tmp"
+        tmp.write_text(json.dumps(index, indent=2))
+        tmp.replace(self.log_dir / INDEX_FILE)
+
+    def runs(self, issue_number: int) -> List[dict]:
+        """
+        Get the recorded runs of an issue.
+
+        Args:
+            issue_number: GitHub issue number.
+
+        Returns:
+            Run entries, oldest first.
+        """
+        return self.load_index().get(str(issue_number), [])
+
+    def find_run(self, issue_number: int, run_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Find a run of an issue.
+
+        Args:
+            issue_number: GitHub issue number.
+            run_id: Run (task) ID, or None for the latest run.
+
+        Returns:
+            Run entry or None if not found.
+        """
+        runs = self.runs(issue_number)
+        if run_id is None:
+            return runs[-1] if runs else None
+        return next(
+            (run for run in runs if run["run_id"].startswith(run_id)),
+            None,
+        )
+
+    def _register_run(self, issue_number: int, run_id: str, container_id: str):
+        """Add a run to the index and drop the oldest finished runs."""
+        with self._lock:
+            index = self.load_index()
+            runs = index.setdefault(str(issue_number), [])
+            if any(run["run_id"] == run_id for run in runs):
+                return
+
+            runs.append({
+                "run_id": run_id,
+                "container_id": container_id,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "finished_at": None,
+            })
+
+            keep = max(self.config.task_log_runs_per_issue, 1)
+            while len(runs) > keep and runs[0]["finished_at"]:
+                old = runs.pop(0)
+                shutil.rmtree(self.run_dir(issue_number, old["run_id"]), ignore_errors=True)
+
+            self._save_index(index)
+
+    def _finish_run(self, issue_number: int, run_id: str):
+        """Record the end time of a run."""
+        with self._lock:
+            index = self.load_index()
+            for run in index.get(str(issue_number), []):
+                if run["run_id"] == run_id:
+                    run["finished_at"] = datetime.now(timezone.utc).isoformat()
+            self._save_index(index)
+
+    def capture(self, issue_number: int, run_id: str, container, resume: bool = False):
+        """
+        Start streaming a container's output into the run's log files.
+
+        Args:
+            issue_number: GitHub issue number.
+            run_id: Run (task) ID.
+            container: Docker container.
+            resume: Continue a run captured by a previous daemon, skipping
+                output older than its last write.
+        """
+        with self._lock:
+            existing = self._captures.get(run_id)
+            if existing and existing.is_alive():
+                return
+
+        since = None
+        active = _active_segment(self.run_dir(issue_number, run_id))
+        if resume and active is not None:
+            since = int(active.stat().st_mtime)
+
+        self._register_run(issue_number, run_id, container.id)
+
+        thread = threading.Thread(
+            target=self._capture,
+            args=(issue_number, run_id, container, since),
+            daemon=True,
+        )
+        with self._lock:
+            self._captures[run_id] = thread
+        thread.start()
+
+    def _capture(self, issue_number: int, run_id: str, container, since: Optional[int]):
+        """Copy the container log stream into a rotating writer until it ends."""
+        writer = RotatingLogWriter(
+            self.run_dir(issue_number, run_id),
+            self.config.task_log_segment_mb * 1024 * 1024,
+            self.config.task_log_max_segments,
+        )
+        try:
+            kwargs = {"stream": True, "follow": True, "stdout": True, "stderr": True}
+            if since:
+                kwargs["since"] = since
+            for chunk in container.logs(**kwargs):
+                writer.write(chunk)
+        except Exception as e:
+            logger.warning(f"Log capture for issue #{issue_number} ended early: {e}")
+        finally:
+            writer.close()
+            self._finish_run(issue_number, run_id)
+            with self._lock:
+                self._captures.pop(run_id, None)
+            logger.debug(f"Finished log capture for issue #{issue_number} ({run_id})")
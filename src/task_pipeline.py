@@ -0,0 +1,255 @@
+"""Prepare stage of task dispatch: worktrees and prompts ready before a slot frees."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import get_config
+from .docker_manager import DockerManager
+from .task_queue import Task, TaskQueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreparedTask:
+    """Work done for a queued task ahead of its start."""
+    issue_number: int
+    task_id: str
+    worktree_path: Optional[Path] = None
+    prompt: Optional[str] = None
+    base_image: Optional[str] = None  # Active task image at preparation time
+    image: Optional[str] = None  # Image to run locally (warm or active)
+    error: Optional[str] = None
+    prepared_at: float = 0.0
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class TaskPreparer:
+    """
+    Prepares the next queued tasks while every slot is busy.
+
+    Dispatch runs in two stages. The prepare stage (this class) creates the
+    worktree, generates the prompt and resolves the image for each of the
+    first PREPARE_AHEAD queued tasks, one at a time on its own thread. The
+    execute stage takes a task together with its prepared work and only has
+    to start the container once a slot frees. Tasks without prepared work
+    (or whose preparation failed or went stale) are prepared inline as
+    before.
+
+    A prepared worktree cannot move into a warm pool container, so nothing
+    is prepared while the pool has idle containers: the next task starts in
+    one of them instead. The pool only keeps containers for free slots, so
+    preparation covers the time when every slot is busy.
+
+    Taking a task from the queue and claiming its entry happen under one
+    lock, so a task is never prepared twice. Prepared worktrees of tasks
+    that left the queue without being started, or went stale, are removed;
+    a task taken while its worktree is being removed waits for the removal,
+    so it cannot remove the worktree the task is then given.
+    """
+
+    def __init__(
+        self,
+        docker_manager: DockerManager,
+        task_queue: TaskQueue,
+        prompt_for: Callable[[Task], str],
+        idle_pool_slots: Callable[[], int] = lambda: 0,
+    ):
+        """
+        Initialize the preparer.
+
+        Args:
+            docker_manager: Docker manager creating worktrees.
+            task_queue: Queue whose head is prepared.
+            prompt_for: Builds the Claude prompt of a task.
+            idle_pool_slots: Returns the number of idle warm pool containers.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.task_queue = task_queue
+        self.prompt_for = prompt_for
+        self.idle_pool_slots = idle_pool_slots
+        self._entries: Dict[str, PreparedTask] = {}  # task_id -> PreparedTask
+        self._discarding: Dict[str, threading.Event] = {}  # task_id -> set when removed
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether tasks are prepared ahead."""
+        return self.config.prepare_ahead > 0
+
+    def start(self):
+        """Start preparing queued tasks in the background."""
+        if not self.enabled or self._thread:
+            return
+        self._thread = threading.Thread(target=self._prepare_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Task preparation started ({self.config.prepare_ahead} ahead)")
+
+    def stop(self):
+        """Stop preparing and remove worktrees prepared for tasks that never started."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=30)
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.done.is_set():
+                self._discard(entry)
+
+    def wake(self):
+        """Look for tasks to prepare now, e.g. after issues were queued."""
+        self._wake.set()
+
+    def next_task(self) -> Tuple[Optional[Task], Optional[PreparedTask]]:
+        """
+        Take the next task from the queue together with its prepared work.
+
+        Returns:
+            (task, prepared) tuple; task is None if nothing may start, and
+            prepared is None if the task was not (yet) picked for preparation.
+        """
+        with self._lock:
+            task = self.task_queue.get_next_task()
+            if task is None:
+                return None, None
+            entry = self._entries.pop(task.task_id, None)
+            discarding = self._discarding.get(task.task_id)
+        if discarding is not None:
+            # Its stale worktree is being removed; the task gets a new one
+            discarding.wait()
+        self._wake.set()
+        return task, entry
+
+    def ready(self, entry: Optional[PreparedTask]) -> Optional[PreparedTask]:
+        """
+        Wait for a taken task's preparation and check it is usable.
+
+        Args:
+            entry: Prepared work returned by next_task().
+
+        Returns:
+            The entry, or None if the task must be prepared inline.
+        """
+        if entry is None:
+            return None
+        entry.done.wait()
+        if entry.error:
+            logger.info(f"Preparing issue #{entry.issue_number} inline after: {entry.error}")
+            return None
+        if time.time() - entry.prepared_at > self.config.prepare_max_age:
+            logger.info(f"Prepared worktree of issue #{entry.issue_number} is stale, recreating")
+            self._discard(entry)
+            return None
+        return entry
+
+    def _prepare_loop(self):
+        """Prepare queued tasks until stopped."""
+        while not self._stop.is_set():
+            try:
+                selected = self._select()
+                if selected:
+                    self._prepare(*selected)
+                    continue
+            except Exception as e:
+                logger.error(f"Error preparing tasks: {e}")
+            self._wake.wait(timeout=2)
+            self._wake.clear()
+
+    def _select(self) -> Optional[Tuple[Task, PreparedTask]]:
+        """
+        Drop abandoned or stale entries and claim the next task to prepare.
+
+        Returns:
+            (task, new entry) tuple, or None if the queue head is prepared.
+        """
+        if not self.docker.image_ready.is_set():
+            return None
+        if self.task_queue.is_paused() or self.task_queue.is_draining():
+            return None
+        if self.idle_pool_slots() > 0:
+            # The next tasks start in the idle pool containers
+            return None
+
+        now = time.time()
+        selected = None
+        with self._lock:
+            queued = self.task_queue.get_queued_tasks()[:self.config.prepare_ahead]
+            wanted = {task.task_id for task in queued}
+            dropped = [
+                entry for task_id, entry in self._entries.items()
+                if task_id not in wanted
+                or (not entry.error and now - entry.prepared_at > self.config.prepare_max_age)
+            ]
+            for entry in dropped:
+                del self._entries[entry.task_id]
+                self._discarding[entry.task_id] = threading.Event()
+
+            pending = [
+                task for task in queued
+                if task.task_id not in self._entries and task.task_id not in self._discarding
+            ]
+            if pending:
+                entry = PreparedTask(pending[0].issue_number, pending[0].task_id)
+                self._entries[entry.task_id] = entry
+                selected = (pending[0], entry)
+
+        for entry in dropped:
+            try:
+                self._discard(entry)
+            finally:
+                with self._lock:
+                    self._discarding.pop(entry.task_id).set()
+        return selected
+
+    def _prepare(self, task: Task, entry: PreparedTask):
+        """Create the worktree, generate the prompt and resolve the image of one task."""
+        started = time.time()
+        try:
+            entry.worktree_path = self.docker.create_worktree(task.issue_number)
+            entry.prompt = self.prompt_for(task)
+            entry.base_image = self.docker.get_active_image()
+            entry.image = self.docker.warm_images.image_for(entry.worktree_path) or entry.base_image
+            entry.prepared_at = time.time()
+            logger.info(
+                f"Prepared issue #{task.issue_number} in {entry.prepared_at - started:.1f}s"
+            )
+        except Exception as e:
+            entry.error = str(e)
+            logger.warning(f"Failed to prepare issue #{task.issue_number}: {e}")
+        finally:
+            entry.done.set()
+
+    def _discard(self, entry: PreparedTask):
+        """Remove the worktree of a prepared task that will not start from it."""
+        if entry.error or not entry.worktree_path:
+            return
+        # The same issue may have been queued again and be running already
+        if self.task_queue.is_running(entry.issue_number):
+            return
+        try:
+            self.docker.remove_worktree(entry.issue_number, entry.worktree_path)
+            logger.info(f"Discarded prepared worktree of issue #{entry.issue_number}")
+        except Exception as e:
+            logger.warning(f"Failed to discard prepared worktree of issue #{entry.issue_number}: {e}")
+
+    def status(self) -> dict:
+        """Get the issues whose preparation is done or under way."""
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "enabled": True,
+            "ready": [e.issue_number for e in entries if e.done.is_set() and not e.error],
+            "preparing": [e.issue_number for e in entries if not e.done.is_set()],
+            "failed": [e.issue_number for e in entries if e.error],
+        }
@@ -4,8 +4,9 @@ import logging
 import threading
 import queue
 import json
-from typing import Dict, Optional, List
-from dataclasses import dataclass, asdict
+import uuid
+from typing import Dict, Optional, List, Set
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone
 from pathlib import Path
 from enum import Enum
@@ -36,6 +37,10 @@ class Task:
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     error: Optional[str] = None
+    resources: Optional[dict] = None  # Peak/average usage summary
+    docker_host: Optional[str] = None  # Name of the Docker host running the container
+    credentials_file: Optional[str] = None  # OAuth credentials copy mounted into the container
+    task_id: str = field(default_factory=lambda: uuid.uuid4().hex)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
@@ -63,9 +68,12 @@ class TaskQueue:
         self.max_concurrent = max_concurrent
         self._queue: queue.Queue = queue.Queue()
         self._running: Dict[int, Task] = {}  # issue_number -> Task
+        self._starting: Set[int] = set()  # Taken from the queue, not yet running
         self._completed: List[Task] = []
+        self._recovered: Dict[str, Task] = {}  # container_id -> Task from saved state
         self._lock = threading.RLock()
         self._paused = False
+        self._draining = False  # Not persisted: a drained daemon restarts normally
 
     def add_task(self, issue: IssueInfo) -> bool:
         """
@@ -107,7 +115,7 @@ class TaskQueue:
             Task object or None.
         """
         with self._lock:
-            if self._paused:
+            if self._paused or self._draining:
                 return None
 
             if len(self._running) >= self.max_concurrent:
@@ -115,9 +123,10 @@ class TaskQueue:
 
             try:
                 task = self._queue.get_nowait()
-                return task
             except queue.Empty:
                 return None
+            self._starting.add(task.issue_number)
+            return task
 
     def mark_running(self, task: Task, container_id: str, worktree_path: Path):
         """
@@ -134,8 +143,34 @@ class TaskQueue:
             task.worktree_path = str(worktree_path)
             task.started_at = datetime.now(timezone.utc).isoformat()
             self._running[task.issue_number] = task
+            self._starting.discard(task.issue_number)
             logger.info(f"Marked task #{task.issue_number} as running")
 
+    def restore_running(self, task: Task):
+        """
+        Re-register a task whose container survived a daemon restart.
+
+        Args:
+            task: Task object rebuilt from the container or saved state.
+        """
+        with self._lock:
+            task.status = TaskStatus.RUNNING
+            self._running[task.issue_number] = task
+            logger.info(f"Restored running task #{task.issue_number} ({task.task_id})")
+
+    def take_recovered(self, container_id: str) -> Optional[Task]:
+        """
+        Get (and forget) a running task from the loaded state by container ID.
+
+        Args:
+            container_id: Docker container ID.
+
+        Returns:
+            Task object or None if the saved state has no such task.
+        """
+        with self._lock:
+            return self._recovered.pop(container_id, None)
+
     def mark_completed(self, issue_number: int, error: Optional[str] = None):
         """
         Mark a task as completed.
@@ -145,6 +180,8 @@ class TaskQueue:
             error: Error message if failed.
         """
         with self._lock:
+            # Also ends a start that failed before the task was running
+            self._starting.discard(issue_number)
             if issue_number not in self._running:
                 logger.warning(f"Task #{issue_number} not in running tasks")
                 return
@@ -166,6 +203,25 @@ class TaskQueue:
             if len(self._completed) > 100:
                 self._completed = self._completed[-100:]
 
+    def remove_queued(self, issue_number: int) -> Optional[Task]:
+        """
+        Remove an issue's task from the queue.
+
+        Args:
+            issue_number: Issue number.
+
+        Returns:
+            The removed task, or None if the issue is not queued.
+        """
+        with self._lock:
+            with self._queue.mutex:
+                for task in self._queue.queue:
+                    if task.issue_number == issue_number:
+                        self._queue.queue.remove(task)
+                        logger.info(f"Removed task for issue #{issue_number} from queue")
+                        return task
+            return None
+
     def get_running_tasks(self) -> List[Task]:
         """Get list of currently running tasks."""
         with self._lock:
@@ -176,6 +232,11 @@ class TaskQueue:
         with self._lock:
             return list(self._queue.queue)
 
+    def get_starting_issues(self) -> Set[int]:
+        """Get issue numbers taken from the queue whose container has not started yet."""
+        with self._lock:
+            return set(self._starting)
+
     def get_completed_tasks(self, limit: int = 20) -> List[Task]:
         """Get list of completed tasks."""
         with self._lock:
@@ -203,6 +264,17 @@ class TaskQueue:
         with self._lock:
             return self._paused
 
+    def drain(self):
+        """Stop handing out tasks for good (until the daemon restarts)."""
+        with self._lock:
+            self._draining = True
+            logger.info("Task queue draining")
+
+    def is_draining(self) -> bool:
+        """Check if queue is draining."""
+        with self._lock:
+            return self._draining
+
     def get_status(self) -> dict:
         """Get queue status."""
         with self._lock:
@@ -213,20 +285,38 @@ class TaskQueue:
                 "max_concurrent": self.max_concurrent,
             }
 
-    def save_state(self, file_path: Path):
+    def snapshot(self, extra: Optional[dict] = None) -> dict:
         """
-        Save queue state to file.
+        Get the queue state in its saved form.
 
         Args:
-            file_path: Path to save state.
+            extra: Additional top-level entries (e.g., metrics).
+
+        Returns:
+            State dictionary as written by save_state().
         """
         with self._lock:
             state = {
                 "paused": self._paused,
+                "max_concurrent": self.max_concurrent,
                 "running": [task.to_dict() for task in self._running.values()],
                 "queued": [task.to_dict() for task in self._queue.queue],
                 "completed": [task.to_dict() for task in self._completed[-20:]],
             }
+        if extra:
+            state.update(extra)
+        return state
+
+    def save_state(self, file_path: Path, extra: Optional[dict] = None):
+        """
+        Save queue state to file.
+
+        Args:
+            file_path: Path to save state.
+            extra: Additional top-level entries to persist (e.g., metrics).
+        """
+        with self._lock:
+            state = self.snapshot(extra)
 
             try:
                 with open(file_path, "w") as f:
@@ -257,6 +347,13 @@ class TaskQueue:
                     Task.from_dict(task) for task in state.get("completed", [])
                 ]
 
+                # Keep running tasks so their containers can be re-adopted
+                self._recovered = {}
+                for data in state.get("running", []):
+                    task = Task.from_dict(data)
+                    if task.container_id:
+                        self._recovered[task.container_id] = task
+
                 logger.info(f"Loaded state from {file_path}")
 
         except Exception as e:
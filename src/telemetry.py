@@ -0,0 +1,380 @@
+"""Resource usage sampling of running task containers."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from docker.errors import DockerException
+
+from .config import get_config
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+    from .task_queue import TaskQueue
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Order of the values in a sample, after its timestamp
+SAMPLE_FIELDS = ("cpu_percent", "memory_bytes", "block_read", "block_write", "net_rx", "net_tx")
+
+
+@dataclass
+class _Usage:
+    """Raw counters read for a container in one pass."""
+    cpu_seconds: float
+    memory_bytes: int
+    block_read: int = 0
+    block_write: int = 0
+    net_rx: int = 0
+    net_tx: int = 0
+
+
+@dataclass
+class _Series:
+    """Compact time series and running summary of one task's usage."""
+    issue_number: int
+    host: Optional[str] = None
+    pid: Optional[int] = None
+    cgroup: Optional[Path] = None
+    cgroup_v2: bool = True
+    samples: List[Tuple] = field(default_factory=list)
+    stride: int = 1
+    seen: int = 0
+    last_cpu: Optional[Tuple[float, float]] = None
+    peak_cpu: float = 0.0
+    cpu_sum: float = 0.0
+    cpu_count: int = 0
+    peak_memory: int = 0
+    memory_sum: int = 0
+    memory_count: int = 0
+    last: Optional[_Usage] = None
+
+
+def _read_int(path: Path) -> Optional[int]:
+    """Read a file holding a single integer."""
+    try:
+        return int(path.read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_keyed(path: Path) -> Dict[str, int]:
+    """Read a 'key value' per line file such as cpu.stat."""
+    values = {}
+    try:
+        for line in path.read_text().splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                values[parts[0]] = int(parts[1])
+    except OSError:
+        pass
+    return values
+
+
+def resolve_cgroup(pid: int) -> Tuple[Optional[Path], bool]:
+    """
+    Find the cgroup directory of a process.
+
+    Args:
+        pid: Host PID of the container's init process.
+
+    Returns:
+        Tuple of (cgroup directory or None, whether it is cgroup v2). For
+        cgroup v1 the path is relative to each controller's hierarchy.
+    """
+    try:
+        lines = Path(f"/proc/{pid}/cgroup").read_text().splitlines()
+    except OSError:
+        return None, True
+
+    for line in lines:
+        hierarchy, controllers, path = line.split(":", 2)
+        if hierarchy == "0" and controllers == "":
+            return CGROUP_ROOT / path.lstrip("/"), True
+    for line in lines:
+        _, controllers, path = line.split(":", 2)
+        if "memory" in controllers.split(","):
+            return Path(path.lstrip("/")), False
+    return None, True
+
+
+def _read_cgroup_usage(series: _Series) -> Optional[_Usage]:
+    """Read CPU, memory and block I/O counters from the container's cgroup."""
+    if series.cgroup_v2:
+        cpu = _read_keyed(series.cgroup / "cpu.stat").get("usage_usec")
+        memory = _read_int(series.cgroup / "memory.current")
+        if cpu is None or memory is None:
+            return None
+        usage = _Usage(cpu_seconds=cpu / 1e6, memory_bytes=memory)
+        try:
+            for line in (series.cgroup / "io.stat").read_text().splitlines():
+                for pair in line.split()[1:]:
+                    key, _, value = pair.partition("=")
+                    if key == "rbytes":
+                        usage.block_read += int(value)
+                    elif key == "wbytes":
+                        usage.block_write += int(value)
+        except (OSError, ValueError):
+            pass
+        return usage
+
+    cpu = _read_int(CGROUP_ROOT / "cpuacct" / series.cgroup / "cpuacct.usage")
+    memory = _read_int(CGROUP_ROOT / "memory" / series.cgroup / "memory.usage_in_bytes")
+    if cpu is None or memory is None:
+        return None
+    usage = _Usage(cpu_seconds=cpu / 1e9, memory_bytes=memory)
+    try:
+        io_file = CGROUP_ROOT / "blkio" / series.cgroup / "blkio.throttle.io_service_bytes"
+        for line in io_file.read_text().splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == "Read":
+                usage.block_read += int(parts[2])
+            elif len(parts) == 3 and parts[1] == "Write":
+                usage.block_write += int(parts[2])
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+def _read_net(pid: int) -> Tuple[int, int]:
+    """Sum received/transmitted bytes of a process's network namespace (without lo)."""
+    rx = tx = 0
+    try:
+        for line in Path(f"/proc/{pid}/net/dev").read_text().splitlines()[2:]:
+            name, _, data = line.partition(":")
+            if name.strip() == "lo":
+                continue
+            fields = data.split()
+            rx += int(fields[0])
+            tx += int(fields[8])
+    except (OSError, ValueError, IndexError):
+        pass
+    return rx, tx
+
+
+def _usage_from_stats(stats: dict) -> _Usage:
+    """Convert a Docker stats API response into raw counters."""
+    usage = _Usage(
+        cpu_seconds=stats.get("cpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0) / 1e9,
+        memory_bytes=stats.get("memory_stats", {}).get("usage", 0),
+    )
+    for entry in stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            usage.block_read += entry.get("value", 0)
+        elif op == "write":
+            usage.block_write += entry.get("value", 0)
+    for network in (stats.get("networks") or {}).values():
+        usage.net_rx += network.get("rx_bytes", 0)
+        usage.net_tx += network.get("tx_bytes", 0)
+    return usage
+
+
+class ResourceSampler:
+    """
+    Samples CPU, memory, block I/O and network of all running task containers.
+
+    Each pass reads the containers' cgroup files and /proc network counters
+    directly, which costs a few small file reads per container. Containers
+    whose cgroup cannot be found (e.g., the daemon itself runs in a
+    container) fall back to the Docker stats API on a small bounded pool.
+
+    Series are compact: once a task has TELEMETRY_MAX_SAMPLES samples,
+    every other sample is dropped and the recording stride doubles, so a
+    series covers the whole run in bounded memory. Peak and average are
+    tracked over every sample regardless.
+    """
+
+    def __init__(self, docker_manager: "DockerManager", task_queue: "TaskQueue"):
+        """
+        Initialize sampler.
+
+        Args:
+            docker_manager: Docker manager providing the client.
+            task_queue: Queue whose running tasks are sampled.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self.task_queue = task_queue
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fallback = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stats")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether sampling is configured."""
+        return self.config.telemetry_interval > 0 and not self.config.dry_run
+
+    def start(self):
+        """Start the sampling thread."""
+        if not self.enabled:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"Resource sampler started (every {self.config.telemetry_interval}s)")
+
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._fallback.shutdown(wait=False)
+
+    def _run(self):
+        """Sample all running containers at the configured interval."""
+        while not self._stop.wait(timeout=self.config.telemetry_interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling container resources: {e}")
+
+    def _attach(self, container_id: str, issue_number: int, host_name: Optional[str]) -> _Series:
+        """Start a series for a container, resolving its PID and cgroup once."""
+        series = _Series(issue_number=issue_number, host=host_name)
+        if not self.docker.hosts.get(host_name).is_local:
+            # Remote containers are only reachable through the stats API
+            return series
+        try:
+            container = self.docker.client.containers.get(container_id)
+            series.pid = container.attrs.get("State", {}).get("Pid") or None
+        except DockerException as e:
+            logger.debug(f"Failed to inspect container {container_id[:12]}: {e}")
+        if series.pid:
+            series.cgroup, series.cgroup_v2 = resolve_cgroup(series.pid)
+        return series
+
+    def _read_stats_api(self, container_id: str, host_name: Optional[str]) -> Optional[_Usage]:
+        """Read counters through the Docker stats API (fallback)."""
+        try:
+            container = self.docker.hosts.get(host_name).client.containers.get(container_id)
+            return _usage_from_stats(container.stats(stream=False, one_shot=True))
+        except DockerException as e:
+            logger.debug(f"Failed to read stats for {container_id[:12]}: {e}")
+            return None
+
+    def sample(self):
+        """Take one sample of every running task container."""
+        now = time.monotonic()
+        running = {
+            task.container_id: (task.issue_number, task.docker_host)
+            for task in self.task_queue.get_running_tasks()
+            if task.container_id
+        }
+
+        with self._lock:
+            # Series of containers that left without finish() are dropped
+            for container_id in [cid for cid in self._series if cid not in running]:
+                del self._series[container_id]
+            new = [cid for cid in running if cid not in self._series]
+        for container_id in new:
+            series = self._attach(container_id, *running[container_id])
+            with self._lock:
+                self._series.setdefault(container_id, series)
+
+        readings: Dict[str, Optional[_Usage]] = {}
+        fallback = {}
+        with self._lock:
+            targets = {cid: self._series[cid] for cid in running if cid in self._series}
+        for container_id, series in targets.items():
+            usage = _read_cgroup_usage(series) if series.cgroup else None
+            if usage is not None:
+                usage.net_rx, usage.net_tx = _read_net(series.pid)
+                readings[container_id] = usage
+            else:
+                fallback[container_id] = self._fallback.submit(
+                    self._read_stats_api, container_id, series.host
+                )
+        for container_id, future in fallback.items():
+            readings[container_id] = future.result()
+
+        with self._lock:
+            for container_id, usage in readings.items():
+                series = self._series.get(container_id)
+                if usage is not None and series is not None:
+                    self._record(series, usage, now)
+
+    def _record(self, series: _Series, usage: _Usage, now: float):
+        """Add a reading to a series and its running summary."""
+        cpu_percent = None
+        if series.last_cpu is not None:
+            elapsed = now - series.last_cpu[1]
+            if elapsed > 0:
+                cpu_percent = max(0.0, (usage.cpu_seconds - series.last_cpu[0]) / elapsed * 100)
+        series.last_cpu = (usage.cpu_seconds, now)
+        series.last = usage
+
+        if cpu_percent is not None:
+            series.peak_cpu = max(series.peak_cpu, cpu_percent)
+            series.cpu_sum += cpu_percent
+            series.cpu_count += 1
+        series.peak_memory = max(series.peak_memory, usage.memory_bytes)
+        series.memory_sum += usage.memory_bytes
+        series.memory_count += 1
+
+        series.seen += 1
+        if series.seen % series.stride:
+            return
+        series.samples.append((
+            round(time.time(), 1),
+            round(cpu_percent, 1) if cpu_percent is not None else None,
+            usage.memory_bytes,
+            usage.block_read,
+            usage.block_write,
+            usage.net_rx,
+            usage.net_tx,
+        ))
+        if len(series.samples) >= max(self.config.telemetry_max_samples, 2):
+            series.samples = series.samples[::2]
+            series.stride *= 2
+
+    @staticmethod
+    def _summarize(series: _Series) -> dict:
+        """Summarize a series into peak and average usage."""
+        last = series.last or _Usage(cpu_seconds=0.0, memory_bytes=0)
+        return {
+            "samples": series.memory_count,
+            "cpu_percent_peak": round(series.peak_cpu, 1),
+            "cpu_percent_avg": round(series.cpu_sum / series.cpu_count, 1) if series.cpu_count else None,
+            "cpu_seconds": round(last.cpu_seconds, 1),
+            "memory_bytes_peak": series.peak_memory,
+            "memory_bytes_avg": series.memory_sum // series.memory_count if series.memory_count else None,
+            "block_read_bytes": last.block_read,
+            "block_write_bytes": last.block_write,
+            "net_rx_bytes": last.net_rx,
+            "net_tx_bytes": last.net_tx,
+        }
+
+    def current(self) -> Dict[int, dict]:
+        """
+        Get the running summary of every sampled task.
+
+        Returns:
+            Mapping of issue number to usage summary.
+        """
+        with self._lock:
+            return {s.issue_number: self._summarize(s) for s in self._series.values()}
+
+    def finish(self, container_id: str) -> Tuple[Optional[dict], List[Tuple]]:
+        """
+        Stop tracking a container and return its summary and series.
+
+        Args:
+            container_id: Docker container ID.
+
+        Returns:
+            Tuple of (summary or None if never sampled, samples). Each sample
+            is (unix time, *SAMPLE_FIELDS).
+        """
+        with self._lock:
+            series = self._series.pop(container_id, None)
+        if series is None or not series.memory_count:
+            return None, []
+        return self._summarize(series), series.samples
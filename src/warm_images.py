@@ -0,0 +1,306 @@
+"""Per-commit warm task images committed from a container that ran the setup command."""
+
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+from docker.errors import APIError, DockerException
+
+from .config import get_config
+from .repo_manager import run_git_command
+from .snapshot import FailureBackoff
+
+if TYPE_CHECKING:
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+WARM_IMAGE_NAME = "claude-issue-solver-warm"
+WARM_COMMIT_LABEL = "claude-issue-solver.warm-commit"
+WARM_BASE_LABEL = "claude-issue-solver.warm-base"
+
+
+class WarmImages:
+    """
+    Task images with the project's bootstrap already done.
+
+    Once per default-branch commit, WARM_IMAGE_COMMAND is run in a
+    container of the active task image with a checkout of that commit at
+    /workspace, and the container is committed as
+    claude-issue-solver-warm:<commit>. Only what the command leaves outside
+    the workspace is kept (toolchains, global installs, home-directory
+    caches); the workspace itself is bind-mounted in tasks, so in-tree
+    output is the job of the dependency snapshots.
+
+    Tasks whose branch starts from a commit with a warm image run from it.
+    A failed build is retried after a backoff that grows with each failure.
+    Warm images of a superseded task image are dropped, and beyond
+    WARM_IMAGE_KEEP the least recently used ones are evicted.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize warm images.
+
+        Args:
+            docker_manager: Docker manager providing the client and base image.
+        """
+        self.config = get_config()
+        self.docker = docker_manager
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pending = False
+        self._started = False
+        self._failed = FailureBackoff()
+        # Image tag -> last time a task started from it
+        self._last_used: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a warm-up command is configured."""
+        return bool(self.config.warm_image_command)
+
+    @staticmethod
+    def image_ref(commit: str, base_id: str) -> str:
+        """Get the tag of the warm image for a commit and base image."""
+        return f"{WARM_IMAGE_NAME}:{commit[:12]}-{base_id.split(':')[-1][:12]}"
+
+    def _base_id(self) -> str:
+        """Get the image ID of the active task image."""
+        return self.docker.client.images.get(self.docker.get_active_image()).id
+
+    def start(self):
+        """Build warm images from now on: for each repository sync and each new task image."""
+        if not self.enabled or self._started:
+            return
+        self._started = True
+        self.docker.repo_manager.add_sync_listener(lambda repo_path: self.schedule())
+        self.schedule()
+
+    def schedule(self):
+        """Build the warm image of the current default-branch commit in the background."""
+        if not self._started or not self.docker.image_ready.is_set():
+            return
+
+        if self.config.dry_run:
+            logger.info(f"[DRY-RUN] Would build warm image with: {self.config.warm_image_command}")
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                self._pending = True
+                return
+            self._thread = threading.Thread(target=self._build_loop, daemon=True)
+            self._thread.start()
+
+    def _build_loop(self):
+        """Build until no further request arrived during the last build."""
+        while True:
+            with self._lock:
+                self._pending = False
+            try:
+                repo_path = self.docker.repo_manager.get_repo_path()
+                commit = run_git_command(
+                    ["git", "rev-parse", "HEAD"],
+                    cwd=repo_path,
+                    show_output=False,
+                ).stdout.strip()
+                self.ensure(repo_path, commit)
+            except Exception as e:
+                logger.error(f"Warm image build failed: {e}")
+            with self._lock:
+                if not self._pending:
+                    return
+
+    def ensure(self, repo_path: Path, commit: str) -> Optional[str]:
+        """
+        Build the warm image for a commit unless it exists.
+
+        Args:
+            repo_path: Path to the repository.
+            commit: Default-branch commit SHA.
+
+        Returns:
+            Warm image tag, or None if the build failed.
+        """
+        base_id = self._base_id()
+        ref = self.image_ref(commit, base_id)
+        if self._failed.waiting(ref):
+            return None
+        try:
+            self.docker.client.images.get(ref)
+            return ref
+        except DockerException:
+            pass
+
+        started = time.time()
+        try:
+            self._build(repo_path, commit, base_id, ref)
+        except Exception as e:
+            delay = self._failed.failed(ref)
+            logger.error(f"Failed to build warm image for {commit[:12]}, retrying in {delay:.0f}s: {e}")
+            return None
+
+        self._failed.succeeded(ref)
+        logger.info(f"Warm image {ref} ready in {time.time() - started:.0f}s")
+        self._last_used[ref] = time.time()
+        self._evict(base_id, keep=ref)
+        return ref
+
+    def _build(self, repo_path: Path, commit: str, base_id: str, ref: str):
+        """Run the warm-up command on a checkout of the commit and commit the container."""
+        from .docker_manager import MANAGED_LABEL
+
+        base = self.docker.client.images.get(base_id)
+        base_config = base.attrs.get("Config", {})
+        tree = Path(tempfile.mkdtemp(prefix="claude-warm-"))
+        try:
+            with self.docker.worktree_lock:
+                run_git_command(
+                    ["git", "worktree", "add", "--detach", str(tree / "src"), commit],
+                    cwd=repo_path,
+                    show_output=False,
+                )
+            logger.info(f"Building warm image for {commit[:12]}: {self.config.warm_image_command}")
+            # No extra environment: everything set on the container would be
+            # baked into the committed image
+            container = self.docker.client.containers.run(
+                base_id,
+                entrypoint=["/bin/sh", "-c"],
+                command=[self.config.warm_image_command],
+                volumes={str(tree / "src"): {"bind": "/workspace", "mode": "rw"}},
+                working_dir="/workspace",
+                detach=True,
+                user="claude",
+                network_mode="bridge",
+                # Managed, so the garbage collector removes it if the daemon
+                # dies before it does
+                labels={MANAGED_LABEL: "true", WARM_COMMIT_LABEL: commit, WARM_BASE_LABEL: base_id},
+            )
+            try:
+                exit_code = container.wait().get("StatusCode", -1)
+                if exit_code != 0:
+                    logs = container.logs().decode("utf-8", errors="replace")
+                    raise RuntimeError(f"Warm-up command exited with code {exit_code}:\n{logs[-2000:]}")
+
+                repository, _, tag = ref.rpartition(":")
+                container.commit(
+                    repository=repository,
+                    tag=tag,
+                    message=f"Warm image for {commit}",
+                    # Restore what the warm-up run overrode
+                    changes=[
+                        f"ENTRYPOINT {json.dumps(base_config.get('Entrypoint') or [])}",
+                        f"CMD {json.dumps(base_config.get('Cmd') or [])}",
+                    ],
+                )
+            finally:
+                try:
+                    container.remove(force=True)
+                except DockerException:
+                    pass
+        finally:
+            try:
+                with self.docker.worktree_lock:
+                    run_git_command(
+                        ["git", "worktree", "remove", "--force", str(tree / "src")],
+                        cwd=repo_path,
+                        show_output=False,
+                    )
+            except subprocess.CalledProcessError:
+                pass
+            shutil.rmtree(tree, ignore_errors=True)
+
+    def _evict(self, base_id: str, keep: str):
+        """Remove warm images of other base images and the least recently used beyond WARM_IMAGE_KEEP."""
+        images = self.docker.client.images.list(name=WARM_IMAGE_NAME)
+        current = []
+        for image in images:
+            tags = [tag for tag in image.tags if tag.startswith(f"{WARM_IMAGE_NAME}:")]
+            if not tags:
+                continue
+            if (image.labels or {}).get(WARM_BASE_LABEL) != base_id:
+                self._remove(image.id, tags[0])
+            else:
+                current.append((image, tags[0]))
+
+        # Least recently used first; images not used since a restart are
+        # ordered by creation time
+        current.sort(key=lambda entry: (
+            self._last_used.get(entry[1], 0.0),
+            entry[0].attrs.get("Created", ""),
+        ))
+        excess = len(current) - max(self.config.warm_image_keep, 1)
+        for image, tag in current:
+            if excess <= 0:
+                break
+            if tag == keep:
+                continue
+            if self._remove(image.id, tag):
+                excess -= 1
+
+    def _remove(self, image_id: str, tag: str) -> bool:
+        """Remove a warm image unless a container still uses it."""
+        try:
+            self.docker.client.images.remove(image_id)
+        except APIError as e:
+            logger.debug(f"Keeping warm image {tag}: {e}")
+            return False
+        self._last_used.pop(tag, None)
+        logger.info(f"Evicted warm image {tag}")
+        return True
+
+    def image_for(self, worktree_path: Path) -> Optional[str]:
+        """
+        Find the warm image a task worktree can start from.
+
+        The worktree's HEAD is tried first, then the commit where its
+        branch forked from the default branch.
+
+        Args:
+            worktree_path: Task worktree.
+
+        Returns:
+            Warm image tag, or None if there is none.
+        """
+        if not self.enabled or self.config.dry_run:
+            return None
+
+        try:
+            base_id = self._base_id()
+            head = run_git_command(
+                ["git", "rev-parse", "HEAD"],
+                cwd=worktree_path,
+                show_output=False,
+            ).stdout.strip()
+            candidates = [head]
+            default_head = run_git_command(
+                ["git", "rev-parse", "HEAD"],
+                cwd=self.docker.repo_manager.get_repo_path(),
+                show_output=False,
+            ).stdout.strip()
+            if default_head != head:
+                candidates.append(run_git_command(
+                    ["git", "merge-base", head, default_head],
+                    cwd=worktree_path,
+                    show_output=False,
+                ).stdout.strip())
+        except (DockerException, subprocess.CalledProcessError) as e:
+            logger.debug(f"No warm image lookup for {worktree_path}: {e}")
+            return None
+
+        for commit in candidates:
+            ref = self.image_ref(commit, base_id)
+            try:
+                self.docker.client.images.get(ref)
+            except DockerException:
+                continue
+            self._last_used[ref] = time.time()
+            return ref
+        return None
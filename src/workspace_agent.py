@@ -0,0 +1,301 @@
+"""Workspace preparation on remote Docker hosts through short-lived agent containers."""
+
+import io
+import logging
+import subprocess
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from docker.errors import DockerException, NotFound
+
+from .repo_manager import run_git_command
+
+if TYPE_CHECKING:
+    from .docker_hosts import DockerHost
+    from .docker_manager import DockerManager
+
+logger = logging.getLogger(__name__)
+
+# Bare mirror of the repository on each remote host, shared by its workspaces
+MIRROR_VOLUME = "claude-workspace-mirror"
+
+# Fetches the sync bundle (if any) into the mirror and creates the workspace
+# as a shared clone of it, checked out at the task's start commit
+PREPARE_SCRIPT = r'''
+set -e
+branch="$1"; commit="$2"; upstream="$3"
+[ -d /mirror/repo.git ] || git init --quiet --bare /mirror/repo.git
+if [ -f /tmp/sync.bundle ]; then
+  git -C /mirror/repo.git fetch --quiet /tmp/sync.bundle '+refs/*:refs/*'
+fi
+find /workspace -mindepth 1 -delete
+git clone --quiet --shared --no-checkout /mirror/repo.git /workspace
+cd /workspace
+git checkout --quiet -B "$branch" "$commit"
+[ -z "$upstream" ] || git remote set-url origin "$upstream"
+echo "$commit" > .git/claude-base
+chown -R claude:claude /workspace
+'''
+
+# Bundles the commits made on the issue branch since the start commit
+COLLECT_SCRIPT = r'''
+set -e
+branch="$1"
+cd /workspace
+git config --global --add safe.directory /workspace
+base=$(cat .git/claude-base 2>/dev/null || true)
+range="$branch"
+[ -z "$base" ] || range="$base..$branch"
+if [ -n "$(git rev-list -n 1 "$range")" ]; then
+  git bundle create --quiet /tmp/out.bundle "$range"
+fi
+'''
+
+
+def workspace_volume(issue_number: int) -> str:
+    """Get the name of an issue's workspace volume on a remote host."""
+    return f"claude-workspace-issue-{issue_number}"
+
+
+def _tar_files(files: Dict[str, bytes]) -> bytes:
+    """Pack files into an in-memory tar archive."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o600
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class RemoteWorkspaceAgent:
+    """
+    Prepares and collects task workspaces on remote Docker hosts.
+
+    Everything goes through the Docker API, so tcp:// and ssh:// endpoints
+    need no extra access. Each host keeps a bare mirror of the repository in
+    a volume, updated with incremental git bundles; a task's workspace is a
+    shared clone of that mirror in its own volume. Work done on the issue
+    branch is bundled back into the local workspace after the session.
+    """
+
+    def __init__(self, docker_manager: "DockerManager"):
+        """
+        Initialize agent.
+
+        Args:
+            docker_manager: Docker manager providing the repository and image.
+        """
+        self.docker = docker_manager
+        # Ref tips already sent to each host's mirror
+        self._synced: Dict[str, set] = {}
+        # (uid, gid) of the claude user per (host, image)
+        self._user_ids: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def _run(
+        self,
+        host: "DockerHost",
+        script: str,
+        args: list,
+        volumes: Dict[str, Dict[str, str]],
+        files: Optional[Dict[str, bytes]] = None,
+        fetch: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """
+        Run a script in a short-lived root container on a host.
+
+        Args:
+            host: Docker host.
+            script: Shell script.
+            args: Script arguments.
+            volumes: Volume mounts.
+            files: Files to place in /tmp before the script starts.
+            fetch: Path of a file to copy out after the script finished.
+
+        Returns:
+            Content of the fetched file (None if missing), or the script's
+            output if no file was requested.
+
+        Raises:
+            RuntimeError: If the script fails.
+        """
+        container = host.client.containers.create(
+            self.docker.get_active_image(),
+            entrypoint=["/bin/sh", "-c", script, "agent"],
+            command=[str(arg) for arg in args],
+            volumes=volumes,
+            user="root",
+        )
+        try:
+            if files:
+                container.put_archive("/tmp", _tar_files(files))
+            container.start()
+            exit_code = container.wait().get("StatusCode", -1)
+            if exit_code != 0:
+                output = container.logs().decode(errors="replace")
+                raise RuntimeError(f"Workspace agent on {host.name} failed ({exit_code}): {output}")
+
+            if fetch is None:
+                return container.logs(stderr=False)
+            try:
+                stream, _ = container.get_archive(fetch)
+            except NotFound:
+                return None
+            with tarfile.open(fileobj=io.BytesIO(b"".join(stream))) as archive:
+                member = archive.next()
+                return archive.extractfile(member).read() if member else None
+        finally:
+            try:
+                container.remove(force=True)
+            except DockerException:
+                pass
+
+    def user_ids(self, host: "DockerHost") -> Tuple[int, int]:
+        """
+        Get the uid and gid of the claude user in the active image.
+
+        Args:
+            host: Docker host the image is on.
+
+        Returns:
+            (uid, gid) tuple.
+        """
+        key = (host.name, self.docker.get_active_image())
+        if key not in self._user_ids:
+            output = self._run(host, "id -u claude; id -g claude", [], volumes={})
+            uid, gid = output.decode().split()[:2]
+            self._user_ids[key] = (int(uid), int(gid))
+        return self._user_ids[key]
+
+    def _sync_bundle(self, host: "DockerHost", repo_path: Path) -> Optional[bytes]:
+        """
+        Bundle the commits the host's mirror does not have yet.
+
+        Returns:
+            Bundle content, or None if the mirror is up to date.
+        """
+        tips = set(run_git_command(
+            ["git", "for-each-ref", "--format=%(objectname)"],
+            cwd=repo_path,
+            show_output=False,
+        ).stdout.split())
+        sent = self._synced.get(host.name, set())
+        if tips <= sent:
+            return None
+
+        with tempfile.TemporaryDirectory() as tmp:
+            bundle = Path(tmp) / "sync.bundle"
+            try:
+                run_git_command(
+                    ["git", "bundle", "create", str(bundle), "--all", "--not", *sorted(sent)],
+                    cwd=repo_path,
+                    show_output=False,
+                )
+            except subprocess.CalledProcessError as e:
+                if "empty bundle" in (e.stderr or ""):
+                    self._synced[host.name] = sent | tips
+                    return None
+                raise
+            data = bundle.read_bytes()
+
+        self._synced.setdefault(host.name, set()).update(tips)
+        return data
+
+    def prepare(self, host: "DockerHost", issue_number: int, worktree_path: Path) -> Dict:
+        """
+        Create an issue's workspace on a remote host from the local worktree.
+
+        Args:
+            host: Remote Docker host.
+            issue_number: GitHub issue number.
+            worktree_path: Local worktree the task starts from.
+
+        Returns:
+            Volume mounts for the task container.
+        """
+        repo_path = self.docker.repo_manager.get_repo_path()
+        commit = run_git_command(
+            ["git", "rev-parse", "HEAD"],
+            cwd=worktree_path,
+            show_output=False,
+        ).stdout.strip()
+        try:
+            upstream = run_git_command(
+                ["git", "remote", "get-url", "origin"],
+                cwd=repo_path,
+                show_output=False,
+            ).stdout.strip()
+        except subprocess.CalledProcessError:
+            upstream = ""
+
+        volume = workspace_volume(issue_number)
+        with host.lock:
+            try:
+                bundle = self._sync_bundle(host, repo_path)
+                self._run(
+                    host,
+                    PREPARE_SCRIPT,
+                    [f"issue-{issue_number}", commit, upstream],
+                    volumes={
+                        MIRROR_VOLUME: {"bind": "/mirror", "mode": "rw"},
+                        volume: {"bind": "/workspace", "mode": "rw"},
+                    },
+                    files={"sync.bundle": bundle} if bundle else None,
+                )
+            except Exception:
+                # The mirror may be behind what was recorded: send everything next time
+                self._synced.pop(host.name, None)
+                raise
+
+        logger.info(f"Prepared workspace for issue #{issue_number} on {host.name} at {commit[:12]}")
+        return {
+            volume: {"bind": "/workspace", "mode": "rw"},
+            MIRROR_VOLUME: {"bind": "/mirror", "mode": "ro"},
+        }
+
+    def collect(self, host: "DockerHost", issue_number: int, worktree_path: Optional[Path]):
+        """
+        Bring an issue branch's new commits back and remove the remote workspace.
+
+        Args:
+            host: Remote Docker host.
+            issue_number: GitHub issue number.
+            worktree_path: Local worktree to update, or None to only clean up.
+        """
+        volume = workspace_volume(issue_number)
+        branch = f"issue-{issue_number}"
+        try:
+            if worktree_path and worktree_path.exists():
+                bundle = self._run(
+                    host,
+                    COLLECT_SCRIPT,
+                    [branch],
+                    volumes={
+                        MIRROR_VOLUME: {"bind": "/mirror", "mode": "ro"},
+                        volume: {"bind": "/workspace", "mode": "rw"},
+                    },
+                    fetch="/tmp/out.bundle",
+                )
+                if bundle:
+                    with tempfile.NamedTemporaryFile(suffix=".bundle") as tmp:
+                        tmp.write(bundle)
+                        tmp.flush()
+                        run_git_command(
+                            ["git", "fetch", "--quiet", tmp.name, f"refs/heads/{branch}"],
+                            cwd=worktree_path,
+                            show_output=False,
+                        )
+                        run_git_command(
+                            ["git", "reset", "--quiet", "--hard", "FETCH_HEAD"],
+                            cwd=worktree_path,
+                            show_output=False,
+                        )
+                    logger.info(f"Collected issue #{issue_number} commits from {host.name}")
+        finally:
+            try:
+                host.client.volumes.get(volume).remove(force=True)
+            except DockerException as e:
+                logger.warning(f"Failed to remove workspace volume {volume} on {host.name}: {e}")
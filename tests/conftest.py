@@ -0,0 +1,189 @@
+"""Shared fixtures: a fake Docker engine standing in for dockerd."""
+
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import types
+from pathlib import Path
+
+import pytest
+from docker.errors import DockerException, NotFound
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import config  # noqa: E402
+
+
+class FakeContainer:
+    """
+    Container whose entrypoint runs as a local shell script.
+
+    Mount points and /tmp are rewritten to directories under the engine's
+    root, so scripts written for a real container run unchanged.
+    """
+
+    def __init__(self, engine: "FakeEngine", entrypoint, command, volumes):
+        self.engine = engine
+        self.id = f"fake{len(engine.containers):04d}"
+        self.entrypoint = list(entrypoint)
+        self.command = list(command)
+        self.tmp = Path(tempfile.mkdtemp(dir=engine.root))
+        self.mounts = {"/tmp": self.tmp}
+        for name, mount in volumes.items():
+            self.mounts[mount["bind"]] = engine.volume_path(name)
+        self.output = b""
+        self.exit_code = None
+        self.removed = False
+
+    def _path(self, path: str) -> Path:
+        for bind, local in self.mounts.items():
+            if path == bind or path.startswith(bind + "/"):
+                return local / path[len(bind):].lstrip("/")
+        raise NotFound(f"{path} is not mounted")
+
+    def _script(self) -> str:
+        # One pass, so rewritten paths are not rewritten again
+        binds = "|".join(re.escape(bind) for bind in sorted(self.mounts, key=len, reverse=True))
+        script = re.sub(
+            rf"(?<![\w/])({binds})(?=/|\b|$)",
+            lambda match: str(self.mounts[match.group(1)]),
+            self.entrypoint[2],
+        )
+        # No claude user in the stand-in
+        return script.replace("chown -R claude:claude", ": ")
+
+    def put_archive(self, path, data):
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            archive.extractall(self._path(path))
+        return True
+
+    def start(self):
+        result = subprocess.run(
+            ["/bin/sh", "-c", self._script(), "agent", *self.command],
+            capture_output=True,
+            env=self.engine.env,
+        )
+        self.output = result.stdout + result.stderr
+        self.exit_code = result.returncode
+
+    def wait(self):
+        return {"StatusCode": self.exit_code}
+
+    def logs(self, stdout=True, stderr=True):
+        return self.output
+
+    def get_archive(self, path):
+        local = self._path(path)
+        if not local.exists():
+            raise NotFound(f"{path} not found")
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            archive.add(local, arcname=local.name)
+        return iter([buffer.getvalue()]), {"name": local.name}
+
+    def remove(self, force=False):
+        self.removed = True
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+class FakeVolume:
+    """Named volume backed by a local directory."""
+
+    def __init__(self, engine: "FakeEngine", name: str):
+        self.engine = engine
+        self.name = name
+
+    def remove(self, force=False):
+        shutil.rmtree(self.engine.volumes.pop(self.name), ignore_errors=True)
+
+
+class FakeEngine:
+    """In-process stand-in for one dockerd, recording what was asked of it."""
+
+    def __init__(self, root: Path, reachable: bool = True):
+        self.root = root
+        self.reachable = reachable
+        self.volumes = {}
+        self.containers = []
+        self.env = dict(os.environ, HOME=str(root))
+
+    def volume_path(self, name: str) -> Path:
+        if name not in self.volumes:
+            path = self.root / "volumes" / name
+            path.mkdir(parents=True)
+            self.volumes[name] = path
+        return self.volumes[name]
+
+
+class FakeDockerClient:
+    """The parts of docker.DockerClient the daemon uses, on a FakeEngine."""
+
+    def __init__(self, engine: FakeEngine):
+        self.engine = engine
+        self.closed = False
+        self.containers = types.SimpleNamespace(create=self._create)
+        self.volumes = types.SimpleNamespace(get=self._get_volume)
+
+    def ping(self):
+        if not self.engine.reachable:
+            raise DockerException("Error while fetching server API version")
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def _create(self, image, entrypoint=None, command=None, volumes=None, **kwargs):
+        container = FakeContainer(self.engine, entrypoint, command or [], volumes or {})
+        self.engine.containers.append(container)
+        return container
+
+    def _get_volume(self, name):
+        if name not in self.engine.volumes:
+            raise NotFound(f"volume {name} not found")
+        return FakeVolume(self.engine, name)
+
+
+@pytest.fixture(autouse=True)
+def test_config(monkeypatch):
+    """Settings read by code under test, without credentials or a .env file."""
+    settings = types.SimpleNamespace(git_slow_threshold=0.0, dry_run=False)
+    monkeypatch.setattr(config, "_config", settings)
+    return settings
+
+
+@pytest.fixture
+def git_env(monkeypatch, tmp_path):
+    """Isolate git from the user's configuration and give it an identity."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    return home
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Create fake engines by name, each with its own root directory."""
+    created = {}
+
+    def make(name: str, reachable: bool = True) -> FakeEngine:
+        root = tmp_path / "engines" / name
+        root.mkdir(parents=True)
+        created[name] = FakeEngine(root, reachable)
+        return created[name]
+
+    return make
+
+
+@pytest.fixture
+def docker_client():
+    """Create a fake Docker client on an engine."""
+    return FakeDockerClient
@@ -0,0 +1,44 @@
+"""Tests for cache volume claims against the size cleanup."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from src.cache_volumes import CacheVolumes
+
+
+@pytest.fixture
+def caches(test_config):
+    test_config.cache_volumes = ["pip", "npm"]
+    test_config.cache_volume_max_mb = 100
+    docker = mock.Mock()
+    docker.image_ready = threading.Event()
+    docker.image_ready.set()
+    docker.get_active_image.return_value = "claude-task:latest"
+    # No running container mounts anything; each trim reports 10 MB left
+    docker.client.containers.list.return_value = []
+    docker.client.containers.run.return_value = b"10240\n"
+    return CacheVolumes(docker)
+
+
+def test_cleanup_skips_volumes_claimed_for_a_container_being_created(caches):
+    volumes = caches.mounts()
+    assert set(volumes) == {"claude-cache-pip", "claude-cache-npm"}
+
+    assert caches.cleanup() == {}
+
+    caches.release({"/worktrees/issue-1": {"bind": "/workspace", "mode": "rw"}, **volumes})
+
+    assert caches.cleanup() == {"claude-cache-pip": 10, "claude-cache-npm": 10}
+
+
+def test_claims_are_counted_per_container(caches):
+    first = caches.mounts()
+    second = caches.mounts()
+
+    caches.release(first)
+    assert caches.cleanup() == {}
+
+    caches.release(second)
+    assert set(caches.cleanup()) == {"claude-cache-pip", "claude-cache-npm"}
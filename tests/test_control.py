@@ -0,0 +1,58 @@
+"""Tests for the control socket."""
+
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src import control
+from src.control import ControlServer, call
+
+
+@pytest.fixture
+def socket_path(test_config):
+    # Unix socket paths are limited to about 100 characters
+    runtime_dir = Path(tempfile.mkdtemp(prefix="cis-"))
+    os.chmod(runtime_dir, 0o755)
+    test_config.control_socket = runtime_dir / "control.sock"
+    yield test_config.control_socket
+    shutil.rmtree(runtime_dir, ignore_errors=True)
+
+
+def test_socket_is_bound_privately_and_moved_into_place(socket_path, monkeypatch):
+    bound_in = []
+    server_init = control._Server.__init__
+
+    def record(self, address, handler):
+        bound_in.append(stat.S_IMODE(os.stat(Path(address).parent).st_mode))
+        server_init(self, address, handler)
+
+    monkeypatch.setattr(control._Server, "__init__", record)
+    previous = os.umask(0o022)
+    try:
+        server = ControlServer(mock.Mock())
+        server.start()
+    finally:
+        os.umask(previous)
+
+    try:
+        assert bound_in == [0o700]
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        assert list(socket_path.parent.iterdir()) == [socket_path]
+        assert call("pause", socket_path=socket_path) == {"paused": True}
+    finally:
+        server.stop()
+    assert not socket_path.exists()
+
+
+def test_failed_bind_leaves_no_private_directory(socket_path, monkeypatch):
+    monkeypatch.setattr(control._Server, "__init__", mock.Mock(side_effect=OSError("address in use")))
+
+    with pytest.raises(OSError):
+        ControlServer(mock.Mock()).start()
+
+    assert list(socket_path.parent.iterdir()) == []
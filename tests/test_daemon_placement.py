@@ -0,0 +1,88 @@
+"""Tests for releasing a task's host reservation when its start fails."""
+
+import types
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.daemon import IssueSolverDaemon
+from src.docker_hosts import LOCAL_HOST, HostPool
+from src.task_queue import Task
+
+
+@pytest.fixture
+def daemon(test_config):
+    """Daemon with a two-host pool and every collaborator mocked."""
+    test_config.implement_task_cpus = 2
+    test_config.plan_task_cpus = 1
+    daemon = IssueSolverDaemon.__new__(IssueSolverDaemon)
+    daemon.config = test_config
+    daemon.docker = mock.Mock()
+    daemon.docker.hosts = HostPool([(None, 1), ("tcp://b:2375", 1)])
+    daemon.docker.get_active_image.return_value = "claude-task:latest"
+    daemon.docker.create_worktree.return_value = Path("/worktrees/issue-5")
+    daemon.pool = mock.Mock()
+    daemon.pool.claim.return_value = None
+    daemon.preparer = mock.Mock()
+    daemon.preparer.ready.return_value = None
+    daemon.task_queue = mock.Mock()
+    daemon._task_prompt = lambda task: "prompt"
+    daemon._capture_logs = mock.Mock()
+    daemon._watch_container = mock.Mock()
+    return daemon
+
+
+def task():
+    return Task(issue_number=5, issue_title="Fix it", has_implement_tag=True)
+
+
+@pytest.mark.parametrize("failing", ["create_worktree", "run_claude_container"])
+def test_failed_start_releases_local_host(daemon, failing):
+    getattr(daemon.docker, failing).side_effect = RuntimeError("boom")
+    host = daemon.docker.hosts.acquire()
+    assert host.name == LOCAL_HOST
+
+    daemon._start_task(task(), host)
+
+    assert host.running == 0
+    daemon.docker.cpusets.release.assert_called_once_with(5)
+    daemon.task_queue.mark_completed.assert_called_once_with(5, error="boom")
+
+
+def test_failed_start_on_remote_host_releases_that_host(daemon):
+    daemon.docker.hosts.assign(LOCAL_HOST)
+    daemon.docker.run_claude_container.side_effect = RuntimeError("remote unreachable")
+    host = daemon.docker.hosts.acquire()
+    assert host.name == "tcp://b:2375"
+
+    daemon._start_task(task(), host)
+
+    assert [h["running"] for h in daemon.docker.hosts.status()] == [1, 0]
+    daemon.docker.cpusets.allocate.assert_not_called()
+    assert daemon.docker.hosts.acquire() is host
+
+
+def test_failed_pooled_start_releases_slot_and_host(daemon):
+    slot = mock.Mock()
+    daemon.pool.claim.return_value = slot
+    daemon.pool.start_task.side_effect = RuntimeError("boom")
+    host = daemon.docker.hosts.acquire()
+
+    daemon._start_task(task(), host)
+
+    daemon.pool.release.assert_called_once_with(slot)
+    assert host.running == 0
+
+
+def test_started_task_keeps_its_host(daemon):
+    daemon.docker.run_claude_container.return_value = types.SimpleNamespace(id="abc123")
+    host = daemon.docker.hosts.acquire()
+    t = task()
+
+    daemon._start_task(t, host)
+
+    assert host.running == 1
+    assert t.docker_host == LOCAL_HOST
+    daemon.task_queue.mark_running.assert_called_once_with(t, "abc123", Path("/worktrees/issue-5"))
+    daemon.task_queue.mark_completed.assert_not_called()
@@ -0,0 +1,76 @@
+"""Tests for refusing to start next to a running daemon."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.control import ControlServer
+from src.daemon import IssueSolverDaemon
+
+
+@pytest.fixture
+def runtime_dir():
+    # Unix socket paths are limited to about 100 characters
+    path = Path(tempfile.mkdtemp(prefix="cis-"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(test_config, runtime_dir):
+    test_config.pid_file = runtime_dir / "daemon.pid"
+    test_config.control_socket = runtime_dir / "control.sock"
+    daemon = IssueSolverDaemon.__new__(IssueSolverDaemon)
+    daemon.config = test_config
+    daemon.control = ControlServer(daemon)
+    daemon._bootstrap = mock.Mock(side_effect=AssertionError("bootstrap ran"))
+    return daemon
+
+
+@pytest.fixture
+def other_process():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+
+def test_start_refuses_while_another_daemon_serves_the_socket(daemon, test_config):
+    other = ControlServer(mock.Mock())
+    other.start()
+    try:
+        with pytest.raises(RuntimeError, match="Another daemon is serving"):
+            daemon.start()
+    finally:
+        other.stop()
+
+    assert not test_config.pid_file.exists()
+    daemon._bootstrap.assert_not_called()
+
+
+def test_start_refuses_while_pid_file_names_a_live_process(daemon, test_config, other_process):
+    test_config.pid_file.write_text(str(other_process))
+
+    with pytest.raises(RuntimeError, match=f"PID {other_process}"):
+        daemon.start()
+
+    assert test_config.pid_file.read_text() == str(other_process)
+    daemon._bootstrap.assert_not_called()
+
+
+def test_stale_pid_file_and_socket_do_not_block_start(daemon, test_config):
+    stale = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                           capture_output=True, text=True, check=True).stdout.strip()
+    test_config.pid_file.write_text(stale)
+    test_config.control_socket.touch()
+
+    daemon._check_not_running()
+
+    test_config.pid_file.write_text(str(os.getpid()))
+    daemon._check_not_running()
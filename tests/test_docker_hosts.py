@@ -0,0 +1,100 @@
+"""Tests for Docker host placement."""
+
+import pytest
+from docker.errors import DockerException
+
+from src import docker_hosts
+from src.docker_hosts import LOCAL_HOST, HostPool
+
+
+@pytest.fixture
+def fake_docker(monkeypatch, engines, docker_client):
+    """Route host connections to fake engines keyed by URL (None for local)."""
+    by_url = {}
+
+    def connect(url=None, reachable=True):
+        name = url.replace("://", "-").replace(":", "-") if url else LOCAL_HOST
+        by_url[url] = engines(name, reachable)
+        return by_url[url]
+
+    monkeypatch.setattr(docker_hosts.docker, "from_env", lambda: docker_client(by_url[None]))
+    monkeypatch.setattr(
+        docker_hosts.docker,
+        "DockerClient",
+        lambda base_url, use_ssh_client=False: docker_client(by_url[base_url]),
+    )
+    return connect
+
+
+def test_acquire_picks_least_utilised_host():
+    pool = HostPool([(None, 2), ("tcp://b:2375", 4)])
+
+    placed = [pool.acquire().name for _ in range(6)]
+
+    # Ties go to the earlier host; utilisation is relative to capacity
+    assert placed == [LOCAL_HOST, "tcp://b:2375", "tcp://b:2375", LOCAL_HOST, "tcp://b:2375", "tcp://b:2375"]
+    assert pool.acquire() is None
+
+
+def test_release_frees_a_slot_and_never_goes_negative():
+    pool = HostPool([(None, 1)])
+    host = pool.acquire()
+    assert pool.acquire() is None
+
+    pool.release(host.name)
+    pool.release(host.name)
+
+    assert host.running == 0
+    assert pool.acquire() is host
+
+
+def test_assign_counts_adopted_tasks_and_unknown_names_fall_back_to_primary():
+    pool = HostPool([(None, 2), ("tcp://b:2375", 1)])
+
+    pool.assign("tcp://b:2375")
+    pool.assign("tcp://gone:2375")
+
+    assert [h["running"] for h in pool.status()] == [1, 1]
+    assert pool.acquire().name == LOCAL_HOST
+    assert pool.acquire() is None
+
+
+def test_unavailable_hosts_receive_no_tasks():
+    pool = HostPool([(None, 1), ("tcp://b:2375", 4)])
+    pool.get("tcp://b:2375").available = False
+
+    assert pool.acquire().name == LOCAL_HOST
+    assert pool.acquire() is None
+
+
+def test_connect_marks_unreachable_secondary_hosts_unavailable(fake_docker):
+    fake_docker(None)
+    fake_docker("tcp://b:2375", reachable=False)
+    fake_docker("ssh://c")
+    pool = HostPool([(None, 1), ("tcp://b:2375", 1), ("ssh://c", 1)])
+
+    pool.connect()
+
+    assert [h["available"] for h in pool.status()] == [True, False, True]
+    assert [pool.acquire().name for _ in range(2)] == [LOCAL_HOST, "ssh://c"]
+    assert pool.acquire() is None
+
+
+def test_connect_raises_if_primary_is_unreachable(fake_docker):
+    fake_docker(None, reachable=False)
+    fake_docker("tcp://b:2375")
+    pool = HostPool([(None, 1), ("tcp://b:2375", 1)])
+
+    with pytest.raises(DockerException):
+        pool.connect()
+
+
+def test_close_closes_every_client(fake_docker):
+    fake_docker(None)
+    fake_docker("tcp://b:2375")
+    pool = HostPool([(None, 1), ("tcp://b:2375", 1)])
+    pool.connect()
+
+    pool.close()
+
+    assert all(host.client.closed for host in pool.hosts)
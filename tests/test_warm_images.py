@@ -0,0 +1,102 @@
+"""Tests for warm image builds."""
+
+import subprocess
+import threading
+import time
+import types
+from unittest import mock
+
+import pytest
+from docker.errors import ImageNotFound
+
+from src import warm_images
+from src.docker_manager import MANAGED_LABEL
+from src.warm_images import WarmImages
+
+
+@pytest.fixture
+def repo(git_env, tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    for args in (["init", "--quiet"], ["commit", "--quiet", "--allow-empty", "-m", "Initial"]):
+        subprocess.run(["git", *args], cwd=path, check=True)
+    return path
+
+
+@pytest.fixture
+def warm(test_config, repo, monkeypatch):
+    """Warm images on a mocked client whose warm-up run fails until told otherwise."""
+    test_config.warm_image_command = "make deps"
+    test_config.warm_image_keep = 3
+    images = {"claude-task:latest": types.SimpleNamespace(id="sha256:base", attrs={})}
+    images["sha256:base"] = images["claude-task:latest"]
+
+    def get(ref):
+        if ref not in images:
+            raise ImageNotFound(ref)
+        return images[ref]
+
+    container = mock.Mock()
+    container.wait.return_value = {"StatusCode": 1}
+    container.logs.return_value = b"make: *** [deps] Error 1"
+    container.commit.side_effect = lambda repository, tag, **kwargs: images.setdefault(
+        f"{repository}:{tag}", types.SimpleNamespace(id="sha256:warm", attrs={})
+    )
+
+    docker = mock.Mock()
+    docker.worktree_lock = threading.RLock()
+    docker.get_active_image.return_value = "claude-task:latest"
+    docker.client.images.get.side_effect = get
+    docker.client.images.list.return_value = []
+    docker.client.containers.run.return_value = container
+
+    # Worktree commands must run under the shared worktree lock
+    run_git_command = warm_images.run_git_command
+    def checked(args, **kwargs):
+        if args[1] == "worktree":
+            assert docker.worktree_lock._is_owned()
+        return run_git_command(args, **kwargs)
+    monkeypatch.setattr(warm_images, "run_git_command", checked)
+
+    return WarmImages(docker), container
+
+
+def head(repo):
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def test_failed_build_is_retried_after_backoff(warm, repo, monkeypatch):
+    images, container = warm
+    commit = head(repo)
+
+    assert images.ensure(repo, commit) is None
+    # Still backing off: no second run
+    assert images.ensure(repo, commit) is None
+    assert images.docker.client.containers.run.call_count == 1
+
+    container.wait.return_value = {"StatusCode": 0}
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    ref = images.ensure(repo, commit)
+
+    assert ref == WarmImages.image_ref(commit, "sha256:base")
+    assert images.docker.client.containers.run.call_count == 2
+    assert not images._failed.waiting(ref)
+
+
+def test_warm_up_container_is_managed_and_its_worktree_removed(warm, repo):
+    images, container = warm
+    container.wait.return_value = {"StatusCode": 0}
+
+    images.ensure(repo, head(repo))
+
+    labels = images.docker.client.containers.run.call_args.kwargs["labels"]
+    assert labels[MANAGED_LABEL] == "true"
+    container.remove.assert_called_once_with(force=True)
+    worktrees = subprocess.run(
+        ["git", "worktree", "list"], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.splitlines()
+    assert len(worktrees) == 1
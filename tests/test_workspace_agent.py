@@ -0,0 +1,123 @@
+"""Tests for remote workspaces prepared and collected through agent containers."""
+
+import subprocess
+import types
+
+import pytest
+
+from src.docker_hosts import DockerHost
+from src.workspace_agent import MIRROR_VOLUME, RemoteWorkspaceAgent, workspace_volume
+
+
+def git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit(path, name, content):
+    (path / name).write_text(content)
+    git("add", name, cwd=path)
+    git("commit", "--quiet", "-m", f"Update {name}", cwd=path)
+    return git("rev-parse", "HEAD", cwd=path)
+
+
+@pytest.fixture
+def repo(git_env, tmp_path):
+    """Local repository with one commit and an origin remote."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git("init", "--quiet", "-b", "main", cwd=path)
+    git("remote", "add", "origin", "https://github.com/example/repo.git", cwd=path)
+    commit(path, "README.md", "hello\n")
+    return path
+
+
+@pytest.fixture
+def remote(git_env, engines, docker_client):
+    """Remote Docker host backed by a fake engine."""
+    engine = engines("remote")
+    host = DockerHost(name="tcp://remote:2375", url="tcp://remote:2375", capacity=2)
+    host.client = docker_client(engine)
+    return host
+
+
+@pytest.fixture
+def agent(repo):
+    docker_manager = types.SimpleNamespace(
+        get_active_image=lambda: "claude-task:latest",
+        repo_manager=types.SimpleNamespace(get_repo_path=lambda: repo),
+    )
+    return RemoteWorkspaceAgent(docker_manager)
+
+
+def add_worktree(repo, issue_number):
+    path = repo.parent / f"issue-{issue_number}"
+    git("worktree", "add", "--quiet", "-b", f"issue-{issue_number}", str(path), cwd=repo)
+    return path
+
+
+def test_prepare_and_collect_round_trip(agent, remote, repo):
+    worktree = add_worktree(repo, 7)
+    start = git("rev-parse", "HEAD", cwd=worktree)
+
+    mounts = agent.prepare(remote, 7, worktree)
+
+    volume = workspace_volume(7)
+    assert mounts == {
+        volume: {"bind": "/workspace", "mode": "rw"},
+        MIRROR_VOLUME: {"bind": "/mirror", "mode": "ro"},
+    }
+    workspace = remote.client.engine.volumes[volume]
+    assert git("rev-parse", "HEAD", cwd=workspace) == start
+    assert git("rev-parse", "--abbrev-ref", "HEAD", cwd=workspace) == "issue-7"
+    assert git("remote", "get-url", "origin", cwd=workspace) == "https://github.com/example/repo.git"
+
+    # The session commits on the issue branch in the remote workspace
+    done = commit(workspace, "fix.py", "print('fixed')\n")
+
+    agent.collect(remote, 7, worktree)
+
+    assert git("rev-parse", "HEAD", cwd=worktree) == done
+    assert (worktree / "fix.py").read_text() == "print('fixed')\n"
+    assert volume not in remote.client.engine.volumes
+    assert all(container.removed for container in remote.client.engine.containers)
+
+
+def test_collect_without_new_commits_leaves_worktree_alone(agent, remote, repo):
+    worktree = add_worktree(repo, 8)
+    start = git("rev-parse", "HEAD", cwd=worktree)
+    agent.prepare(remote, 8, worktree)
+
+    agent.collect(remote, 8, worktree)
+
+    assert git("rev-parse", "HEAD", cwd=worktree) == start
+    assert workspace_volume(8) not in remote.client.engine.volumes
+
+
+def test_mirror_is_synced_incrementally(agent, remote, repo):
+    agent.prepare(remote, 1, add_worktree(repo, 1))
+    assert agent._sync_bundle(remote, repo) is None
+
+    newer = commit(repo, "CHANGES.md", "more\n")
+    worktree = add_worktree(repo, 2)
+    agent.prepare(remote, 2, worktree)
+
+    workspace = remote.client.engine.volumes[workspace_volume(2)]
+    assert git("rev-parse", "HEAD", cwd=workspace) == newer
+
+
+def test_failed_prepare_resends_everything_next_time(agent, remote, repo):
+    worktree = add_worktree(repo, 3)
+    agent.prepare(remote, 3, worktree)
+    # The mirror is lost, e.g. its volume was pruned on the host
+    remote.client.volumes.get(MIRROR_VOLUME).remove(force=True)
+    commit(repo, "CHANGES.md", "more\n")
+
+    with pytest.raises(RuntimeError):
+        agent.prepare(remote, 4, add_worktree(repo, 4))
+    assert remote.name not in agent._synced
+
+    agent.prepare(remote, 4, repo.parent / "issue-4")
+    workspace = remote.client.engine.volumes[workspace_volume(4)]
+    assert git("rev-parse", "HEAD", cwd=workspace) == git("rev-parse", "HEAD", cwd=repo)